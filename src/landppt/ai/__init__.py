@@ -4,6 +4,7 @@ AI modules for LandPPT
 
 from .providers import AIProviderFactory, get_ai_provider, get_role_provider
 from .base import AIProvider, AIMessage, AIResponse, MessageRole
+from .concurrency import get_llm_governor, project_scope
 
 __all__ = [
     "AIProviderFactory",
@@ -12,5 +13,7 @@ __all__ = [
     "AIProvider",
     "AIMessage",
     "AIResponse",
-    "MessageRole"
+    "MessageRole",
+    "get_llm_governor",
+    "project_scope"
 ]
@@ -27,6 +27,8 @@ class TextContent(BaseModel):
     """Text content for multimodal messages"""
     type: MessageContentType = MessageContentType.TEXT
     text: str
+    # Marks the end of a reusable prompt prefix, e.g. {"type": "ephemeral"} for Anthropic prompt caching
+    cache_control: Optional[Dict[str, str]] = None
 
 class AIMessage(BaseModel):
     """AI message model with multimodal support"""
@@ -67,6 +69,11 @@ class AIProvider(ABC):
         """Generate text completion"""
         pass
     
+    @property
+    def supports_streaming(self) -> bool:
+        """Whether the provider streams tokens itself instead of yielding one complete response"""
+        return type(self).stream_chat_completion is not AIProvider.stream_chat_completion
+
     async def stream_chat_completion(
         self,
         messages: List[AIMessage],
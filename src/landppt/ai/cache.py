@@ -0,0 +1,285 @@
+"""
+Content-addressed LLM response cache with an in-memory LRU in front of a disk store,
+plus per-project accounting of provider-side prompt prefix cache hits
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .base import AIMessage, AIResponse, TextContent, ImageContent
+from .concurrency import parse_limit_map, current_project_id
+from ..core.config import ai_config
+from ..utils.thread_pool import run_blocking_io
+
+logger = logging.getLogger(__name__)
+
+# Sampling parameters that change the model output and therefore belong in the key
+_SAMPLING_PARAMS = ("temperature", "top_p", "max_tokens", "system_prompt", "stop", "response_format", "seed")
+
+
+def _normalize_text(text: str) -> str:
+    # Trailing whitespace and line-ending differences do not change the request semantically
+    return "\n".join(line.rstrip() for line in text.replace("\r\n", "\n").strip().split("\n"))
+
+
+def _normalize_messages(messages: List[AIMessage]) -> List[Dict[str, Any]]:
+    normalized = []
+    for message in messages:
+        if isinstance(message.content, str):
+            content: Any = _normalize_text(message.content)
+        elif isinstance(message.content, list):
+            content = []
+            for part in message.content:
+                if isinstance(part, TextContent):
+                    content.append({"text": _normalize_text(part.text)})
+                elif isinstance(part, ImageContent):
+                    url = part.image_url.get("url", "")
+                    content.append({"image": hashlib.sha256(url.encode("utf-8")).hexdigest()})
+        else:
+            content = str(message.content)
+        normalized.append({"role": message.role.value, "content": content})
+    return normalized
+
+
+class LLMResponseCache:
+    """Two-tier cache for non-streaming completions.
+
+    Keys are a SHA-256 over provider, model, role, normalized messages and sampling
+    parameters, so any change to the prompt or settings is a miss. Entries expire after
+    a per-role TTL. Requests at temperature 0 and calls that pass ``cache=True``
+    (validation / repair / analysis prompts) are cacheable; other roles only when listed
+    in ``llm_cache_roles``.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_memory_entries: Optional[int] = None):
+        if cache_dir is None:
+            project_root = Path(__file__).resolve().parent.parent.parent.parent
+            cache_dir = project_root / "temp" / "ai_responses_cache" / "llm_responses"
+        self.cache_dir = cache_dir
+        self._max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(ai_config, "llm_cache_enabled", False))
+
+    @property
+    def max_memory_entries(self) -> int:
+        if self._max_memory_entries is not None:
+            return self._max_memory_entries
+        return max(1, getattr(ai_config, "llm_cache_memory_entries", 512))
+
+    def _role_stats(self, role: str) -> Dict[str, int]:
+        return self.stats.setdefault(role, {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "bypassed": 0})
+
+    def get_ttl(self, role: str) -> int:
+        role_ttls = parse_limit_map(getattr(ai_config, "llm_cache_role_ttls", None))
+        return role_ttls.get(role, getattr(ai_config, "llm_cache_default_ttl", 86400))
+
+    def is_cacheable(self, role: str, kwargs: Dict[str, Any], explicit: Optional[bool]) -> bool:
+        if not self.enabled or explicit is False:
+            return False
+        if explicit:
+            return True
+        temperature = kwargs.get("temperature")
+        if temperature is not None and float(temperature) <= 0:
+            return True
+        cached_roles = {
+            item.strip().lower()
+            for item in (getattr(ai_config, "llm_cache_roles", None) or "").split(",")
+            if item.strip()
+        }
+        return role in cached_roles
+
+    def make_key(self, provider_name: str, model: Optional[str], role: str,
+                 messages: List[AIMessage], kwargs: Dict[str, Any]) -> str:
+        payload = {
+            "provider": provider_name,
+            "model": model,
+            "role": role,
+            "messages": _normalize_messages(messages),
+            "params": {name: kwargs.get(name) for name in _SAMPLING_PARAMS if kwargs.get(name) is not None},
+        }
+        encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _read_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to read LLM cache entry {path.name}: {e}")
+            return None
+
+    def _write_entry(self, key: str, entry: Dict[str, Any]):
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        tmp_path.replace(path)
+
+    async def get(self, key: str, role: str) -> Optional[AIResponse]:
+        stats = self._role_stats(role)
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is not None and entry["expires_at"] > now:
+            self._memory.move_to_end(key)
+            stats["memory_hits"] += 1
+            return AIResponse(**entry["response"])
+
+        entry = await run_blocking_io(self._read_entry, key)
+        if entry is not None and entry.get("expires_at", 0) > now:
+            self._remember(key, entry)
+            stats["disk_hits"] += 1
+            return AIResponse(**entry["response"])
+
+        stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, role: str, response: AIResponse):
+        if not response.content or not response.content.strip():
+            return
+        now = time.time()
+        metadata = dict(response.metadata or {})
+        metadata["cached"] = True
+        entry = {
+            "role": role,
+            "created_at": now,
+            "expires_at": now + self.get_ttl(role),
+            "response": response.model_copy(update={"metadata": metadata}).model_dump(),
+        }
+        self._remember(key, entry)
+        self._role_stats(role)["stores"] += 1
+        try:
+            await run_blocking_io(self._write_entry, key, entry)
+        except Exception as e:
+            logger.warning(f"Failed to persist LLM cache entry: {e}")
+
+    def record_bypass(self, role: str):
+        self._role_stats(role)["bypassed"] += 1
+
+    def cleanup_expired(self) -> int:
+        """Remove expired entries from memory and disk, returns removed disk entries"""
+        now = time.time()
+        for key in [key for key, entry in self._memory.items() if entry["expires_at"] <= now]:
+            del self._memory[key]
+
+        removed = 0
+        if not self.cache_dir.exists():
+            return removed
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    expires_at = json.load(f).get("expires_at", 0)
+                if expires_at <= now:
+                    path.unlink()
+                    removed += 1
+            except Exception as e:
+                logger.warning(f"Failed to inspect LLM cache entry {path.name}: {e}")
+        return removed
+
+    def clear(self):
+        self._memory.clear()
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        totals = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "bypassed": 0}
+        for role_stats in self.stats.values():
+            for name, value in role_stats.items():
+                totals[name] += value
+        lookups = totals["memory_hits"] + totals["disk_hits"] + totals["misses"]
+        return {
+            "enabled": self.enabled,
+            "memory_entries": len(self._memory),
+            "hit_rate": round((totals["memory_hits"] + totals["disk_hits"]) / lookups, 4) if lookups else 0.0,
+            "totals": totals,
+            "roles": self.stats,
+        }
+
+
+class PromptCacheStats:
+    """Per-project accounting of provider prompt prefix caching.
+
+    Providers report ``cached_tokens`` (prompt tokens served from their prefix cache) and
+    ``cache_creation_tokens`` (tokens written to it) in the response usage; requests whose
+    provider does not report caching are not counted.
+    """
+
+    # Keep the most recently active projects only
+    MAX_PROJECTS = 256
+
+    def __init__(self):
+        self._projects: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+
+    def record(self, role: str, usage: Dict[str, int], project_id: Optional[str] = None):
+        if not usage or "cached_tokens" not in usage:
+            return
+        project_key = project_id or current_project_id.get() or "default"
+        stats = self._projects.get(project_key)
+        if stats is None:
+            stats = {"requests": 0, "hit_requests": 0, "prompt_tokens": 0,
+                     "cached_tokens": 0, "cache_creation_tokens": 0}
+            self._projects[project_key] = stats
+        self._projects.move_to_end(project_key)
+        while len(self._projects) > self.MAX_PROJECTS:
+            self._projects.popitem(last=False)
+
+        cached_tokens = usage.get("cached_tokens") or 0
+        stats["requests"] += 1
+        stats["hit_requests"] += 1 if cached_tokens > 0 else 0
+        stats["prompt_tokens"] += usage.get("prompt_tokens") or 0
+        stats["cached_tokens"] += cached_tokens
+        stats["cache_creation_tokens"] += usage.get("cache_creation_tokens") or 0
+        logger.debug(f"Prompt cache [{project_key}/{role}]: {cached_tokens}/{usage.get('prompt_tokens', 0)} prompt tokens cached")
+
+    @staticmethod
+    def _with_rates(stats: Dict[str, int]) -> Dict[str, Any]:
+        result: Dict[str, Any] = dict(stats)
+        result["request_hit_rate"] = round(stats["hit_requests"] / stats["requests"], 4) if stats["requests"] else 0.0
+        result["token_hit_rate"] = round(stats["cached_tokens"] / stats["prompt_tokens"], 4) if stats["prompt_tokens"] else 0.0
+        return result
+
+    def get_stats(self, project_id: Optional[str] = None) -> Dict[str, Any]:
+        if project_id is not None:
+            stats = self._projects.get(project_id)
+            return self._with_rates(stats) if stats else {}
+        return {key: self._with_rates(stats) for key, stats in self._projects.items()}
+
+    def clear(self):
+        self._projects.clear()
+
+
+_response_cache = LLMResponseCache()
+_prompt_cache_stats = PromptCacheStats()
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Get the process-wide LLM response cache"""
+    return _response_cache
+
+
+def get_prompt_cache_stats() -> PromptCacheStats:
+    """Get the process-wide provider prompt cache statistics"""
+    return _prompt_cache_stats
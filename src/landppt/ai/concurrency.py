@@ -0,0 +1,377 @@
+"""
+Process-wide admission control for LLM requests
+"""
+
+import asyncio
+import contextvars
+import logging
+import re
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from ..core.config import ai_config
+
+logger = logging.getLogger(__name__)
+
+# Project the current LLM work belongs to; used for fair queueing across projects
+current_project_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "landppt_current_project_id", default=None
+)
+
+_DEFAULT_QUEUE_KEY = "__global__"
+_TOKEN_WINDOW_SECONDS = 60.0
+
+
+@contextmanager
+def project_scope(project_id: Optional[str]) -> Iterator[None]:
+    """Attribute all LLM calls made inside the block (and tasks spawned from it) to a project"""
+    token = current_project_id.set(project_id)
+    try:
+        yield
+    finally:
+        try:
+            current_project_id.reset(token)
+        except ValueError:
+            # Async generators may be finalized from a different context
+            pass
+
+
+def parse_limit_map(value: Optional[str]) -> Dict[str, int]:
+    """Parse "key=value,key2=value2" limit strings from configuration"""
+    limits: Dict[str, int] = {}
+    if not value:
+        return limits
+    for item in re.split(r"[,;]", value):
+        if "=" not in item:
+            continue
+        key, raw_limit = item.split("=", 1)
+        key = key.strip().lower()
+        try:
+            limits[key] = int(raw_limit.strip())
+        except ValueError:
+            logger.warning(f"Ignoring invalid LLM limit entry: {item!r}")
+    return limits
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate that works for mixed CJK/latin prompts"""
+    if not text:
+        return 0
+    return max(1, len(text) // 3)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Check whether a provider exception represents an HTTP 429 / quota response"""
+    for attr in ("status_code", "code", "status"):
+        value = getattr(error, attr, None)
+        if value == 429 or str(value) == "429":
+            return True
+    if error.__class__.__name__ in ("RateLimitError", "ResourceExhausted", "TooManyRequests"):
+        return True
+    message = str(error).lower()
+    return "rate limit" in message or "too many requests" in message or "error code: 429" in message
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """Extract the Retry-After delay (seconds) from a provider exception, if present"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or getattr(error, "headers", None)
+    if not headers:
+        return None
+    try:
+        for header in ("retry-after-ms", "retry-after"):
+            value = headers.get(header)
+            if value is None:
+                continue
+            delay = float(value)
+            return delay / 1000.0 if header.endswith("-ms") else delay
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+class _Budget:
+    """Concurrency and tokens-per-minute budget that adapts to rate limiting (AIMD)"""
+
+    def __init__(self, name: str, max_concurrency: int, tokens_per_minute: int):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = self.max_concurrency
+        self.tokens_per_minute = max(0, tokens_per_minute)
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self._token_events: Deque[Tuple[float, int]] = deque()
+        self._successes_since_increase = 0
+        self.stats = {
+            "admitted": 0,
+            "completed": 0,
+            "rate_limited": 0,
+            "peak_in_flight": 0,
+        }
+
+    def reconfigure(self, max_concurrency: int, tokens_per_minute: int):
+        max_concurrency = max(1, max_concurrency)
+        if max_concurrency != self.max_concurrency:
+            self.max_concurrency = max_concurrency
+            self.limit = min(self.limit, max_concurrency) if self.stats["rate_limited"] else max_concurrency
+        self.tokens_per_minute = max(0, tokens_per_minute)
+
+    def _tokens_in_window(self, now: float) -> int:
+        while self._token_events and now - self._token_events[0][0] > _TOKEN_WINDOW_SECONDS:
+            self._token_events.popleft()
+        return sum(tokens for _, tokens in self._token_events)
+
+    def wait_time(self, estimated_tokens: int, now: float) -> Optional[float]:
+        """Return 0 if a request can be admitted now, a delay if it is time-blocked, None if slot-blocked"""
+        if now < self.cooldown_until:
+            return self.cooldown_until - now
+        if self.in_flight >= self.limit:
+            return None
+        if self.tokens_per_minute:
+            used = self._tokens_in_window(now)
+            # Always allow a single oversized request through an empty window
+            if used and used + estimated_tokens > self.tokens_per_minute:
+                return max(0.05, _TOKEN_WINDOW_SECONDS - (now - self._token_events[0][0]))
+        return 0.0
+
+    def acquire(self, estimated_tokens: int, now: float) -> Tuple[float, int]:
+        self.in_flight += 1
+        self.stats["admitted"] += 1
+        self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.in_flight)
+        event = (now, estimated_tokens)
+        self._token_events.append(event)
+        return event
+
+    def release(self, event: Tuple[float, int], actual_tokens: Optional[int]):
+        self.in_flight = max(0, self.in_flight - 1)
+        self.stats["completed"] += 1
+        if actual_tokens is not None and actual_tokens != event[1]:
+            # Replace the admission estimate with the measured usage
+            try:
+                position = self._token_events.index(event)
+                self._token_events[position] = (event[0], actual_tokens)
+            except ValueError:
+                pass
+
+    def on_success(self):
+        if self.limit >= self.max_concurrency:
+            return
+        self._successes_since_increase += 1
+        if self._successes_since_increase >= self.limit:
+            self.limit += 1
+            self._successes_since_increase = 0
+            logger.info(f"LLM budget {self.name}: concurrency limit raised to {self.limit}")
+
+    def on_rate_limited(self, retry_after: Optional[float], now: float):
+        self.stats["rate_limited"] += 1
+        self.limit = max(1, self.limit // 2)
+        self._successes_since_increase = 0
+        delay = retry_after if retry_after is not None else min(30.0, 2.0 * self.stats["rate_limited"])
+        self.cooldown_until = max(self.cooldown_until, now + delay)
+        logger.warning(f"LLM budget {self.name}: rate limited, limit={self.limit}, cooling down {delay:.1f}s")
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "tokens_per_minute": self.tokens_per_minute,
+            "tokens_last_minute": self._tokens_in_window(now),
+            "cooldown_remaining": max(0.0, round(self.cooldown_until - now, 2)),
+            **self.stats,
+        }
+
+
+class _Waiter:
+    """A queued admission request"""
+
+    def __init__(self, budgets: List[_Budget], estimated_tokens: int, future: asyncio.Future):
+        self.budgets = budgets
+        self.estimated_tokens = estimated_tokens
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class AdmissionTicket:
+    """Handle for an admitted request, used to report measured usage and outcome"""
+
+    def __init__(self, budgets: List[_Budget], events: List[Tuple[float, int]], queue_key: str, waited: float):
+        self.budgets = budgets
+        self.events = events
+        self.queue_key = queue_key
+        self.waited = waited
+        self.actual_tokens: Optional[int] = None
+
+    def record_usage(self, usage: Optional[Dict[str, int]]):
+        if usage and usage.get("total_tokens"):
+            self.actual_tokens = int(usage["total_tokens"])
+
+
+class LLMConcurrencyGovernor:
+    """Central admission controller for all LLM traffic in the process.
+
+    Every request must hold a slot in the global budget, its provider/model budget and
+    its role budget. Excess work is queued per project and served round-robin so one
+    large deck cannot starve other users. Limits shrink on 429 responses (honouring
+    Retry-After) and grow back additively on success.
+    """
+
+    def __init__(self):
+        self._budgets: Dict[str, _Budget] = {}
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._wakeup_handle: Optional[asyncio.TimerHandle] = None
+        self.stats = {"queued": 0, "max_wait_seconds": 0.0, "total_wait_seconds": 0.0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(ai_config, "llm_governor_enabled", True))
+
+    def _budget(self, name: str, max_concurrency: int, tokens_per_minute: int) -> _Budget:
+        budget = self._budgets.get(name)
+        if budget is None:
+            budget = _Budget(name, max_concurrency, tokens_per_minute)
+            self._budgets[name] = budget
+        else:
+            budget.reconfigure(max_concurrency, tokens_per_minute)
+        return budget
+
+    def _budgets_for(self, provider: str, model: Optional[str], role: str) -> List[_Budget]:
+        role_key = (role or "default").lower()
+        provider_key = f"provider:{(provider or 'default').lower()}/{model or 'default'}"
+        role_limits = parse_limit_map(getattr(ai_config, "llm_role_max_concurrency", None))
+        role_tpm = parse_limit_map(getattr(ai_config, "llm_role_tokens_per_minute", None))
+        global_limit = getattr(ai_config, "llm_max_concurrent_requests", 32)
+
+        return [
+            self._budget("global", global_limit, 0),
+            self._budget(
+                provider_key,
+                getattr(ai_config, "llm_provider_max_concurrency", 8),
+                getattr(ai_config, "llm_provider_tokens_per_minute", 0),
+            ),
+            self._budget(
+                f"role:{role_key}",
+                role_limits.get(role_key, global_limit),
+                role_tpm.get(role_key, 0),
+            ),
+        ]
+
+    def _schedule_wakeup(self, delay: float):
+        loop = asyncio.get_running_loop()
+        if self._wakeup_handle is not None:
+            if self._wakeup_handle.when() <= loop.time() + delay:
+                return
+            self._wakeup_handle.cancel()
+        self._wakeup_handle = loop.call_later(delay, self._on_wakeup)
+
+    def _on_wakeup(self):
+        self._wakeup_handle = None
+        self._dispatch()
+
+    def _dispatch(self):
+        """Admit queued requests round-robin across projects while budgets allow"""
+        now = time.monotonic()
+        min_delay: Optional[float] = None
+        progressed = True
+
+        while progressed and self._queues:
+            progressed = False
+            for queue_key in list(self._queues.keys()):
+                queue = self._queues.get(queue_key)
+                while queue and queue[0].future.done():
+                    queue.popleft()
+                if not queue:
+                    self._queues.pop(queue_key, None)
+                    continue
+
+                waiter = queue[0]
+                delays = [budget.wait_time(waiter.estimated_tokens, now) for budget in waiter.budgets]
+                if any(delay is None for delay in delays):
+                    continue
+                blocking = max(delays)
+                if blocking > 0:
+                    min_delay = blocking if min_delay is None else min(min_delay, blocking)
+                    continue
+
+                queue.popleft()
+                events = [budget.acquire(waiter.estimated_tokens, now) for budget in waiter.budgets]
+                waiter.future.set_result(events)
+                # Served project goes to the back of the round-robin order
+                self._queues.move_to_end(queue_key)
+                if not queue:
+                    self._queues.pop(queue_key, None)
+                progressed = True
+                break
+
+        if min_delay is not None and self._queues:
+            self._schedule_wakeup(min_delay)
+
+    async def acquire(self, provider: str, model: Optional[str], role: str,
+                      estimated_tokens: int = 0) -> AdmissionTicket:
+        budgets = self._budgets_for(provider, model, role)
+        queue_key = current_project_id.get() or _DEFAULT_QUEUE_KEY
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(budgets, estimated_tokens, loop.create_future())
+        self._queues.setdefault(queue_key, deque()).append(waiter)
+        self._dispatch()
+
+        if not waiter.future.done():
+            self.stats["queued"] += 1
+        try:
+            events = await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted concurrently with cancellation: give the slots back
+                for budget, event in zip(budgets, waiter.future.result()):
+                    budget.release(event, None)
+                self._dispatch()
+            raise
+
+        waited = time.monotonic() - waiter.enqueued_at
+        self.stats["total_wait_seconds"] += waited
+        self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], waited)
+        return AdmissionTicket(budgets, events, queue_key, waited)
+
+    def release(self, ticket: AdmissionTicket):
+        for budget, event in zip(ticket.budgets, ticket.events):
+            budget.release(event, ticket.actual_tokens)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def admit(self, provider: str, model: Optional[str], role: str, estimated_tokens: int = 0):
+        """Hold global, provider/model and role slots for the duration of the block"""
+        ticket = await self.acquire(provider, model, role, estimated_tokens)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def report_success(self, ticket: AdmissionTicket):
+        for budget in ticket.budgets:
+            budget.on_success()
+
+    def report_rate_limited(self, ticket: AdmissionTicket, retry_after: Optional[float]):
+        now = time.monotonic()
+        # Only provider and role budgets adapt; the global cap is a hard ceiling
+        for budget in ticket.budgets[1:]:
+            budget.on_rate_limited(retry_after, now)
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "enabled": self.enabled,
+            "queued_now": sum(len(queue) for queue in self._queues.values()),
+            "queued_projects": len(self._queues),
+            **{key: round(value, 3) if isinstance(value, float) else value for key, value in self.stats.items()},
+            "budgets": {name: budget.snapshot(now) for name, budget in self._budgets.items()},
+        }
+
+
+_governor = LLMConcurrencyGovernor()
+
+
+def get_llm_governor() -> LLMConcurrencyGovernor:
+    """Get the process-wide LLM concurrency governor"""
+    return _governor
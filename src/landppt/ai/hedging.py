@@ -0,0 +1,88 @@
+"""
+Latency tracking and outcome statistics for hedged slide-generation requests
+"""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from ..core.config import ai_config
+from .concurrency import estimate_tokens
+
+# Minimum number of first-token samples before the percentile is trusted
+MIN_LATENCY_SAMPLES = 10
+
+
+class HedgeTracker:
+    """Recent time-to-first-token samples and hedging outcomes.
+
+    The hedge delay is the configured percentile of recent primary first-token latencies,
+    never lower than ``slide_hedge_min_delay``; until enough samples exist the minimum
+    delay is used on its own.
+    """
+
+    def __init__(self, window: int = 200):
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "hedged": 0,
+            "primary_wins": 0,
+            "secondary_wins": 0,
+            "no_valid_result": 0,
+            "wasted_tokens": 0,
+        }
+        self._started_at = time.time()
+
+    def record_first_token(self, latency: float):
+        self._latencies.append(latency)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if len(self._latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def hedge_delay(self) -> float:
+        min_delay = max(0.0, float(getattr(ai_config, "slide_hedge_min_delay", 5.0)))
+        observed = self.percentile(float(getattr(ai_config, "slide_hedge_percentile", 0.95)))
+        return max(min_delay, observed) if observed is not None else min_delay
+
+    def record_outcome(self, hedged: bool, winner: Optional[str], wasted_text: str = ""):
+        """Record one slide request; ``wasted_text`` is what the cancelled loser had produced"""
+        self.stats["requests"] += 1
+        if hedged:
+            self.stats["hedged"] += 1
+        if winner == "primary":
+            self.stats["primary_wins"] += 1
+        elif winner == "secondary":
+            self.stats["secondary_wins"] += 1
+        else:
+            self.stats["no_valid_result"] += 1
+        self.stats["wasted_tokens"] += estimate_tokens(wasted_text)
+
+    def get_stats(self) -> Dict[str, Any]:
+        requests = self.stats["requests"]
+        hedged = self.stats["hedged"]
+        return {
+            "enabled": bool(getattr(ai_config, "slide_hedge_enabled", False)),
+            "secondary": {
+                "provider": getattr(ai_config, "slide_hedge_provider", None),
+                "model": getattr(ai_config, "slide_hedge_model", None),
+            },
+            "current_delay": round(self.hedge_delay(), 3),
+            "latency_samples": len(self._latencies),
+            "p50_first_token": self.percentile(0.5),
+            "hedge_rate": round(hedged / requests, 4) if requests else 0.0,
+            "secondary_win_rate": round(self.stats["secondary_wins"] / hedged, 4) if hedged else 0.0,
+            "since": self._started_at,
+            **self.stats,
+        }
+
+
+_hedge_tracker = HedgeTracker()
+
+
+def get_hedge_tracker() -> HedgeTracker:
+    """Get the process-wide slide-generation hedge tracker"""
+    return _hedge_tracker
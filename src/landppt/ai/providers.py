@@ -10,6 +10,8 @@ from typing import List, Dict, Any, Optional, AsyncGenerator, Union, Tuple
 
 from .base import AIProvider, AIMessage, AIResponse, MessageRole, TextContent, ImageContent, MessageContentType
 from ..core.config import ai_config
+from .concurrency import get_llm_governor, estimate_tokens, is_rate_limit_error, get_retry_after
+from .cache import get_llm_response_cache, get_prompt_cache_stats
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +38,10 @@ class OpenAIProvider(AIProvider):
         if isinstance(message.content, str):
             # Simple text message
             openai_message["content"] = message.content
+        elif isinstance(message.content, list) and all(isinstance(part, TextContent) for part in message.content):
+            # Text-only parts (e.g. stable prefix + variable suffix): send as one string in order,
+            # OpenAI-compatible APIs cache the longest previously seen prompt prefix automatically
+            openai_message["content"] = "".join(part.text for part in message.content)
         elif isinstance(message.content, list):
             # Multimodal message
             content_parts = []
@@ -95,6 +101,18 @@ class OpenAIProvider(AIProvider):
 
         return filtered_content
     
+    @staticmethod
+    def _convert_usage(response_usage) -> Dict[str, int]:
+        usage = {
+            "prompt_tokens": response_usage.prompt_tokens,
+            "completion_tokens": response_usage.completion_tokens,
+            "total_tokens": response_usage.total_tokens
+        }
+        prompt_details = getattr(response_usage, "prompt_tokens_details", None)
+        if prompt_details is not None and getattr(prompt_details, "cached_tokens", None) is not None:
+            usage["cached_tokens"] = prompt_details.cached_tokens
+        return usage
+
     async def chat_completion(self, messages: List[AIMessage], **kwargs) -> AIResponse:
         """Generate chat completion using OpenAI"""
         if not self.client:
@@ -124,11 +142,7 @@ class OpenAIProvider(AIProvider):
             return AIResponse(
                 content=filtered_content,
                 model=response.model,
-                usage={
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                },
+                usage=self._convert_usage(response.usage),
                 finish_reason=choice.finish_reason,
                 metadata={"provider": "openai"}
             )
@@ -151,8 +165,12 @@ class OpenAIProvider(AIProvider):
         messages = [AIMessage(role=MessageRole.USER, content=prompt)]
         return await self.chat_completion(messages, **kwargs)
 
-    async def stream_chat_completion(self, messages: List[AIMessage], **kwargs) -> AsyncGenerator[str, None]:
-        """Stream chat completion using OpenAI with think tag filtering"""
+    async def stream_chat_completion(self, messages: List[AIMessage], stream_usage: Optional[Dict[str, int]] = None,
+                                     **kwargs) -> AsyncGenerator[str, None]:
+        """
+        Stream chat completion using OpenAI with think tag filtering;
+        ``stream_usage`` is filled with the token usage reported in the final chunk
+        """
         if not self.client:
             raise RuntimeError("OpenAI client not available")
 
@@ -171,13 +189,16 @@ class OpenAIProvider(AIProvider):
                 # max_tokens=config.get("max_tokens", 2000),
                 temperature=config.get("temperature", 0.7),
                 top_p=config.get("top_p", 1.0),
-                stream=True
+                stream=True,
+                stream_options={"include_usage": True}
             )
 
             buffer = ""
             in_think_tag = False
 
             async for chunk in stream:
+                if getattr(chunk, "usage", None) and stream_usage is not None:
+                    stream_usage.update(self._convert_usage(chunk.usage))
                 if chunk.choices and chunk.choices[0].delta.content:
                     chunk_content = chunk.choices[0].delta.content
                     buffer += chunk_content
@@ -264,6 +285,14 @@ class AnthropicProvider(AIProvider):
             logger.warning("Anthropic library not installed. Install with: pip install anthropic")
             self.client = None
 
+    @staticmethod
+    def _text_block(part: TextContent) -> Dict[str, Any]:
+        """Build a text block, keeping the prompt caching breakpoint if one is set"""
+        block = {"type": "text", "text": part.text}
+        if part.cache_control:
+            block["cache_control"] = part.cache_control
+        return block
+
     def _convert_message_to_anthropic(self, message: AIMessage) -> Dict[str, Any]:
         """Convert AIMessage to Anthropic format, supporting multimodal content"""
         anthropic_message = {"role": message.role.value}
@@ -276,10 +305,7 @@ class AnthropicProvider(AIProvider):
             content_parts = []
             for part in message.content:
                 if isinstance(part, TextContent):
-                    content_parts.append({
-                        "type": "text",
-                        "text": part.text
-                    })
+                    content_parts.append(self._text_block(part))
                 elif isinstance(part, ImageContent):
                     # Anthropic expects base64 data without the data URL prefix
                     image_url = part.image_url.get("url", "")
@@ -322,8 +348,13 @@ class AnthropicProvider(AIProvider):
 
         for msg in messages:
             if msg.role == MessageRole.SYSTEM:
-                # System messages should be simple text for Anthropic
-                system_message = msg.content if isinstance(msg.content, str) else str(msg.content)
+                # System messages are plain text, or text blocks when they carry a cache breakpoint
+                if isinstance(msg.content, list):
+                    system_message = [
+                        self._text_block(part) for part in msg.content if isinstance(part, TextContent)
+                    ]
+                else:
+                    system_message = msg.content
             else:
                 claude_messages.append(self._convert_message_to_anthropic(msg))
         
@@ -337,14 +368,21 @@ class AnthropicProvider(AIProvider):
             )
             
             content = response.content[0].text if response.content else ""
-            
+
+            # input_tokens excludes tokens read from or written to the prompt cache
+            cached_tokens = getattr(response.usage, "cache_read_input_tokens", None) or 0
+            cache_creation_tokens = getattr(response.usage, "cache_creation_input_tokens", None) or 0
+            prompt_tokens = response.usage.input_tokens + cached_tokens + cache_creation_tokens
+
             return AIResponse(
                 content=content,
                 model=response.model,
                 usage={
-                    "prompt_tokens": response.usage.input_tokens,
+                    "prompt_tokens": prompt_tokens,
                     "completion_tokens": response.usage.output_tokens,
-                    "total_tokens": response.usage.input_tokens + response.usage.output_tokens
+                    "total_tokens": prompt_tokens + response.usage.output_tokens,
+                    "cached_tokens": cached_tokens,
+                    "cache_creation_tokens": cache_creation_tokens
                 },
                 finish_reason=response.stop_reason,
                 metadata={"provider": "anthropic"}
@@ -684,7 +722,7 @@ class OllamaProvider(AIProvider):
                 content=content,
                 model=config.get("model", self.model),
                 usage=self._calculate_usage(
-                    " ".join([msg.content for msg in messages]),
+                    _messages_text(messages),
                     content
                 ),
                 finish_reason="stop",
@@ -730,6 +768,142 @@ class AIProviderFactory:
         """Get list of available providers"""
         return list(cls._providers.keys())
 
+def _messages_text(messages: List[AIMessage]) -> str:
+    """Flatten message text for token estimation"""
+    parts = []
+    for message in messages:
+        if isinstance(message.content, str):
+            parts.append(message.content)
+        elif isinstance(message.content, list):
+            parts.extend(part.text for part in message.content if isinstance(part, TextContent))
+    return "\n".join(parts)
+
+
+class GovernedProvider(AIProvider):
+    """Provider wrapper that routes requests through the response cache and the LLM concurrency governor"""
+
+    def __init__(self, provider: AIProvider, provider_name: str, role: str = "default"):
+        super().__init__(provider.config)
+        self.model = provider.model
+        self.provider = provider
+        self.provider_name = provider_name
+        self.role = role
+
+    def __getattr__(self, name: str):
+        # Expose provider-specific attributes (client, helpers) of the wrapped provider
+        provider = self.__dict__.get("provider")
+        if provider is None:
+            raise AttributeError(name)
+        return getattr(provider, name)
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return self.provider.get_model_info()
+
+    async def _governed_call(self, call, prompt_text: str, **kwargs) -> AIResponse:
+        governor = get_llm_governor()
+        if not governor.enabled:
+            response = await call()
+            get_prompt_cache_stats().record(self.role, response.usage)
+            return response
+
+        model = kwargs.get("model") or self.provider.model
+        max_retries = max(0, getattr(ai_config, "llm_rate_limit_max_retries", 2))
+        for attempt in range(max_retries + 1):
+            async with governor.admit(self.provider_name, model, self.role, estimate_tokens(prompt_text)) as ticket:
+                try:
+                    response = await call()
+                except Exception as e:
+                    if not is_rate_limit_error(e):
+                        raise
+                    governor.report_rate_limited(ticket, get_retry_after(e))
+                    if attempt >= max_retries:
+                        raise
+                    logger.warning(f"Rate limited by {self.provider_name}/{model} ({self.role}), re-queueing request")
+                    continue
+                ticket.record_usage(response.usage)
+                governor.report_success(ticket)
+                get_prompt_cache_stats().record(self.role, response.usage)
+                return response
+
+    async def _cached_call(self, call, messages: List[AIMessage], cache: Optional[bool], **kwargs) -> AIResponse:
+        response_cache = get_llm_response_cache()
+        if not response_cache.is_cacheable(self.role, kwargs, cache):
+            if response_cache.enabled:
+                response_cache.record_bypass(self.role)
+            return await self._governed_call(call, _messages_text(messages), **kwargs)
+
+        model = kwargs.get("model") or self.provider.model
+        key = response_cache.make_key(self.provider_name, model, self.role, messages, kwargs)
+        cached = await response_cache.get(key, self.role)
+        if cached is not None:
+            return cached
+
+        response = await self._governed_call(call, _messages_text(messages), **kwargs)
+        await response_cache.set(key, self.role, response)
+        return response
+
+    async def chat_completion(self, messages: List[AIMessage], cache: Optional[bool] = None, **kwargs) -> AIResponse:
+        return await self._cached_call(
+            lambda: self.provider.chat_completion(messages, **kwargs),
+            messages, cache, **kwargs
+        )
+
+    async def text_completion(self, prompt: str, cache: Optional[bool] = None, **kwargs) -> AIResponse:
+        return await self._cached_call(
+            lambda: self.provider.text_completion(prompt, **kwargs),
+            [AIMessage(role=MessageRole.USER, content=prompt)], cache, **kwargs
+        )
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.provider.supports_streaming
+
+    async def stream_chat_completion(self, messages: List[AIMessage], cache: Optional[bool] = None,
+                                     **kwargs) -> AsyncGenerator[str, None]:
+        if not self.provider.supports_streaming:
+            # The provider would only yield one complete response; the governed call keeps its real
+            # usage, response caching and prompt cache statistics
+            response = await self.chat_completion(messages, cache=cache, **kwargs)
+            yield response.content
+            return
+
+        usage: Dict[str, int] = {}
+        governor = get_llm_governor()
+        if not governor.enabled:
+            async for chunk in self.provider.stream_chat_completion(messages, stream_usage=usage, **kwargs):
+                yield chunk
+            get_prompt_cache_stats().record(self.role, usage)
+            return
+
+        model = kwargs.get("model") or self.provider.model
+        prompt_text = _messages_text(messages)
+        async with governor.admit(self.provider_name, model, self.role, estimate_tokens(prompt_text)) as ticket:
+            completion_chars = 0
+            try:
+                async for chunk in self.provider.stream_chat_completion(messages, stream_usage=usage, **kwargs):
+                    completion_chars += len(chunk)
+                    yield chunk
+            except GeneratorExit:
+                # The consumer stopped reading early (e.g. the document was complete)
+                governor.report_success(ticket)
+                raise
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    governor.report_rate_limited(ticket, get_retry_after(e))
+                raise
+            ticket.record_usage(usage)
+            if ticket.actual_tokens is None:
+                # The endpoint did not report usage for the stream
+                ticket.actual_tokens = estimate_tokens(prompt_text) + completion_chars // 3
+            governor.report_success(ticket)
+            get_prompt_cache_stats().record(self.role, usage)
+
+    async def stream_text_completion(self, prompt: str, **kwargs) -> AsyncGenerator[str, None]:
+        messages = [AIMessage(role=MessageRole.USER, content=prompt)]
+        async for chunk in self.stream_chat_completion(messages, **kwargs):
+            yield chunk
+
+
 class AIProviderManager:
     """Manager for AI provider instances with caching and reloading"""
 
@@ -779,13 +953,16 @@ _provider_manager = AIProviderManager()
 
 def get_ai_provider(provider_name: Optional[str] = None) -> AIProvider:
     """Get AI provider instance"""
-    return _provider_manager.get_provider(provider_name)
+    provider_name = provider_name or ai_config.default_ai_provider
+    return GovernedProvider(_provider_manager.get_provider(provider_name), provider_name)
 
 
 def get_role_provider(role: str, provider_override: Optional[str] = None) -> Tuple[AIProvider, Dict[str, Optional[str]]]:
     """Get provider and settings for a specific task role"""
     settings = ai_config.get_model_config_for_role(role, provider_override=provider_override)
-    provider = get_ai_provider(settings["provider"])
+    provider = GovernedProvider(
+        _provider_manager.get_provider(settings["provider"]), settings["provider"], settings["role"]
+    )
     return provider, settings
 
 def reload_ai_providers():
@@ -168,6 +168,82 @@ async def get_ai_providers():
         }
     }
 
+@router.get("/ai/concurrency")
+async def get_ai_concurrency_stats():
+    """Get LLM concurrency governor budgets and queue statistics"""
+    from ..ai import get_llm_governor
+    return get_llm_governor().get_stats()
+
+@router.get("/ai/cache/stats")
+async def get_ai_cache_stats():
+    """Get LLM response cache hit/miss statistics"""
+    from ..ai.cache import get_llm_response_cache
+    return get_llm_response_cache().get_stats()
+
+@router.post("/ai/cache/clear")
+async def clear_ai_cache():
+    """Clear the LLM response cache (memory and disk)"""
+    from ..ai.cache import get_llm_response_cache
+    get_llm_response_cache().clear()
+    return {"success": True}
+
+@router.get("/ai/prompt-cache/stats")
+async def get_ai_prompt_cache_stats(project_id: Optional[str] = None):
+    """Get provider prompt prefix cache hit rates per project"""
+    from ..ai.cache import get_prompt_cache_stats
+    return get_prompt_cache_stats().get_stats(project_id)
+
+@router.get("/ai/hedging/stats")
+async def get_ai_hedging_stats():
+    """Get hedge rate, win counts and wasted tokens of hedged slide generation"""
+    from ..ai.hedging import get_hedge_tracker
+    return get_hedge_tracker().get_stats()
+
+@router.get("/ai/slide-context/stats")
+async def get_slide_context_stats():
+    """Get deck summary reuse and token-ceiling trimming of slide prompts"""
+    from ..services.slide_context_budget import get_slide_context_budgeter
+    return get_slide_context_budgeter().get_stats()
+
+@router.get("/ai/bullet-enhancement/stats")
+async def get_bullet_enhancement_stats():
+    """Get batch, retry and failure counts of batched bullet point enhancement"""
+    from ..services.bullet_point_enhancer import get_bullet_point_enhancer
+    return get_bullet_point_enhancer().get_stats()
+
+@router.get("/export/readiness")
+async def get_export_readiness_timings(limit: int = 50):
+    """Get recent per-page readiness timings of browser rendering and browser pool state"""
+    from ..services.pyppeteer_pdf_converter import get_pdf_converter
+    converter = get_pdf_converter()
+    return {
+        "timings": converter.get_readiness_timings(limit),
+        "browser_pool": converter.browser_pool.get_stats(),
+        "render_modes": converter.get_render_mode_stats()
+    }
+
+@router.get("/export/assets")
+async def get_export_asset_reports(limit: int = 20):
+    """Get recent per-export asset interception reports and the render asset store state"""
+    from ..services.pyppeteer_pdf_converter import get_pdf_converter
+    from ..services.render_asset_cache import get_render_asset_cache
+    return {
+        "reports": get_pdf_converter().get_asset_reports(limit),
+        "cache": get_render_asset_cache().get_stats()
+    }
+
+@router.get("/export/pptx-workers")
+async def get_pptx_worker_pool_stats():
+    """Get PDF to PPTX worker pool state, including queue depth"""
+    from ..services.pdf_to_pptx_pool import get_pptx_worker_pool
+    return get_pptx_worker_pool().get_stats()
+
+@router.get("/export/prerender")
+async def get_export_prerender_stats():
+    """Get speculative export pre-rendering statistics"""
+    from ..services.export_prerender import get_export_prerenderer
+    return get_export_prerenderer().get_stats()
+
 @router.post("/ai/providers/{provider_name}/test")
 async def test_ai_provider(provider_name: str, request: Request):
     """Test a specific AI provider - uses frontend provided config if available"""
@@ -108,12 +108,49 @@ class AIConfig(BaseSettings):
     # Parallel Generation Configuration
     enable_parallel_generation: bool = Field(default=False, env="ENABLE_PARALLEL_GENERATION")
     parallel_slides_count: int = Field(default=3, env="PARALLEL_SLIDES_COUNT")
+    image_pipeline_concurrency: int = Field(default=4, env="IMAGE_PIPELINE_CONCURRENCY")  # 0 = acquire images inline per slide
+
+    # Hedged Slide Generation Configuration
+    slide_hedge_enabled: bool = Field(default=False, env="SLIDE_HEDGE_ENABLED")
+    slide_hedge_provider: Optional[str] = Field(default=None, env="SLIDE_HEDGE_PROVIDER")
+    slide_hedge_model: Optional[str] = Field(default=None, env="SLIDE_HEDGE_MODEL")
+    slide_hedge_percentile: float = Field(default=0.95, env="SLIDE_HEDGE_PERCENTILE")  # of recent first-token latencies
+    slide_hedge_min_delay: float = Field(default=5.0, env="SLIDE_HEDGE_MIN_DELAY")  # seconds
+
+    # LLM Concurrency Governor Configuration
+    llm_governor_enabled: bool = Field(default=True, env="LLM_GOVERNOR_ENABLED")
+    llm_max_concurrent_requests: int = Field(default=32, env="LLM_MAX_CONCURRENT_REQUESTS")
+    llm_provider_max_concurrency: int = Field(default=8, env="LLM_PROVIDER_MAX_CONCURRENCY")
+    llm_provider_tokens_per_minute: int = Field(default=0, env="LLM_PROVIDER_TOKENS_PER_MINUTE")  # 0 = unlimited
+    llm_role_max_concurrency: Optional[str] = Field(default=None, env="LLM_ROLE_MAX_CONCURRENCY")  # e.g. "slide_generation=6,vision_analysis=2"
+    llm_role_tokens_per_minute: Optional[str] = Field(default=None, env="LLM_ROLE_TOKENS_PER_MINUTE")
+    llm_rate_limit_max_retries: int = Field(default=2, env="LLM_RATE_LIMIT_MAX_RETRIES")
+    llm_role_input_token_limits: Optional[str] = Field(default=None, env="LLM_ROLE_INPUT_TOKEN_LIMITS")  # e.g. "slide_generation=24000"; deck context is trimmed to fit
+
+    # Slide Prompt Context Configuration
+    slide_context_neighbors: int = Field(default=0, env="SLIDE_CONTEXT_NEIGHBORS")  # slides on each side included in full; 0 = none
+    slide_context_summary_tokens: int = Field(default=0, env="SLIDE_CONTEXT_SUMMARY_TOKENS")  # cap for the whole-deck summary; 0 = no summary
+
+    # Bullet Point Enhancement Configuration
+    bullet_enhance_batch_tokens: int = Field(default=1500, env="BULLET_ENHANCE_BATCH_TOKENS")  # input tokens of points packed into one request
+    bullet_enhance_max_retries: int = Field(default=2, env="BULLET_ENHANCE_MAX_RETRIES")  # retry rounds for points missing from a response
+
+    # LLM Response Cache Configuration
+    llm_cache_enabled: bool = Field(default=False, env="LLM_CACHE_ENABLED")
+    llm_cache_memory_entries: int = Field(default=512, env="LLM_CACHE_MEMORY_ENTRIES")
+    llm_cache_default_ttl: int = Field(default=86400, env="LLM_CACHE_DEFAULT_TTL")  # seconds
+    llm_cache_role_ttls: Optional[str] = Field(default=None, env="LLM_CACHE_ROLE_TTLS")  # e.g. "outline=3600,creative=604800"
+    llm_cache_roles: Optional[str] = Field(default=None, env="LLM_CACHE_ROLES")  # roles cached regardless of temperature
     
     # Feature Flags
     enable_network_mode: bool = Field(default=True, env="ENABLE_NETWORK_MODE")
     enable_local_models: bool = Field(default=False, env="ENABLE_LOCAL_MODELS")
     enable_streaming: bool = Field(default=True, env="ENABLE_STREAMING")
     enable_auto_layout_repair: bool = Field(default=False, env="ENABLE_AUTO_LAYOUT_REPAIR")
+    layout_repair_mode: str = Field(default="inline", env="LAYOUT_REPAIR_MODE")  # inline = per slide while generating, deck = batch inspection after generation
+    layout_inspection_batch_size: int = Field(default=6, env="LAYOUT_INSPECTION_BATCH_SIZE")  # slide screenshots per vision request in deck mode
+    slide_edit_mode: str = Field(default="patch", env="SLIDE_EDIT_MODE")  # patch = edit operations/diff with full-HTML fallback, full = always regenerate
+    sse_disconnect_policies: Optional[str] = Field(default=None, env="SSE_DISCONNECT_POLICIES")  # e.g. "outline=cancel,slides=background"; default cancel
     
     # Logging
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
@@ -417,7 +454,48 @@ def reload_ai_config():
     # Update parallel generation configuration
     ai_config.enable_parallel_generation = os.environ.get('ENABLE_PARALLEL_GENERATION', str(ai_config.enable_parallel_generation)).lower() == 'true'
     ai_config.parallel_slides_count = int(os.environ.get('PARALLEL_SLIDES_COUNT', str(ai_config.parallel_slides_count)))
+    ai_config.image_pipeline_concurrency = int(os.environ.get('IMAGE_PIPELINE_CONCURRENCY', str(ai_config.image_pipeline_concurrency)))
     ai_config.enable_auto_layout_repair = os.environ.get('ENABLE_AUTO_LAYOUT_REPAIR', str(ai_config.enable_auto_layout_repair)).lower() == 'true'
+    ai_config.layout_repair_mode = os.environ.get('LAYOUT_REPAIR_MODE', ai_config.layout_repair_mode)
+    ai_config.layout_inspection_batch_size = int(os.environ.get('LAYOUT_INSPECTION_BATCH_SIZE', str(ai_config.layout_inspection_batch_size)))
+    ai_config.slide_edit_mode = os.environ.get('SLIDE_EDIT_MODE', ai_config.slide_edit_mode)
+    ai_config.sse_disconnect_policies = os.environ.get('SSE_DISCONNECT_POLICIES', ai_config.sse_disconnect_policies)
+
+    # Update hedged slide generation configuration
+    ai_config.slide_hedge_enabled = os.environ.get('SLIDE_HEDGE_ENABLED', str(ai_config.slide_hedge_enabled)).lower() == 'true'
+    hedge_provider_env = os.environ.get('SLIDE_HEDGE_PROVIDER')
+    ai_config.slide_hedge_provider = (ai_config._normalize_optional_str(hedge_provider_env)
+                                      if hedge_provider_env is not None else ai_config.slide_hedge_provider)
+    hedge_model_env = os.environ.get('SLIDE_HEDGE_MODEL')
+    ai_config.slide_hedge_model = (ai_config._normalize_optional_str(hedge_model_env)
+                                   if hedge_model_env is not None else ai_config.slide_hedge_model)
+    ai_config.slide_hedge_percentile = float(os.environ.get('SLIDE_HEDGE_PERCENTILE', str(ai_config.slide_hedge_percentile)))
+    ai_config.slide_hedge_min_delay = float(os.environ.get('SLIDE_HEDGE_MIN_DELAY', str(ai_config.slide_hedge_min_delay)))
+
+    # Update LLM concurrency governor configuration
+    ai_config.llm_governor_enabled = os.environ.get('LLM_GOVERNOR_ENABLED', str(ai_config.llm_governor_enabled)).lower() == 'true'
+    ai_config.llm_max_concurrent_requests = int(os.environ.get('LLM_MAX_CONCURRENT_REQUESTS', str(ai_config.llm_max_concurrent_requests)))
+    ai_config.llm_provider_max_concurrency = int(os.environ.get('LLM_PROVIDER_MAX_CONCURRENCY', str(ai_config.llm_provider_max_concurrency)))
+    ai_config.llm_provider_tokens_per_minute = int(os.environ.get('LLM_PROVIDER_TOKENS_PER_MINUTE', str(ai_config.llm_provider_tokens_per_minute)))
+    ai_config.llm_role_max_concurrency = os.environ.get('LLM_ROLE_MAX_CONCURRENCY', ai_config.llm_role_max_concurrency)
+    ai_config.llm_role_tokens_per_minute = os.environ.get('LLM_ROLE_TOKENS_PER_MINUTE', ai_config.llm_role_tokens_per_minute)
+    ai_config.llm_rate_limit_max_retries = int(os.environ.get('LLM_RATE_LIMIT_MAX_RETRIES', str(ai_config.llm_rate_limit_max_retries)))
+    ai_config.llm_role_input_token_limits = os.environ.get('LLM_ROLE_INPUT_TOKEN_LIMITS', ai_config.llm_role_input_token_limits)
+
+    # Update slide prompt context configuration
+    ai_config.slide_context_neighbors = int(os.environ.get('SLIDE_CONTEXT_NEIGHBORS', str(ai_config.slide_context_neighbors)))
+    ai_config.slide_context_summary_tokens = int(os.environ.get('SLIDE_CONTEXT_SUMMARY_TOKENS', str(ai_config.slide_context_summary_tokens)))
+
+    # Update bullet point enhancement configuration
+    ai_config.bullet_enhance_batch_tokens = int(os.environ.get('BULLET_ENHANCE_BATCH_TOKENS', str(ai_config.bullet_enhance_batch_tokens)))
+    ai_config.bullet_enhance_max_retries = int(os.environ.get('BULLET_ENHANCE_MAX_RETRIES', str(ai_config.bullet_enhance_max_retries)))
+
+    # Update LLM response cache configuration
+    ai_config.llm_cache_enabled = os.environ.get('LLM_CACHE_ENABLED', str(ai_config.llm_cache_enabled)).lower() == 'true'
+    ai_config.llm_cache_memory_entries = int(os.environ.get('LLM_CACHE_MEMORY_ENTRIES', str(ai_config.llm_cache_memory_entries)))
+    ai_config.llm_cache_default_ttl = int(os.environ.get('LLM_CACHE_DEFAULT_TTL', str(ai_config.llm_cache_default_ttl)))
+    ai_config.llm_cache_role_ttls = os.environ.get('LLM_CACHE_ROLE_TTLS', ai_config.llm_cache_role_ttls)
+    ai_config.llm_cache_roles = os.environ.get('LLM_CACHE_ROLES', ai_config.llm_cache_roles)
 
     # Update Tavily configuration
     ai_config.tavily_api_key = os.environ.get('TAVILY_API_KEY', ai_config.tavily_api_key)
@@ -462,6 +540,36 @@ class AppConfig(BaseSettings):
     
     # Cache Configuration
     cache_ttl: int = Field(default=3600, env="CACHE_TTL")  # 1 hour
+
+    # PDF Export Configuration
+    pdf_render_concurrency: int = Field(default=0, env="PDF_RENDER_CONCURRENCY")  # 0 = size by available memory
+    pdf_render_mode: str = Field(default="per_slide", env="PDF_RENDER_MODE")  # per_slide, single_pass or auto (benchmarked)
+    slide_pdf_cache_max_mb: int = Field(default=512, env="SLIDE_PDF_CACHE_MAX_MB")  # 0 = disable per-slide PDF cache
+    slide_screenshot_cache_max_mb: int = Field(default=512, env="SLIDE_SCREENSHOT_CACHE_MAX_MB")  # 0 = disable
+
+    # Image-based PPTX Export Configuration
+    pptx_image_format: str = Field(default="jpeg", env="PPTX_IMAGE_FORMAT")  # png, jpeg or webp (embedded as JPEG)
+    pptx_image_quality: int = Field(default=90, env="PPTX_IMAGE_QUALITY")  # JPEG quality
+    pptx_image_dpi: int = Field(default=192, env="PPTX_IMAGE_DPI")  # 0 = keep the 2x screenshot resolution
+    export_prerender_enabled: bool = Field(default=False, env="EXPORT_PRERENDER_ENABLED")
+    export_prerender_delay: float = Field(default=5.0, env="EXPORT_PRERENDER_DELAY")  # seconds edits must settle
+
+    # PDF to PPTX Worker Pool Configuration
+    pptx_worker_pool_size: int = Field(default=2, env="PPTX_WORKER_POOL_SIZE")  # 0 = one subprocess per conversion
+    pptx_worker_max_jobs: int = Field(default=50, env="PPTX_WORKER_MAX_JOBS")  # recycle a worker after N jobs, 0 = never
+    pptx_worker_job_timeout: float = Field(default=600.0, env="PPTX_WORKER_JOB_TIMEOUT")  # seconds
+    pptx_range_pages: int = Field(default=10, env="PPTX_RANGE_PAGES")  # min pages per parallel range, 0 = never split
+
+    # Browser Pool Configuration
+    browser_pool_size: int = Field(default=1, env="BROWSER_POOL_SIZE")
+    browser_recycle_pages: int = Field(default=200, env="BROWSER_RECYCLE_PAGES")  # 0 = never recycle by page count
+    browser_recycle_memory_mb: int = Field(default=2048, env="BROWSER_RECYCLE_MEMORY_MB")  # 0 = no memory limit
+
+    # Render Asset Configuration
+    render_network_mode: str = Field(default="cache_first", env="RENDER_NETWORK_MODE")  # cache_first, offline or direct
+    render_allowed_hosts: Optional[str] = Field(default=None, env="RENDER_ALLOWED_HOSTS")  # comma-separated hosts fetched in cache_first mode; unset = any host
+    render_fetch_timeout: float = Field(default=10.0, env="RENDER_FETCH_TIMEOUT")  # seconds
+    render_asset_cache_max_mb: int = Field(default=1024, env="RENDER_ASSET_CACHE_MAX_MB")  # 0 = do not store fetched assets
     
     model_config = {
         "case_sensitive": False,
@@ -22,6 +22,9 @@ from .web import router as web_router
 from .auth import auth_router, create_auth_middleware
 from .database.database import init_db
 from .database.create_default_template import ensure_default_templates_exist_first_time
+from .services.pyppeteer_pdf_converter import get_pdf_converter
+from .services.pdf_to_pptx_pool import get_pptx_worker_pool
+from .services.slide_context_budget import schedule_token_encoding_load
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -69,12 +72,25 @@ async def startup_event():
         logger.error(f"Failed to initialize application: {e}")
         raise
 
+    # Load the prompt tokenizer in the background; its first load may download the encoding
+    schedule_token_encoding_load()
+
+    # Warm up the shared browser pool so the first export does not pay for a cold Chromium launch
+    pdf_converter = get_pdf_converter()
+    if pdf_converter.is_available():
+        try:
+            await pdf_converter.warm_up()
+        except Exception as e:
+            logger.warning(f"Browser pool warm-up failed, browsers will be launched on demand: {e}")
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up database connections on shutdown"""
     try:
         logger.info("Shutting down application...")
+        await get_pdf_converter().close()
+        await get_pptx_worker_pool().close()
         logger.info("Application shutdown complete")
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
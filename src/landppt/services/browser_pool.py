@@ -0,0 +1,169 @@
+"""
+Long-lived Chromium pool shared by all browser work (PDF export, screenshots, layout repair)
+
+Browsers are launched once and reused; every lease gets its own browser context so requests stay
+isolated. A browser is recycled after a configurable number of pages, when its processes exceed a
+memory threshold, or when it is found disconnected.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Check browser memory every N released pages (the CDP round-trip is not free)
+MEMORY_CHECK_INTERVAL = 10
+
+
+def _process_rss_mb(pid: int) -> float:
+    """Resident memory of a process in MB (Linux /proc), 0 when unavailable"""
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="utf-8") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0.0
+
+
+class _PooledBrowser:
+    """A pooled browser with its lease bookkeeping"""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.active = 0
+        self.pages = 0
+        self.retiring = False
+
+
+class BrowserPool:
+    """Pool of warm browsers handing out isolated contexts"""
+
+    def __init__(self, launcher: Callable[[], Awaitable[Any]], size: int = 1,
+                 recycle_after_pages: int = 200, recycle_memory_mb: int = 2048):
+        self._launcher = launcher
+        self.size = max(1, size)
+        self.recycle_after_pages = recycle_after_pages
+        self.recycle_memory_mb = recycle_memory_mb
+        self._browsers: List[_PooledBrowser] = []
+        self._lock = asyncio.Lock()
+        self.stats = {
+            "launches": 0,
+            "leases": 0,
+            "recycled_pages": 0,
+            "recycled_memory": 0,
+            "recycled_unhealthy": 0,
+        }
+
+    async def warm_up(self):
+        """Launch browsers up to the pool size ahead of the first request"""
+        async with self._lock:
+            while len(self._serving()) < self.size:
+                await self._launch()
+        logger.info(f"🌡️ Browser pool warmed up with {self.size} browser(s)")
+
+    def _serving(self) -> List[_PooledBrowser]:
+        return [entry for entry in self._browsers if not entry.retiring]
+
+    async def _launch(self) -> _PooledBrowser:
+        entry = _PooledBrowser(await self._launcher())
+        self._browsers.append(entry)
+        self.stats["launches"] += 1
+        return entry
+
+    async def _retire(self, entry: _PooledBrowser, reason: str):
+        if not entry.retiring:
+            entry.retiring = True
+            self.stats[f"recycled_{reason}"] += 1
+            logger.info(f"♻️ Recycling browser after {entry.pages} pages ({reason})")
+        await self._close_if_idle(entry)
+
+    async def _close_if_idle(self, entry: _PooledBrowser):
+        if entry.active == 0 and entry in self._browsers:
+            self._browsers.remove(entry)
+            try:
+                await entry.browser.close()
+            except Exception as e:
+                logger.debug(f"Closing recycled browser failed, ignoring: {e}")
+
+    async def _checkout(self) -> _PooledBrowser:
+        async with self._lock:
+            for entry in self._serving():
+                if not entry.browser.is_connected():
+                    await self._retire(entry, "unhealthy")
+
+            serving = self._serving()
+            if len(serving) < self.size:
+                serving.append(await self._launch())
+
+            entry = min(serving, key=lambda candidate: candidate.active)
+            entry.active += 1
+            self.stats["leases"] += 1
+            return entry
+
+    async def _checkin(self, entry: _PooledBrowser):
+        async with self._lock:
+            entry.active -= 1
+            entry.pages += 1
+            if entry.retiring:
+                await self._close_if_idle(entry)
+            elif self.recycle_after_pages > 0 and entry.pages >= self.recycle_after_pages:
+                await self._retire(entry, "pages")
+            elif (self.recycle_memory_mb > 0 and entry.pages % MEMORY_CHECK_INTERVAL == 0
+                  and (await self._memory_mb(entry.browser) or 0) > self.recycle_memory_mb):
+                await self._retire(entry, "memory")
+
+    async def _memory_mb(self, browser) -> Optional[float]:
+        """Total resident memory of the browser's processes, None when it cannot be measured"""
+        try:
+            session = await browser.new_browser_cdp_session()
+            try:
+                info = await session.send("SystemInfo.getProcessInfo")
+            finally:
+                await session.detach()
+        except Exception as e:
+            logger.debug(f"Browser memory check unavailable: {e}")
+            return None
+        return sum(_process_rss_mb(process.get("id", 0)) for process in info.get("processInfo", []))
+
+    @asynccontextmanager
+    async def browser(self):
+        """Lease a pooled browser; callers create their own context on it"""
+        entry = await self._checkout()
+        try:
+            yield entry.browser
+        finally:
+            await self._checkin(entry)
+
+    @asynccontextmanager
+    async def page(self, **context_options):
+        """Lease a page in a fresh, isolated browser context"""
+        async with self.browser() as browser:
+            context = await browser.new_context(**context_options)
+            try:
+                yield await context.new_page()
+            finally:
+                await context.close()
+
+    async def close(self):
+        """Close all pooled browsers"""
+        async with self._lock:
+            browsers, self._browsers = self._browsers, []
+            for entry in browsers:
+                try:
+                    await entry.browser.close()
+                except Exception as e:
+                    logger.debug(f"Closing pooled browser failed, ignoring: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "browsers": [
+                {"active": entry.active, "pages": entry.pages, "retiring": entry.retiring}
+                for entry in self._browsers
+            ],
+            **self.stats,
+        }
@@ -0,0 +1,255 @@
+"""
+Batched enhancement of slide bullet points
+
+Bullet points from any number of slides are given stable ids (``s<slide>-p<point>``) and packed,
+slide by slide, into requests of at most ``bullet_enhance_batch_tokens`` input tokens. The batches
+run concurrently; the LLM governor keeps them within the provider and role limits. Each batch
+answers with a JSON object keyed by id, so results map back to their points regardless of order.
+Points that are missing or invalid in a response (or whose whole batch failed) are re-packed into
+smaller batches and retried up to ``bullet_enhance_max_retries`` times; points that still fail keep
+their original text and are reported as failed.
+"""
+
+import asyncio
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..ai import get_role_provider
+from ..core.config import ai_config
+from .slide_context_budget import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Upper bound of points per request, however short they are, to keep responses easy to parse
+MAX_BATCH_ITEMS = 40
+# Batches of retried points are packed against this fraction of the normal budget
+RETRY_BUDGET_FACTOR = 0.5
+# Bullet markers and numbering models sometimes prepend to a point; "3.5亿" is data, not numbering
+_POINT_PREFIX = re.compile(r"^\s*(?:[-*•·→▪▫]|\d+[、)）]|\d+\.(?!\d))\s*")
+
+
+@dataclass
+class BulletItem:
+    """A bullet point to enhance, addressed by its stable id"""
+    id: str
+    slide_index: int
+    point_index: int
+    text: str
+
+
+@dataclass
+class SlideBullets:
+    """The bullet points of one slide with the context shown to the model"""
+    slide_index: int
+    title: str
+    points: List[str]
+    slide_type: str = ""
+    description: str = ""
+
+
+def make_item_id(slide_index: int, point_index: int) -> str:
+    return f"s{slide_index}-p{point_index + 1}"
+
+
+def _slide_header(slide: SlideBullets) -> str:
+    header = f"### 第{slide.slide_index}页：{slide.title or '未命名'}"
+    if slide.slide_type:
+        header += f"（{slide.slide_type}）"
+    if slide.description:
+        header += f"\n页面说明：{slide.description}"
+    return header
+
+
+def pack_batches(items: List[BulletItem], slides: Dict[int, SlideBullets], token_budget: int) -> List[List[BulletItem]]:
+    """
+    Split items into batches of at most ``token_budget`` tokens (points plus their slide headers).
+
+    Items keep their order, so a slide's points stay together unless the slide alone exceeds the
+    budget. A single point larger than the budget gets a batch of its own.
+    """
+    batches: List[List[BulletItem]] = []
+    current: List[BulletItem] = []
+    current_tokens = 0
+    for item in items:
+        tokens = count_tokens(f"[{item.id}] {item.text}")
+        if not current or current[-1].slide_index != item.slide_index:
+            tokens += count_tokens(_slide_header(slides[item.slide_index]))
+        if current and (current_tokens + tokens > token_budget or len(current) >= MAX_BATCH_ITEMS):
+            batches.append(current)
+            current = []
+            # The slide header is repeated at the top of the new batch
+            tokens = count_tokens(f"[{item.id}] {item.text}") + count_tokens(_slide_header(slides[item.slide_index]))
+            current_tokens = 0
+        current.append(item)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_enhanced_points(response: str) -> Dict[str, str]:
+    """Map of id to enhanced text from a batch response; accepts an object or a list of {id, text}"""
+    text = response.strip()
+    fenced = re.search(r"```(?:json)?\s*(.*?)\s*```", text, re.DOTALL | re.IGNORECASE)
+    if fenced:
+        text = fenced.group(1)
+    start = min((i for i in (text.find("{"), text.find("[")) if i >= 0), default=-1)
+    if start < 0:
+        return {}
+    end = text.rfind("}" if text[start] == "{" else "]")
+    try:
+        payload = json.loads(text[start:end + 1])
+    except ValueError:
+        return {}
+
+    if isinstance(payload, dict):
+        payload = payload.get("points", payload)
+    if isinstance(payload, list):
+        payload = {entry.get("id"): entry.get("text") for entry in payload if isinstance(entry, dict)}
+    if not isinstance(payload, dict):
+        return {}
+    return {str(key): value for key, value in payload.items() if key}
+
+
+def _clean_point(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    value = _POINT_PREFIX.sub("", value.strip()).strip()
+    return value if len(value) >= 2 else None
+
+
+class BulletPointEnhancer:
+    """Enhances bullet points of many slides in concurrent, token-budgeted batches"""
+
+    def __init__(self):
+        self.stats = {
+            "requests": 0, "points": 0, "batches": 0, "failed_batches": 0,
+            "retried_points": 0, "failed_points": 0,
+        }
+
+    def _build_prompt(self, batch: List[BulletItem], slides: Dict[int, SlideBullets],
+                      project_info: Dict[str, Any], user_request: str) -> str:
+        sections = []
+        for item in batch:
+            if not sections or sections[-1][0] != item.slide_index:
+                sections.append((item.slide_index, [_slide_header(slides[item.slide_index])]))
+            sections[-1][1].append(f"[{item.id}] {item.text}")
+        points_text = "\n\n".join("\n".join(lines) for _, lines in sections)
+        example = ", ".join(f'"{item.id}": "增强后的要点"' for item in batch[:2])
+        scenario = project_info.get('scenario') or '商务'
+
+        return f"""请对以下PPT要点进行增强和优化。
+
+项目背景：
+- 项目：{project_info.get('title', '未知')}
+- 主题：{project_info.get('topic', '未知')}
+- 场景：{scenario}
+
+用户请求：{user_request or '增强和优化所有要点'}
+
+增强要求：
+1. 保持每个要点的核心意思不变
+2. 添加具体细节、数据或例子
+3. 使用更专业、准确的表达
+4. 保持简洁，避免冗长
+5. 确保同一页面的要点间逻辑连贯、风格统一
+6. 符合{scenario}场景的专业要求
+
+待增强的要点（方括号内为要点编号）：
+
+{points_text}
+
+重要：只返回一个JSON对象，键为要点编号，值为增强后的要点内容；必须包含上面的全部{len(batch)}个编号，不要添加编号、符号或任何解释。
+示例：{{{example}}}
+"""
+
+    async def _run_batch(self, provider, model: Optional[str], batch: List[BulletItem],
+                         slides: Dict[int, SlideBullets], project_info: Dict[str, Any],
+                         user_request: str) -> Dict[str, str]:
+        prompt = self._build_prompt(batch, slides, project_info, user_request)
+        self.stats["batches"] += 1
+        try:
+            response = await provider.text_completion(
+                prompt=prompt,
+                max_tokens=ai_config.max_tokens,
+                temperature=0.7,
+                model=model
+            )
+        except Exception as e:
+            self.stats["failed_batches"] += 1
+            logger.warning(f"Bullet point batch of {len(batch)} points failed: {e}")
+            return {}
+
+        parsed = parse_enhanced_points(response.content or "")
+        results = {}
+        for item in batch:
+            enhanced = _clean_point(parsed.get(item.id))
+            if enhanced:
+                results[item.id] = enhanced
+        if len(results) < len(batch):
+            logger.info(f"Bullet point batch returned {len(results)}/{len(batch)} valid points")
+        return results
+
+    async def enhance(self, slides: List[SlideBullets], project_info: Dict[str, Any],
+                      user_request: str = "") -> Tuple[Dict[str, str], List[BulletItem]]:
+        """
+        Enhance all points of ``slides``.
+
+        Returns the enhanced text by item id (failed points keep their original text) and the list
+        of points that could not be enhanced.
+        """
+        slides_by_index = {slide.slide_index: slide for slide in slides}
+        items = [
+            BulletItem(make_item_id(slide.slide_index, point_index), slide.slide_index, point_index, text.strip())
+            for slide in slides for point_index, text in enumerate(slide.points) if text and text.strip()
+        ]
+        self.stats["requests"] += 1
+        self.stats["points"] += len(items)
+        if not items:
+            return {}, []
+
+        provider, settings = get_role_provider("outline")
+        model = settings.get('model')
+        budget = max(200, ai_config.bullet_enhance_batch_tokens)
+        results: Dict[str, str] = {}
+        pending = items
+
+        for attempt in range(max(0, ai_config.bullet_enhance_max_retries) + 1):
+            if attempt:
+                self.stats["retried_points"] += len(pending)
+                budget = max(200, int(budget * RETRY_BUDGET_FACTOR))
+            batches = pack_batches(pending, slides_by_index, budget)
+            logger.info(f"Enhancing {len(pending)} bullet points in {len(batches)} batches (attempt {attempt + 1})")
+            batch_results = await asyncio.gather(*[
+                self._run_batch(provider, model, batch, slides_by_index, project_info, user_request)
+                for batch in batches
+            ])
+            for batch_result in batch_results:
+                results.update(batch_result)
+            pending = [item for item in pending if item.id not in results]
+            if not pending:
+                break
+
+        self.stats["failed_points"] += len(pending)
+        if pending:
+            logger.warning(f"{len(pending)} bullet points could not be enhanced, keeping original text")
+        for item in pending:
+            results[item.id] = item.text
+        return results, pending
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
+
+
+_bullet_point_enhancer: Optional[BulletPointEnhancer] = None
+
+
+def get_bullet_point_enhancer() -> BulletPointEnhancer:
+    """Get the global bullet point enhancer"""
+    global _bullet_point_enhancer
+    if _bullet_point_enhancer is None:
+        _bullet_point_enhancer = BulletPointEnhancer()
+    return _bullet_point_enhancer
@@ -88,6 +88,35 @@ class ConfigService:
             # Parallel Generation Configuration
             "enable_parallel_generation": {"type": "boolean", "category": "generation_params", "default": "false"},
             "parallel_slides_count": {"type": "number", "category": "generation_params", "default": "3"},
+            "image_pipeline_concurrency": {"type": "number", "category": "generation_params", "default": "4"},
+
+            # Hedged Slide Generation Configuration
+            "slide_hedge_enabled": {"type": "boolean", "category": "generation_params", "default": "false"},
+            "slide_hedge_provider": {"type": "select", "category": "generation_params", "default": ""},
+            "slide_hedge_model": {"type": "text", "category": "generation_params", "default": ""},
+            "slide_hedge_percentile": {"type": "number", "category": "generation_params", "default": "0.95"},
+            "slide_hedge_min_delay": {"type": "number", "category": "generation_params", "default": "5"},
+
+            # LLM Concurrency Governor Configuration
+            "llm_governor_enabled": {"type": "boolean", "category": "generation_params", "default": "true"},
+            "llm_max_concurrent_requests": {"type": "number", "category": "generation_params", "default": "32"},
+            "llm_provider_max_concurrency": {"type": "number", "category": "generation_params", "default": "8"},
+            "llm_provider_tokens_per_minute": {"type": "number", "category": "generation_params", "default": "0"},
+            "llm_role_max_concurrency": {"type": "text", "category": "generation_params", "default": ""},
+            "llm_role_tokens_per_minute": {"type": "text", "category": "generation_params", "default": ""},
+            "llm_rate_limit_max_retries": {"type": "number", "category": "generation_params", "default": "2"},
+            "llm_role_input_token_limits": {"type": "text", "category": "generation_params", "default": ""},
+            "slide_context_neighbors": {"type": "number", "category": "generation_params", "default": "0"},
+            "slide_context_summary_tokens": {"type": "number", "category": "generation_params", "default": "0"},
+            "bullet_enhance_batch_tokens": {"type": "number", "category": "generation_params", "default": "1500"},
+            "bullet_enhance_max_retries": {"type": "number", "category": "generation_params", "default": "2"},
+
+            # LLM Response Cache Configuration
+            "llm_cache_enabled": {"type": "boolean", "category": "generation_params", "default": "false"},
+            "llm_cache_memory_entries": {"type": "number", "category": "generation_params", "default": "512"},
+            "llm_cache_default_ttl": {"type": "number", "category": "generation_params", "default": "86400"},
+            "llm_cache_role_ttls": {"type": "text", "category": "generation_params", "default": ""},
+            "llm_cache_roles": {"type": "text", "category": "generation_params", "default": ""},
             
             "tavily_api_key": {"type": "password", "category": "generation_params"},
             "tavily_max_results": {"type": "number", "category": "generation_params", "default": "10"},
@@ -112,6 +141,10 @@ class ConfigService:
             "enable_local_models": {"type": "boolean", "category": "feature_flags", "default": "false"},
             "enable_streaming": {"type": "boolean", "category": "feature_flags", "default": "true"},
             "enable_auto_layout_repair": {"type": "boolean", "category": "generation_params", "default": "false"},
+            "layout_repair_mode": {"type": "select", "category": "generation_params", "default": "inline"},
+            "layout_inspection_batch_size": {"type": "number", "category": "generation_params", "default": "6"},
+            "slide_edit_mode": {"type": "select", "category": "generation_params", "default": "patch"},
+            "sse_disconnect_policies": {"type": "text", "category": "generation_params", "default": ""},
             "log_level": {"type": "select", "category": "feature_flags", "default": "INFO"},
             "log_ai_requests": {"type": "boolean", "category": "feature_flags", "default": "false"},
             "debug": {"type": "boolean", "category": "feature_flags", "default": "true"},
@@ -152,6 +185,7 @@ class ConfigService:
             # Global Image Configuration
             "max_total_images_per_slide": {"type": "number", "category": "image_service", "default": "3"},
             "enable_smart_image_selection": {"type": "boolean", "category": "image_service", "default": "true"},
+            "enable_fused_image_planning": {"type": "boolean", "category": "image_service", "default": "true"},
 
             # Image Generation Providers
             "openai_api_key_image": {"type": "password", "category": "image_service"},
@@ -12,15 +12,19 @@ import os
 import tempfile
 import base64
 import shutil
+import contextvars
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from ..api.models import (
     PPTGenerationRequest, PPTOutline, EnhancedPPTOutline,
     SlideContent, PPTProject, TodoBoard
 )
-from ..ai import get_ai_provider, get_role_provider, AIMessage, MessageRole
+from ..ai import get_ai_provider, get_role_provider, AIMessage, MessageRole, project_scope
+from ..ai.concurrency import current_project_id
+from ..ai.hedging import get_hedge_tracker
 from ..ai.base import TextContent, ImageContent
 from ..core.config import ai_config
 from .ppt_service import PPTService
@@ -31,22 +35,37 @@ from .prompts import prompts_manager
 from .research.enhanced_research_service import EnhancedResearchService
 from .research.enhanced_report_generator import EnhancedReportGenerator
 from .pyppeteer_pdf_converter import get_pdf_converter
+from .slide_context_budget import get_slide_context_budgeter
 from .image.image_service import ImageService
 from .image.adapters.ppt_prompt_adapter import PPTSlideContext
 from ..utils.thread_pool import run_blocking_io, to_thread
+from ..utils.html_stream_validator import StreamingHTMLValidator
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+# 在整套幻灯片生成任务中置为True：单页生成时跳过版式修复，生成结束后统一批量检测
+_deck_layout_pass: contextvars.ContextVar[bool] = contextvars.ContextVar("deck_layout_pass", default=False)
+
 class EnhancedPPTService(PPTService):
     """Enhanced PPT service with real AI integration and project management"""
 
+    # 内存中最多缓存的(项目, 模板)设计基因条目数
+    STYLE_GENES_CACHE_MAX_ENTRIES = 128
+
     def __init__(self, provider_name: Optional[str] = None):
         super().__init__()
         self.provider_name = provider_name
         self.project_manager = DatabaseProjectManager()
         self.global_template_service = GlobalMasterTemplateService(provider_name)
 
+        # 设计基因内存缓存（按项目和模板哈希，LRU）及进行中的提取任务
+        self._cached_style_genes: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._style_genes_inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+
+        # 图片流水线中提前启动的单页图片获取任务，按(项目ID, 页码)登记，供HTML生成阶段领取
+        self._slide_image_tasks: Dict[Tuple[str, int], asyncio.Task] = {}
+
         # 配置属性，用于summeryanyfile集成
         # 初始化配置（将在需要时实时更新）
         self.config = self._get_current_ai_config()
@@ -222,6 +241,14 @@ class EnhancedPPTService(PPTService):
             kwargs.setdefault("model", settings["model"])
         return await provider.chat_completion(messages=messages, **kwargs)
 
+    async def _stream_chat_completion_for_role(self, role: str, *, messages: List[AIMessage], **kwargs):
+        """调用指定角色的模型进行流式对话补全"""
+        provider, settings = self._get_role_provider(role)
+        if settings.get("model"):
+            kwargs.setdefault("model", settings["model"])
+        async for chunk in provider.stream_chat_completion(messages=messages, **kwargs):
+            yield chunk
+
     def update_ai_config(self):
         """更新AI配置到最新状态"""
         self.config = self._get_current_ai_config()
@@ -319,10 +346,17 @@ class EnhancedPPTService(PPTService):
         # 清理设计基因缓存
         self._cleanup_style_genes_cache()
 
+        # 清理过期的LLM响应缓存
+        try:
+            from ..ai.cache import get_llm_response_cache
+            removed = get_llm_response_cache().cleanup_expired()
+            logger.info(f"LLM响应缓存清理完成，删除了 {removed} 个过期条目")
+        except Exception as e:
+            logger.error(f"LLM响应缓存清理失败: {e}")
+
         # 清理内存缓存
-        if hasattr(self, '_cached_style_genes'):
-            self._cached_style_genes.clear()
-            logger.info("内存中的设计基因缓存已清理")
+        self._cached_style_genes.clear()
+        logger.info("内存中的设计基因缓存已清理")
 
     def _cleanup_style_genes_cache(self, max_age_days: int = 7):
         """清理过期的设计基因缓存文件"""
@@ -1417,11 +1451,12 @@ class EnhancedPPTService(PPTService):
 
             # Generate outline content directly without initial message
             try:
-                response = await self._text_completion_for_role("outline",
-                    prompt=prompt,
-                    max_tokens=ai_config.max_tokens,
-                    temperature=ai_config.temperature
-                )
+                with project_scope(project_id):
+                    response = await self._text_completion_for_role("outline",
+                        prompt=prompt,
+                        max_tokens=ai_config.max_tokens,
+                        temperature=ai_config.temperature
+                    )
 
                 # Get the AI response content
                 content = response.content.strip()
@@ -1709,7 +1744,8 @@ class EnhancedPPTService(PPTService):
             response = await self._text_completion_for_role("outline",
                 prompt=repair_prompt,
                 max_tokens=ai_config.max_tokens,
-                temperature=0.7  
+                temperature=0.7,
+                cache=True  # 相同的大纲与校验错误可复用修复结果
             )
 
             # 解析AI返回的修复结果
@@ -3143,185 +3179,184 @@ class EnhancedPPTService(PPTService):
 
             # 检查是否启用并行生成
             parallel_enabled = ai_config.enable_parallel_generation
-            parallel_count = ai_config.parallel_slides_count if parallel_enabled else 1
-            
+            parallel_count = max(1, ai_config.parallel_slides_count) if parallel_enabled else 1
+
             if parallel_enabled:
-                logger.info(f"🚀 并行生成已启用，每批生成 {parallel_count} 页")
+                logger.info(f"🚀 并行生成已启用，滑动窗口保持 {parallel_count} 页同时生成")
             else:
                 logger.info(f"📝 使用顺序生成模式")
-            
-            # 批量生成幻灯片（支持并行和顺序两种模式）
-            i = 0
-            while i < len(slides):
-                # 确定本批次要生成的幻灯片
-                batch_end = min(i + parallel_count, len(slides))
-                batch_slides = slides[i:batch_end]
-                
-                # 收集本批次需要生成的幻灯片
-                slides_to_generate = []
-                slides_to_skip = []
-                
-                for idx in range(i, batch_end):
-                    slide = slides[idx]
-                    
-                    # 检查是否已存在
-                    existing_slide = None
-                    if project.slides_data and idx < len(project.slides_data):
-                        existing_slide = project.slides_data[idx]
-                    
-                    if existing_slide and existing_slide.get('html_content'):
-                        # 幻灯片已存在，跳过
-                        if existing_slide.get('is_user_edited', False):
-                            skip_message = f'第{idx+1}页已被用户编辑，跳过重新生成'
-                        else:
-                            skip_message = f'第{idx+1}页已存在，跳过生成'
-                        
-                        skip_data = {
-                            'type': 'slide_skipped',
+
+            # 滑动窗口调度：任意一页完成即补充下一页，始终保持 parallel_count 页在生成中；
+            # 生成结果先缓存，再按页码顺序保存并推送给前端
+            total_slides = len(slides)
+            pending_slides = []
+            ready_results: Dict[int, Any] = {}
+
+            for idx, slide in enumerate(slides):
+                existing_slide = None
+                if project.slides_data and idx < len(project.slides_data):
+                    existing_slide = project.slides_data[idx]
+
+                if existing_slide and existing_slide.get('html_content'):
+                    # 幻灯片已存在，跳过（仍按页码顺序推送）
+                    ready_results[idx] = ('skipped', existing_slide)
+                else:
+                    pending_slides.append((idx, slide))
+
+            deck_layout_repair = self._deck_layout_repair_enabled()
+            generated_indices: List[int] = []
+
+            async def generate_with_metadata(idx, slide):
+                if deck_layout_repair:
+                    _deck_layout_pass.set(True)
+                # 归属到当前项目，便于LLM并发调度器在项目间公平排队
+                with project_scope(project_id):
+                    return await self._generate_single_slide_html_with_prompts(
+                        slide, confirmed_requirements, system_prompt,
+                        idx + 1, total_slides, slides, project.slides_data, project_id
+                    )
+
+            in_flight: Dict[asyncio.Task, int] = {}
+            next_pending = 0
+            next_emit = 0
+
+            # 图片流水线：所有待生成页面的图片获取提前并行启动，HTML生成时直接领取结果
+            image_tasks = await self._start_slide_image_pipeline(
+                project_id, pending_slides, confirmed_requirements, total_slides
+            )
+
+            try:
+                while next_emit < total_slides:
+                    # 补满空闲槽位
+                    while len(in_flight) < parallel_count and next_pending < len(pending_slides):
+                        idx, slide = pending_slides[next_pending]
+                        next_pending += 1
+                        task = asyncio.create_task(generate_with_metadata(idx, slide))
+                        in_flight[task] = idx
+                        slide_title = slide.get('title', '')
+                        logger.info(f"Generating slide {idx+1}/{total_slides}: {slide_title}")
+                        progress_data = {
+                            'type': 'progress',
                             'current': idx + 1,
-                            'total': len(slides),
-                            'message': skip_message,
-                            'slide_data': existing_slide
+                            'total': total_slides,
+                            'message': f'正在生成第{idx+1}页：{slide_title}...'
                         }
-                        yield f"data: {json.dumps(skip_data)}\n\n"
-                        slides_to_skip.append(idx)
-                    else:
-                        # 需要生成
-                        slides_to_generate.append((idx, slide))
-                
-                # 如果有需要生成的幻灯片
-                if slides_to_generate:
-                    if parallel_enabled and len(slides_to_generate) > 1:
-                        # 流式并行生成
-                        logger.info(f"📦 流式并行生成 {len(slides_to_generate)} 页")
-                        
-                        # 发送初始进度消息
-                        for idx, slide in slides_to_generate:
-                            progress_data = {
-                                'type': 'progress',
+                        yield f"data: {json.dumps(progress_data)}\n\n"
+
+                    # 按页码顺序输出已就绪的幻灯片
+                    while next_emit in ready_results:
+                        idx = next_emit
+                        status, payload = ready_results.pop(idx)
+                        next_emit += 1
+
+                        if status == 'skipped':
+                            if payload.get('is_user_edited', False):
+                                skip_message = f'第{idx+1}页已被用户编辑，跳过重新生成'
+                            else:
+                                skip_message = f'第{idx+1}页已存在，跳过生成'
+
+                            skip_data = {
+                                'type': 'slide_skipped',
                                 'current': idx + 1,
-                                'total': len(slides),
-                                'message': f'正在生成第{idx+1}页：{slide.get("title", "")}...'
+                                'total': total_slides,
+                                'message': skip_message,
+                                'slide_data': payload
                             }
-                            yield f"data: {json.dumps(progress_data)}\n\n"
-                        
-                        # 创建包装协程，返回结果和元数据
-                        async def generate_with_metadata(idx, slide):
-                            try:
-                                html_content = await self._generate_single_slide_html_with_prompts(
-                                    slide, confirmed_requirements, system_prompt,
-                                    idx + 1, len(slides), slides, project.slides_data, project_id
-                                )
-                                return idx, slide, html_content, None
-                            except Exception as e:
-                                return idx, slide, None, e
-                        
-                        # 创建所有并行任务
-                        tasks = [generate_with_metadata(idx, slide) for idx, slide in slides_to_generate]
-                        
-                        # 流式处理完成的任务 - 一旦某页生成完成，立即展示和添加
-                        for coro in asyncio.as_completed(tasks):
-                            idx, slide, html_content, error = await coro
-                            try:
-                                if error:
-                                    raise error
-                                logger.info(f"✅ 流式生成第{idx+1}页成功")
-                            except Exception as e:
-                                logger.error(f"❌ 流式生成第{idx+1}页失败: {e}")
-                                html_content = f"<div style='padding: 50px; text-align: center; color: red;'>生成失败：{str(e)}</div>"
-                            
-                            # 创建幻灯片数据
-                            slide_data = {
+                            yield f"data: {json.dumps(skip_data)}\n\n"
+                            continue
+
+                        slide = slides[idx]
+                        if status == 'error':
+                            logger.error(f"Error generating slide {idx+1}: {payload}")
+                            error_slide = {
                                 "page_number": idx + 1,
                                 "title": slide.get('title', f'第{idx+1}页'),
-                                "html_content": html_content,
-                                "is_user_edited": False
+                                "html_content": f"<div style='padding: 50px; text-align: center; color: red;'>生成失败：{str(payload)}</div>"
                             }
-                            
-                            # 更新项目数据
+
                             while len(project.slides_data) <= idx:
                                 project.slides_data.append(None)
-                            project.slides_data[idx] = slide_data
-                            
-                            # 保存到数据库
-                            try:
-                                from .db_project_manager import DatabaseProjectManager
-                                db_manager = DatabaseProjectManager()
-                                project.updated_at = time.time()
-                                await db_manager.save_single_slide(project_id, idx, slide_data)
-                                logger.info(f"💾 第{idx+1}页已保存到数据库")
-                            except Exception as save_error:
-                                logger.error(f"保存第{idx+1}页失败: {save_error}")
-                            
-                            # 立即发送幻灯片数据到前端
-                            slide_response = {'type': 'slide', 'slide_data': slide_data}
-                            yield f"data: {json.dumps(slide_response)}\n\n"
-                    else:
-                        # 顺序生成（未启用并行或只有一页）
-                        for idx, slide in slides_to_generate:
-                            try:
-                                # 发送进度更新
-                                slide_title = slide.get('title', '')
-                                progress_data = {
-                                    'type': 'progress',
-                                    'current': idx + 1,
-                                    'total': len(slides),
-                                    'message': f'正在生成第{idx+1}页：{slide_title}...'
-                                }
-                                yield f"data: {json.dumps(progress_data)}\n\n"
-                                logger.info(f"Generating slide {idx+1}/{len(slides)}: {slide_title}")
+                            project.slides_data[idx] = error_slide
 
-                                # 生成HTML
-                                html_content = await self._generate_single_slide_html_with_prompts(
-                                    slide, confirmed_requirements, system_prompt,
-                                    idx + 1, len(slides), slides, project.slides_data, project_id
-                                )
+                            error_response = {'type': 'slide', 'slide_data': error_slide}
+                            yield f"data: {json.dumps(error_response)}\n\n"
+                            continue
 
-                                # 创建幻灯片数据
-                                slide_data = {
-                                    "page_number": idx + 1,
-                                    "title": slide.get('title', f'第{idx+1}页'),
-                                    "html_content": html_content,
-                                    "is_user_edited": False
-                                }
+                        # 创建幻灯片数据
+                        slide_data = {
+                            "page_number": idx + 1,
+                            "title": slide.get('title', f'第{idx+1}页'),
+                            "html_content": payload,
+                            "is_user_edited": False
+                        }
 
-                                # 更新项目数据
-                                while len(project.slides_data) <= idx:
-                                    project.slides_data.append(None)
-                                project.slides_data[idx] = slide_data
+                        # 更新项目数据
+                        while len(project.slides_data) <= idx:
+                            project.slides_data.append(None)
+                        project.slides_data[idx] = slide_data
+                        generated_indices.append(idx)
 
-                                # 保存到数据库
-                                try:
-                                    from .db_project_manager import DatabaseProjectManager
-                                    db_manager = DatabaseProjectManager()
-                                    project.updated_at = time.time()
-                                    await db_manager.save_single_slide(project_id, idx, slide_data)
-                                    logger.info(f"Successfully saved slide {idx+1} to database for project {project_id}")
-                                except Exception as save_error:
-                                    logger.error(f"Failed to save slide {idx+1} to database: {save_error}")
-
-                                # 发送幻灯片数据
-                                slide_response = {'type': 'slide', 'slide_data': slide_data}
-                                yield f"data: {json.dumps(slide_response)}\n\n"
-
-                            except Exception as e:
-                                logger.error(f"Error generating slide {idx+1}: {e}")
-                                # 发送错误幻灯片
-                                error_slide = {
-                                    "page_number": idx + 1,
-                                    "title": slide.get('title', f'第{idx+1}页'),
-                                    "html_content": f"<div style='padding: 50px; text-align: center; color: red;'>生成失败：{str(e)}</div>"
-                                }
+                        # 保存到数据库
+                        try:
+                            from .db_project_manager import DatabaseProjectManager
+                            db_manager = DatabaseProjectManager()
+                            project.updated_at = time.time()
+                            await db_manager.save_single_slide(project_id, idx, slide_data)
+                            logger.info(f"Successfully saved slide {idx+1} to database for project {project_id}")
+                        except Exception as save_error:
+                            logger.error(f"Failed to save slide {idx+1} to database: {save_error}")
 
-                                while len(project.slides_data) <= idx:
-                                    project.slides_data.append(None)
-                                project.slides_data[idx] = error_slide
+                        # 发送幻灯片数据
+                        slide_response = {'type': 'slide', 'slide_data': slide_data}
+                        yield f"data: {json.dumps(slide_response)}\n\n"
 
-                                error_response = {'type': 'slide', 'slide_data': error_slide}
-                                yield f"data: {json.dumps(error_response)}\n\n"
-                
-                # 移动到下一批
-                i = batch_end
+                    if next_emit >= total_slides or not in_flight:
+                        continue
+
+                    # 等待任意一页完成，立即释放槽位
+                    done, _ = await asyncio.wait(in_flight.keys(), return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        idx = in_flight.pop(task)
+                        error = task.exception()
+                        if error is not None:
+                            ready_results[idx] = ('error', error)
+                        else:
+                            logger.info(f"✅ 第{idx+1}页生成完成")
+                            ready_results[idx] = ('generated', task.result())
+            except asyncio.CancelledError:
+                # 已完成的页面均已逐页保存，再次请求时跳过这些页面从断点继续
+                logger.info(f"Slide generation for project {project_id} cancelled after {next_emit}/{total_slides} slides")
+                raise
+            finally:
+                # 客户端断开或出现异常时，取消仍在生成的页面，并等待取消沿任务树传播完成
+                for task in in_flight:
+                    task.cancel()
+                self._stop_slide_image_pipeline(project_id, image_tasks)
+                await asyncio.gather(*in_flight, *image_tasks, return_exceptions=True)
+
+            # 整套版式检测：并发截图、多图批量送检，只修复被标记的页面
+            if deck_layout_repair and generated_indices:
+                inspection_data = {
+                    'type': 'layout_inspection',
+                    'message': f'正在检查 {len(generated_indices)} 页幻灯片的版式...'
+                }
+                yield f"data: {json.dumps(inspection_data)}\n\n"
+
+                with project_scope(project_id):
+                    repaired = await self._inspect_deck_layout(project.slides_data, slides, generated_indices)
+
+                for idx, repaired_html in sorted(repaired.items()):
+                    slide_data = dict(project.slides_data[idx], html_content=repaired_html)
+                    project.slides_data[idx] = slide_data
+                    try:
+                        from .db_project_manager import DatabaseProjectManager
+                        db_manager = DatabaseProjectManager()
+                        await db_manager.save_single_slide(project_id, idx, slide_data)
+                    except Exception as save_error:
+                        logger.error(f"Failed to save layout-repaired slide {idx+1} to database: {save_error}")
+
+                    update_response = {'type': 'slide_updated', 'slide_data': slide_data}
+                    yield f"data: {json.dumps(update_response)}\n\n"
 
             # Generate combined HTML
             project.slides_html = self._combine_slides_to_full_html(
@@ -3354,6 +3389,9 @@ class EnhancedPPTService(PPTService):
                 )
                 logger.info(f"Successfully updated PPT creation stage to completed for project {project_id}")
 
+                from .export_prerender import get_export_prerenderer
+                get_export_prerenderer().schedule(project_id)
+
             except Exception as save_error:
                 logger.error(f"Failed to update project status in database: {save_error}")
                 # Continue anyway, as the data is still in memory
@@ -3410,7 +3448,8 @@ class EnhancedPPTService(PPTService):
             # 如果有选中的全局母版，使用模板生成
             if selected_template:
                 return await self._generate_slide_with_template(
-                    slide_data, selected_template, page_number, total_pages, confirmed_requirements
+                    slide_data, selected_template, page_number, total_pages, confirmed_requirements,
+                    all_slides=all_slides
                 )
 
 
@@ -3419,11 +3458,13 @@ class EnhancedPPTService(PPTService):
             template_html = selected_template.get('html_template', '') if selected_template else ""  # 获取模板HTML作为风格参考
 
             # 否则使用原有的生成方式，但应用新的设计基因缓存和统一创意指导
-            # 获取或提取设计基因（只在第一页提取一次）
+            # 获取或提取设计基因（同一项目只提取一次，并行页面共享结果）
             style_genes = await self._get_or_extract_style_genes(project_id, template_html, page_number)
 
             # 检查是否启用图片生成服务并处理多图片
-            images_collection = await self._process_slide_image(slide_data, confirmed_requirements, page_number, total_pages, template_html)
+            images_collection = await self._process_slide_image(
+                slide_data, confirmed_requirements, page_number, total_pages, template_html, project_id=project_id
+            )
             if images_collection and images_collection.total_count > 0:
                 # 将图片集合信息添加到slide_data中，供后续生成使用
                 slide_data['images_collection'] = images_collection
@@ -3440,15 +3481,23 @@ class EnhancedPPTService(PPTService):
             # Build context information for better coherence
             context_info = self._build_slide_context(page_number, total_pages)
 
-            # 使用新的提示词模块生成上下文
-            context = prompts_manager.get_single_slide_html_prompt(
-                slide_data, confirmed_requirements, page_number, total_pages,
-                context_info, style_genes, unified_design_guide, template_html
+            # 使用新的提示词模块生成上下文（各页共享的稳定前缀在前，当前页内容在后）；
+            # 整套演示的上下文只包含相邻页面和定长摘要，并按角色输入token上限裁剪
+            budgeter = get_slide_context_budgeter()
+            context_prefix, context = budgeter.fit(
+                "slide_generation",
+                lambda deck_context: prompts_manager.get_single_slide_html_prompt_parts(
+                    slide_data, confirmed_requirements, page_number, total_pages,
+                    context_info, style_genes, unified_design_guide, template_html, deck_context
+                ),
+                budgeter.slide_context(all_slides, page_number),
+                fixed_text=system_prompt
             )
 
             # Try to generate HTML with retry mechanism for incomplete responses
             html_content = await self._generate_html_with_retry(
-                context, system_prompt, slide_data, page_number, total_pages, max_retries=5
+                context, system_prompt, slide_data, page_number, total_pages, max_retries=5,
+                context_prefix=context_prefix
             )
 
             return html_content
@@ -3459,8 +3508,77 @@ class EnhancedPPTService(PPTService):
             fallback_html = self._generate_fallback_slide_html(slide_data, page_number, total_pages)
         return await self._apply_auto_layout_repair(fallback_html, slide_data, page_number, total_pages)
 
+    async def _start_slide_image_pipeline(self, project_id: str, pending_slides: List[Tuple[int, Dict[str, Any]]],
+                                          confirmed_requirements: Dict[str, Any], total_pages: int) -> List[asyncio.Task]:
+        """为所有待生成页面提前启动图片获取，按image_pipeline_concurrency独立限流
+
+        图片获取（AI需求分析、搜索下载或AI生图）与其他页面的HTML生成重叠进行，
+        各页的HTML生成在_process_slide_image中直接等待对应任务的结果。
+        """
+        concurrency = ai_config.image_pipeline_concurrency
+        if concurrency <= 0 or not pending_slides:
+            return []
+
+        try:
+            from .config_service import config_service
+            if not config_service.get_config_by_category('image_service').get('enable_image_service', False):
+                return []
+        except Exception as e:
+            logger.warning(f"读取图片服务配置失败，不启动图片流水线: {e}")
+            return []
+
+        # 与HTML生成阶段使用相同的模板作为图片分析的风格参考
+        template_html = ""
+        try:
+            selected_template = await self.get_selected_global_template(project_id)
+            if selected_template:
+                template_html = selected_template.get('html_template', '')
+        except Exception as e:
+            logger.warning(f"获取全局母版失败，图片流水线不使用模板参考: {e}")
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def acquire(slide: Dict[str, Any], page_number: int):
+            async with semaphore:
+                with project_scope(project_id):
+                    return await self._acquire_slide_images(
+                        slide, confirmed_requirements, page_number, total_pages, template_html
+                    )
+
+        tasks = []
+        for idx, slide in pending_slides:
+            task = asyncio.create_task(acquire(slide, idx + 1))
+            self._slide_image_tasks[(project_id, idx + 1)] = task
+            tasks.append(task)
+
+        logger.info(f"🖼️ 图片流水线已启动：{len(tasks)} 页，并发 {concurrency}")
+        return tasks
+
+    def _stop_slide_image_pipeline(self, project_id: str, tasks: List[asyncio.Task]):
+        """取消未被领取的图片获取任务并清理登记"""
+        for task in tasks:
+            task.cancel()
+        for key in [key for key, task in self._slide_image_tasks.items() if key[0] == project_id and task in tasks]:
+            del self._slide_image_tasks[key]
+
     async def _process_slide_image(self, slide_data: Dict[str, Any], confirmed_requirements: Dict[str, Any],
-                                 page_number: int, total_pages: int, template_html: str = ""):
+                                 page_number: int, total_pages: int, template_html: str = "",
+                                 project_id: Optional[str] = None):
+        """获取幻灯片多图片，优先领取图片流水线中已提前启动的任务"""
+        project_id = project_id or current_project_id.get()
+        prefetched = self._slide_image_tasks.pop((project_id, page_number), None) if project_id else None
+        if prefetched is not None:
+            try:
+                if not prefetched.done():
+                    logger.info(f"第{page_number}页等待图片流水线完成图片获取")
+                return await prefetched
+            except Exception as e:
+                logger.warning(f"第{page_number}页图片流水线任务失败，改为直接获取: {e}")
+
+        return await self._acquire_slide_images(slide_data, confirmed_requirements, page_number, total_pages, template_html)
+
+    async def _acquire_slide_images(self, slide_data: Dict[str, Any], confirmed_requirements: Dict[str, Any],
+                                    page_number: int, total_pages: int, template_html: str = ""):
         """使用图片处理器处理幻灯片多图片"""
         try:
             # 初始化图片处理器
@@ -3485,7 +3603,8 @@ class EnhancedPPTService(PPTService):
 
     async def _generate_slide_with_template(self, slide_data: Dict[str, Any], template: Dict[str, Any],
                                           page_number: int, total_pages: int,
-                                          confirmed_requirements: Dict[str, Any]) -> str:
+                                          confirmed_requirements: Dict[str, Any],
+                                          all_slides: Optional[List[Dict[str, Any]]] = None) -> str:
         """使用选定的模板生成幻灯片HTML - AI参考模板风格生成新HTML"""
         try:
             # 获取模板HTML作为风格参考
@@ -3494,15 +3613,18 @@ class EnhancedPPTService(PPTService):
 
             logger.info(f"使用模板 {template_name} 作为风格参考生成第{page_number}页")
 
+            system_prompt = self._load_prompts_md_system_prompt()
+
             # 构建创意模板参考上下文
-            context = await self._build_creative_template_context(
-                slide_data, template_html, template_name, page_number, total_pages, confirmed_requirements
+            context_prefix, context = await self._build_creative_template_context(
+                slide_data, template_html, template_name, page_number, total_pages, confirmed_requirements,
+                all_slides=all_slides, system_prompt=system_prompt
             )
 
             # 使用AI生成风格一致但内容创新的HTML
-            system_prompt = self._load_prompts_md_system_prompt()
             html_content = await self._generate_html_with_retry(
-                context, system_prompt, slide_data, page_number, total_pages, max_retries=5
+                context, system_prompt, slide_data, page_number, total_pages, max_retries=5,
+                context_prefix=context_prefix
             )
 
             if html_content:
@@ -3521,18 +3643,25 @@ class EnhancedPPTService(PPTService):
 
     async def _build_creative_template_context(self, slide_data: Dict[str, Any], template_html: str,
                                        template_name: str, page_number: int, total_pages: int,
-                                       confirmed_requirements: Dict[str, Any]) -> str:
-        """构建创意模板参考上下文，平衡风格一致性与创意多样性（优化版本）"""
+                                       confirmed_requirements: Dict[str, Any],
+                                       all_slides: Optional[List[Dict[str, Any]]] = None,
+                                       system_prompt: str = "") -> Tuple[str, str]:
+        """构建创意模板参考上下文，平衡风格一致性与创意多样性（优化版本）
+
+        返回(项目内各页共享的稳定前缀, 当前页内容)，前缀可命中模型服务商的提示词缓存
+        """
 
         # 获取项目ID，检查是否已缓存设计基因
         project_id = confirmed_requirements.get('project_id')
         style_genes = None
 
-        # 设计基因只在第一页提取一次，后续都使用第一页的
+        # 设计基因同一项目和模板只提取一次，并行生成的页面共享同一次提取
         style_genes = await self._get_or_extract_style_genes(project_id, template_html, page_number)
 
         # 检查是否启用图片生成服务并处理多图片
-        images_collection = await self._process_slide_image(slide_data, confirmed_requirements, page_number, total_pages, template_html)
+        images_collection = await self._process_slide_image(
+            slide_data, confirmed_requirements, page_number, total_pages, template_html, project_id=project_id
+        )
         if images_collection and images_collection.total_count > 0:
             # 将图片集合信息添加到slide_data中，供后续生成使用
             slide_data['images_collection'] = images_collection
@@ -3555,25 +3684,30 @@ class EnhancedPPTService(PPTService):
         project_type = confirmed_requirements.get('type', '')
         project_audience = confirmed_requirements.get('target_audience', '')
         project_style = confirmed_requirements.get('ppt_style', 'general')
-        # 使用新的提示词模块
-        context = prompts_manager.get_creative_template_context_prompt(
-            slide_data=slide_data,
-            template_html=template_html,
-            slide_title=slide_title,
-            slide_type=slide_type,
-            page_number=page_number,
-            total_pages=total_pages,
-            context_info=context_info,
-            style_genes=style_genes,
-            unified_design_guide=unified_design_guide,
-            project_topic=project_topic,
-            project_type=project_type,
-            project_audience=project_audience,
-            project_style=project_style
+        # 使用新的提示词模块；整套演示的上下文按角色输入token上限裁剪
+        budgeter = get_slide_context_budgeter()
+        return budgeter.fit(
+            "slide_generation",
+            lambda deck_context: prompts_manager.get_creative_template_context_prompt_parts(
+                slide_data=slide_data,
+                template_html=template_html,
+                slide_title=slide_title,
+                slide_type=slide_type,
+                page_number=page_number,
+                total_pages=total_pages,
+                context_info=context_info,
+                style_genes=style_genes,
+                unified_design_guide=unified_design_guide,
+                project_topic=project_topic,
+                project_type=project_type,
+                project_audience=project_audience,
+                project_style=project_style,
+                deck_context=deck_context
+            ),
+            budgeter.slide_context(all_slides, page_number),
+            fixed_text=system_prompt
         )
 
-        return context
-
     async def _extract_style_genes(self, template_html: str) -> str:
         """使用AI从模板中提取核心设计基因"""
         try:
@@ -3584,7 +3718,8 @@ class EnhancedPPTService(PPTService):
             response = await self._text_completion_for_role("creative",
                 prompt=prompt,
                 max_tokens=ai_config.max_tokens,
-                temperature=0.3
+                temperature=0.3,
+                cache=True  # 同一模板的设计基因可复用
             )
 
             ai_genes = response.content.strip()
@@ -3647,70 +3782,101 @@ class EnhancedPPTService(PPTService):
 
         return "\n".join(genes) if genes else "- 使用现代简洁的设计风格"
 
-    async def _get_or_extract_style_genes(self, project_id: str, template_html: str, page_number: int) -> str:
-        """获取或提取设计基因，只在第一页提取一次，后续复用"""
-        import json
+    @staticmethod
+    def _style_genes_template_hash(template_html: str) -> str:
         import hashlib
-        from pathlib import Path
+        return hashlib.md5((template_html or "").encode()).hexdigest()[:8]
 
-        # 如果没有项目ID，直接提取
-        if not project_id:
-            if page_number == 1:
-                return await self._extract_style_genes(template_html)
-            else:
-                return "- 使用现代简洁的设计风格\n- 保持页面整体一致性\n- 采用清晰的视觉层次"
+    async def _get_or_extract_style_genes(self, project_id: str, template_html: str, page_number: int) -> str:
+        """获取或提取设计基因，同一项目和模板只提取一次
+
+        并行生成时各页面可能同时到达这里，所有调用方共享同一个提取任务（single-flight），
+        不再依赖第一页先完成，也不会重复调用AI提取。
+        """
+        cache_key = (project_id or "", self._style_genes_template_hash(template_html))
 
         # 检查内存缓存
-        if hasattr(self, '_cached_style_genes') and project_id in self._cached_style_genes:
-            logger.info(f"从内存缓存获取项目 {project_id} 的设计基因")
-            return self._cached_style_genes[project_id]
+        style_genes = self._cached_style_genes.get(cache_key)
+        if style_genes:
+            self._cached_style_genes.move_to_end(cache_key)
+            logger.info(f"从内存缓存获取项目 {project_id} 的设计基因（第{page_number}页）")
+            return style_genes
+
+        # 已有提取任务时等待其结果；shield避免单个页面被取消时中断共享的提取任务
+        extraction = self._style_genes_inflight.get(cache_key)
+        if extraction is None:
+            extraction = asyncio.create_task(self._load_or_extract_style_genes(project_id, template_html, cache_key))
+            self._style_genes_inflight[cache_key] = extraction
+            extraction.add_done_callback(lambda _: self._style_genes_inflight.pop(cache_key, None))
+        else:
+            logger.info(f"第{page_number}页等待项目 {project_id} 正在进行的设计基因提取")
+
+        style_genes = await asyncio.shield(extraction)
+        return style_genes or "- 使用现代简洁的设计风格\n- 保持页面整体一致性\n- 采用清晰的视觉层次"
+
+    def _remember_style_genes(self, cache_key: Tuple[str, str], style_genes: str):
+        self._cached_style_genes[cache_key] = style_genes
+        self._cached_style_genes.move_to_end(cache_key)
+        while len(self._cached_style_genes) > self.STYLE_GENES_CACHE_MAX_ENTRIES:
+            self._cached_style_genes.popitem(last=False)
+
+    def _read_style_genes_cache_file(self, project_id: str, template_hash: str) -> Optional[str]:
+        import json
+
+        cache_file = self.cache_dirs['style_genes'] / f"{project_id}_style_genes.json"
+        if not cache_file.exists():
+            return None
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache_data = json.load(f)
+        # 模板变化后旧的设计基因不再适用
+        if cache_data.get('template_hash', template_hash) != template_hash:
+            return None
+        return cache_data.get('style_genes')
+
+    def _write_style_genes_cache_file(self, project_id: str, template_hash: str, style_genes: str):
+        import json
+
+        cache_file = self.cache_dirs['style_genes'] / f"{project_id}_style_genes.json"
+        cache_data = {
+            'project_id': project_id,
+            'style_genes': style_genes,
+            'created_at': time.time(),
+            'template_hash': template_hash
+        }
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+
+    async def _load_or_extract_style_genes(self, project_id: str, template_html: str,
+                                           cache_key: Tuple[str, str]) -> str:
+        """从文件缓存读取设计基因，没有则调用AI提取并写入内存和文件缓存"""
+        template_hash = cache_key[1]
+        use_file_cache = bool(project_id and self.cache_dirs)
 
         # 检查文件缓存（如果有缓存目录配置）
         style_genes = None
-        if hasattr(self, 'cache_dirs') and self.cache_dirs:
-            cache_file = self.cache_dirs['style_genes'] / f"{project_id}_style_genes.json"
-            if cache_file.exists():
-                try:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                        style_genes = cache_data.get('style_genes')
-                        logger.info(f"从文件缓存获取项目 {project_id} 的设计基因")
-                except Exception as e:
-                    logger.warning(f"读取设计基因缓存文件失败: {e}")
+        if use_file_cache:
+            try:
+                style_genes = await run_blocking_io(self._read_style_genes_cache_file, project_id, template_hash)
+                if style_genes:
+                    logger.info(f"从文件缓存获取项目 {project_id} 的设计基因")
+            except Exception as e:
+                logger.warning(f"读取设计基因缓存文件失败: {e}")
 
-        # 如果没有缓存且是第一页，提取设计基因
-        if not style_genes and page_number == 1:
+        if not style_genes:
             style_genes = await self._extract_style_genes(template_html)
 
-            # 缓存到内存
-            if not hasattr(self, '_cached_style_genes'):
-                self._cached_style_genes = {}
-            self._cached_style_genes[project_id] = style_genes
-
-            # 缓存到文件（如果有缓存目录配置）
-            if hasattr(self, 'cache_dirs') and self.cache_dirs:
+            if use_file_cache:
                 try:
-                    cache_file = self.cache_dirs['style_genes'] / f"{project_id}_style_genes.json"
-                    cache_data = {
-                        'project_id': project_id,
-                        'style_genes': style_genes,
-                        'created_at': time.time(),
-                        'template_hash': hashlib.md5(template_html.encode()).hexdigest()[:8]
-                    }
-                    with open(cache_file, 'w', encoding='utf-8') as f:
-                        json.dump(cache_data, f, ensure_ascii=False, indent=2)
-                    logger.info(f"第一页提取并缓存项目 {project_id} 的设计基因到文件")
+                    await run_blocking_io(self._write_style_genes_cache_file, project_id, template_hash, style_genes)
+                    logger.info(f"提取并缓存项目 {project_id} 的设计基因到文件")
                 except Exception as e:
                     logger.warning(f"保存设计基因缓存文件失败: {e}")
 
-            logger.info(f"第一页提取并缓存项目 {project_id} 的设计基因")
+            logger.info(f"提取并缓存项目 {project_id} 的设计基因")
 
-        elif not style_genes and page_number > 1:
-            # 如果不是第一页且没有缓存的设计基因，使用默认设计基因
-            style_genes = "- 使用现代简洁的设计风格\n- 保持页面整体一致性\n- 采用清晰的视觉层次"
-            logger.warning(f"第{page_number}页未找到缓存的设计基因，使用默认设计基因（设计基因应在第一页提取）")
-
-        return style_genes or "- 使用现代简洁的设计风格\n- 保持页面整体一致性\n- 采用清晰的视觉层次"
+        if style_genes:
+            self._remember_style_genes(cache_key, style_genes)
+        return style_genes
 
     async def _generate_unified_design_guide(self, slide_data: Dict[str, Any], page_number: int, total_pages: int) -> str:
         """生成统一的创意设计指导（合并创意变化指导和内容驱动的设计建议）"""
@@ -4251,9 +4417,166 @@ class EnhancedPPTService(PPTService):
 
 
 
+    @staticmethod
+    def _build_prefix_cached_messages(system_prompt: str, context_prefix: str, context: str) -> List[AIMessage]:
+        """Build slide generation messages with the project-stable part first and marked cacheable.
+
+        The system prompt and ``context_prefix`` are identical for every slide of a project, so
+        providers with prompt caching (Anthropic cache_control, OpenAI-compatible automatic prefix
+        caching) only process them once; ``context`` carries the slide-specific instructions.
+        """
+        cache_control = {"type": "ephemeral"}
+        messages = []
+        if system_prompt:
+            messages.append(AIMessage(
+                role=MessageRole.SYSTEM,
+                content=[TextContent(text=system_prompt, cache_control=None if context_prefix else cache_control)]
+            ))
+        user_parts = []
+        if context_prefix:
+            user_parts.append(TextContent(text=context_prefix, cache_control=cache_control))
+        user_parts.append(TextContent(text=context))
+        messages.append(AIMessage(role=MessageRole.USER, content=user_parts))
+        return messages
+
+    def _get_slide_hedge_target(self):
+        """获取对冲请求使用的备用提供者和模型，未启用时返回None"""
+        if not getattr(ai_config, "slide_hedge_enabled", False) or not ai_config.slide_hedge_provider:
+            return None
+        primary_provider, _ = self._get_role_provider("slide_generation")
+        if not primary_provider.supports_streaming:
+            # 主提供者不支持真正的流式输出，首个token即完整响应，按首token延迟对冲没有意义
+            return None
+        try:
+            provider, settings = get_role_provider("slide_generation",
+                                                   provider_override=ai_config.slide_hedge_provider)
+        except Exception as e:
+            logger.warning(f"Slide hedge provider {ai_config.slide_hedge_provider} unavailable: {e}")
+            return None
+        return provider, ai_config.slide_hedge_model or settings.get("model")
+
+    async def _consume_html_stream(self, stream, validator: StreamingHTMLValidator, on_first_chunk=None):
+        """读取流式输出到校验器，文档闭合或结构出错时停止"""
+        try:
+            async for chunk in stream:
+                if on_first_chunk is not None and chunk:
+                    on_first_chunk()
+                    on_first_chunk = None
+                if validator.feed_chunk(chunk):
+                    break
+        finally:
+            # 提前结束或被取消时关闭流，释放连接和并发槽位
+            await stream.aclose()
+        return validator
+
+    async def _stream_slide_html(self, messages: List[AIMessage], page_number: int) -> Tuple[str, bool]:
+        """流式生成单页HTML，边接收边检查标签结构
+
+        文档在</html>处闭合后立即停止读取并丢弃其后的输出；结构明显错误（模型重新输出文档、
+        多处标签错配）时提前中止。返回(已接收内容, 是否因结构错误中止)。
+
+        启用对冲时，若主请求在近期首token延迟的指定分位数内仍未返回首个token，则向备用
+        提供者/模型发送相同请求，先得到完整有效HTML的一方胜出，另一方被取消。
+        """
+        params = {"max_tokens": ai_config.max_tokens, "temperature": max(0.1, ai_config.temperature)}
+        tracker = get_hedge_tracker()
+        hedge_target = self._get_slide_hedge_target()
+        started = time.monotonic()
+        primary_started = asyncio.Event()
+
+        def record_first_token():
+            primary_started.set()
+            tracker.record_first_token(time.monotonic() - started)
+
+        validators = {"primary": StreamingHTMLValidator()}
+        primary = asyncio.create_task(self._consume_html_stream(
+            self._stream_chat_completion_for_role("slide_generation", messages=messages, **params),
+            validators["primary"], record_first_token
+        ))
+        contenders = {primary: "primary"}
+        finished = {}
+        errors = {}
+        winner = None
+        try:
+            if hedge_target:
+                first_token = asyncio.create_task(primary_started.wait())
+                await asyncio.wait({primary, first_token}, timeout=tracker.hedge_delay(),
+                                   return_when=asyncio.FIRST_COMPLETED)
+                first_token.cancel()
+                if not primary_started.is_set() and not primary.done():
+                    hedge_provider, hedge_model = hedge_target
+                    logger.info(f"No first token for slide {page_number} after {time.monotonic() - started:.1f}s, "
+                                f"hedging to {ai_config.slide_hedge_provider}/{hedge_model}")
+                    hedge_kwargs = dict(params, model=hedge_model) if hedge_model else params
+                    validators["secondary"] = StreamingHTMLValidator()
+                    secondary = asyncio.create_task(self._consume_html_stream(
+                        hedge_provider.stream_chat_completion(messages=messages, **hedge_kwargs),
+                        validators["secondary"]
+                    ))
+                    contenders[secondary] = "secondary"
+
+            pending = set(contenders)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    label = contenders[task]
+                    if task.exception() is not None:
+                        errors[label] = task.exception()
+                        if len(contenders) > 1:
+                            logger.warning(f"{label} HTML stream for slide {page_number} failed: {task.exception()}")
+                        continue
+                    finished[label] = task.result()
+                    if finished[label].complete and winner is None:
+                        winner = label
+        finally:
+            if not primary.done() and not primary_started.is_set():
+                # 主请求在首个token前被取消：真实延迟至少为已等待时间，记为截尾样本，
+                # 否则慢请求永远不进入样本，对冲延迟会持续偏低
+                tracker.record_first_token(time.monotonic() - started)
+            for task in contenders:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*contenders, return_exceptions=True)
+
+        hedged = len(contenders) > 1
+        if hedged and winner is not None:
+            # 被取消或未胜出一方已消耗的输出计为浪费；没有胜出者时所有输出都参与了结果选择
+            wasted = "".join(v.text for label, v in validators.items() if label != winner)
+            logger.info(f"Hedged slide {page_number}: {winner} stream won, "
+                        f"{len(wasted)} chars from the other stream discarded")
+        else:
+            wasted = ""
+        tracker.record_outcome(hedged, winner, wasted)
+
+        if winner is not None:
+            validator = finished[winner]
+        elif finished:
+            # 没有完整文档时优先返回未出现结构错误的输出，其次是主请求的输出
+            validator = sorted(finished.items(), key=lambda item: (item[1].failed, item[0] != "primary"))[0][1]
+        else:
+            # 所有流均出错，抛出主请求的异常交由重试逻辑处理
+            raise errors.get("primary") or next(iter(errors.values()))
+
+        if validator.failed:
+            logger.warning(f"HTML stream for slide {page_number} aborted after {len(validator.text)} chars: "
+                           f"{'; '.join(validator.errors)}")
+            return validator.text, True
+        if validator.complete:
+            trimmed = len(validator.text) - len(validator.document)
+            logger.info(f"HTML stream for slide {page_number} closed at </html> ({len(validator.document)} chars, "
+                        f"{trimmed} trailing chars dropped)")
+            return validator.document, False
+        logger.warning(f"HTML stream for slide {page_number} ended before </html>, output may be truncated")
+        return validator.text, False
+
     async def _generate_html_with_retry(self, context: str, system_prompt: str, slide_data: Dict[str, Any],
-                                      page_number: int, total_pages: int, max_retries: int = 3) -> str:
-        """Generate HTML with retry mechanism for incomplete responses"""
+                                      page_number: int, total_pages: int, max_retries: int = 3,
+                                      context_prefix: str = "") -> str:
+        """Generate HTML with retry mechanism for incomplete responses
+
+        ``context_prefix`` is the part of the prompt shared by all slides of the project; it is
+        sent before ``context`` so that it can be served from the provider's prompt cache.
+        """
 
         for attempt in range(max_retries):
             try:
@@ -4275,16 +4598,23 @@ class EnhancedPPTService(PPTService):
                 # Use the existing ai_config from imports
 
                 # Generate HTML
-                response = await self._text_completion_for_role("slide_generation",
-                    prompt=retry_context,
-                    system_prompt=system_prompt,
-                    max_tokens=ai_config.max_tokens,  # Increase token limit for retries
-                    temperature=max(0.1, ai_config.temperature)  # Reduce temperature for retries
-                )
+                messages = self._build_prefix_cached_messages(system_prompt, context_prefix, retry_context)
+                if ai_config.enable_streaming:
+                    raw_content, stream_failed = await self._stream_slide_html(messages, page_number)
+                    if stream_failed and attempt < max_retries - 1:
+                        logger.info(f"🔄 Aborted malformed HTML stream for slide {page_number}, retrying...")
+                        continue
+                else:
+                    response = await self._chat_completion_for_role("slide_generation",
+                        messages=messages,
+                        max_tokens=ai_config.max_tokens,  # Increase token limit for retries
+                        temperature=max(0.1, ai_config.temperature)  # Reduce temperature for retries
+                    )
+                    raw_content = response.content
 
                 # Clean and extract HTML
                 try:
-                    html_content = self._clean_html_response(response.content)
+                    html_content = self._clean_html_response(raw_content)
                     if not html_content or len(html_content.strip()) < 50:
                         logger.warning(f"AI returned empty or too short HTML content for slide {page_number}")
                         continue
@@ -4621,24 +4951,23 @@ class EnhancedPPTService(PPTService):
         logger.error("Failed to extract HTML from AI response")
         return ""
 
-    async def _apply_auto_layout_repair(
-        self,
-        html_content: str,
-        slide_data: Dict[str, Any],
-        page_number: int,
-        total_pages: int
-    ) -> str:
-        """Invoke multimodal vision model to inspect and repair layout when feature flag is enabled."""
+    @staticmethod
+    def _auto_layout_repair_enabled() -> bool:
+        """Whether auto layout repair is on (ENABLE_AUTO_LAYOUT_REPAIR overrides the saved setting)."""
         feature_flag_enabled = getattr(ai_config, "enable_auto_layout_repair", False)
         env_override = os.getenv("ENABLE_AUTO_LAYOUT_REPAIR")
         if env_override is not None:
             feature_flag_enabled = str(env_override).lower() in {"true", "1", "yes", "on"}
-        logger.info("Auto layout repair feature flag enabled: %s", feature_flag_enabled)
-        if not html_content or not feature_flag_enabled:
-            return html_content
+        return feature_flag_enabled
+
+    def _deck_layout_repair_enabled(self) -> bool:
+        """Whether layout repair runs as one deck-level pass after generation instead of per slide."""
+        return self._auto_layout_repair_enabled() and getattr(ai_config, "layout_repair_mode", "inline") == "deck"
 
+    def _get_layout_vision_provider(self) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """Resolve the vision analysis provider and settings, None when none is configured or usable."""
         try:
-            vision_provider, vision_settings = self._get_role_provider("vision_analysis")
+            return self._get_role_provider("vision_analysis")
         except ValueError as role_error:
             provider_name = getattr(ai_config, "vision_analysis_model_provider", None)
             model_name = getattr(ai_config, "vision_analysis_model_name", None)
@@ -4662,6 +4991,7 @@ class EnhancedPPTService(PPTService):
                         provider_name,
                         model_name,
                     )
+                    return vision_provider, vision_settings
                 except Exception as provider_error:  # noqa: BLE001
                     logger.warning(
                         "Failed to initialize vision analysis provider (%s): %s",
@@ -4670,13 +5000,260 @@ class EnhancedPPTService(PPTService):
                         exc_info=True,
                     )
                     logger.info("Skipping auto layout repair due to provider initialization failure")
-                    return html_content
+                    return None
             else:
                 logger.info(
                     "Vision analysis role not configured (missing provider). Original error: %s",
                     role_error,
                 )
-                return html_content
+                return None
+
+    async def _run_vision_inspection(
+        self,
+        vision_provider,
+        model_name: Optional[str],
+        messages: List[AIMessage],
+        label: str
+    ) -> Optional[str]:
+        """Send an inspection request to the vision model with retries, returns the report text or None."""
+        inspection_response = None
+        for attempt in range(3):
+            try:
+                inspection_response = await vision_provider.chat_completion(messages=messages, model=model_name)
+                if inspection_response and getattr(inspection_response, "content", None):
+                    break
+                raise ValueError("Vision provider returned empty response")
+            except Exception as vision_error:
+                logger.warning(
+                    "Vision inspection attempt %s failed for %s: %s",
+                    attempt + 1,
+                    label,
+                    vision_error,
+                    exc_info=True
+                )
+                inspection_response = None
+                if attempt < 2:
+                    await asyncio.sleep(0.5 * (attempt + 1))
+
+        if not inspection_response or not getattr(inspection_response, "content", None):
+            logger.error("Vision inspection could not be completed after retries for %s", label)
+            return None
+
+        inspection_report = self._strip_think_tags(inspection_response.content)
+        logger.info("Vision inspection response for %s: %s", label, inspection_report[:1000])
+        return inspection_report
+
+    async def _repair_slide_layout(
+        self,
+        html_content: str,
+        inspection_report: str,
+        page_number: int,
+        layout_report: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Ask the slide generation model to fix the reported layout issues, returns the original HTML on failure."""
+        repair_prompt = self._build_layout_repair_prompt(html_content, inspection_report, layout_report)
+        repair_response = None
+        for attempt in range(3):
+            try:
+                repair_response = await self._text_completion_for_role(
+                    "slide_generation",
+                    prompt=repair_prompt,
+                    max_tokens=min(ai_config.max_tokens, 4000),
+                    temperature=min(0.5, max(0.1, ai_config.temperature * 0.5))
+                )
+                if repair_response and getattr(repair_response, "content", None):
+                    break
+                raise ValueError("Layout repair model returned empty response")
+            except Exception as repair_error:
+                logger.warning(
+                    "Layout repair attempt %s failed for slide %s: %s",
+                    attempt + 1,
+                    page_number,
+                    repair_error,
+                    exc_info=True
+                )
+                repair_response = None
+                if attempt < 2:
+                    await asyncio.sleep(0.5 * (attempt + 1))
+
+        if not repair_response or not getattr(repair_response, "content", None):
+            logger.error(
+                "Layout repair could not be completed after retries for slide %s, returning original HTML",
+                page_number
+            )
+            return html_content
+
+        repair_content = self._strip_think_tags(repair_response.content)
+        logger.debug(
+            "Layout repair response for slide %s: %s",
+            page_number,
+            repair_content[:1000]
+        )
+
+        repaired_html = self._clean_html_response(repair_content)
+        if repaired_html and repaired_html.strip() and repaired_html.strip() != html_content.strip():
+            logger.info(f"Auto layout repair applied for slide {page_number}")
+            return repaired_html
+
+        logger.debug("Auto layout repair produced no improvements, keeping original HTML")
+        return html_content
+
+    async def _inspect_deck_layout(
+        self,
+        slides_data: List[Dict[str, Any]],
+        outline_slides: List[Dict[str, Any]],
+        indices: List[int]
+    ) -> Dict[int, str]:
+        """
+        Deck-level layout inspection of the given slides, returns repaired HTML by slide index.
+
+        All slides are measured (and, when problems are found, screenshotted) concurrently through
+        the shared browser, the flagged ones go to the vision model in multi-image batches of
+        ``layout_inspection_batch_size``, and only slides the model confirms are repaired. Verdicts
+        are cached by slide HTML, so unchanged slides are not inspected again on later runs.
+        """
+        from .layout_inspection_cache import get_layout_inspection_cache
+        from .slide_image_encoding import encode_slide_image
+
+        vision = self._get_layout_vision_provider()
+        if vision is None:
+            return {}
+        vision_provider, vision_settings = vision
+        model_name = vision_settings.get("model") or vision_settings.get("default_model")
+
+        pdf_converter = get_pdf_converter()
+        if not pdf_converter.is_available():
+            logger.debug("PDF converter unavailable, skipping deck layout inspection")
+            return {}
+
+        cache = get_layout_inspection_cache()
+        total_pages = len(slides_data)
+        keys = {idx: cache.make_key(slides_data[idx]["html_content"], model_name) for idx in indices}
+        verdicts: Dict[int, Dict[str, Any]] = {}
+        for idx in indices:
+            cached = await run_blocking_io(cache.get, keys[idx])
+            if cached is not None:
+                verdicts[idx] = cached
+        pending = [idx for idx in indices if idx not in verdicts]
+        logger.info(
+            "Deck layout inspection: %s slide(s), %s cached, %s to inspect",
+            len(indices), len(verdicts), len(pending)
+        )
+
+        flagged: List[Tuple[int, Optional[Dict[str, Any]], str]] = []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+
+            def write_slides():
+                for idx in pending:
+                    (tmp_path / f"slide_{idx}.html").write_text(slides_data[idx]["html_content"], encoding="utf-8")
+
+            await run_blocking_io(write_slides)
+            jobs = [(str(tmp_path / f"slide_{idx}.html"), str(tmp_path / f"slide_{idx}.png")) for idx in pending]
+            layout_reports = await pdf_converter.inspect_multiple_layouts(jobs, width=1280, height=720)
+
+            unmeasured = [job for job, report in zip(jobs, layout_reports) if report is None]
+            if unmeasured:
+                # 测量失败的页面直接截图，交给视觉模型判断
+                await pdf_converter.screenshot_multiple_html(unmeasured, width=1280, height=720)
+
+            for idx, layout_report in zip(pending, layout_reports):
+                if layout_report is not None and not layout_report.get("has_problems"):
+                    verdicts[idx] = {"needs_repair": False, "report": "", "layout": layout_report}
+                    await run_blocking_io(cache.put, keys[idx], verdicts[idx])
+                    continue
+                screenshot_path = tmp_path / f"slide_{idx}.png"
+                if not screenshot_path.exists():
+                    logger.warning("Deck layout inspection: no screenshot for slide %s, skipping", idx + 1)
+                    continue
+                # 批量送检时按1280宽度重新编码为JPEG，控制多图请求的体积
+                encoded_path, _ = await run_blocking_io(
+                    encode_slide_image, str(screenshot_path), str(tmp_path / f"slide_{idx}_vision"),
+                    "jpeg", 85, 96, 1280 / 96
+                )
+                image_b64 = base64.b64encode(Path(encoded_path).read_bytes()).decode("utf-8")
+                flagged.append((idx, layout_report, image_b64))
+
+        batch_size = max(1, getattr(ai_config, "layout_inspection_batch_size", 6))
+        batches = [flagged[start:start + batch_size] for start in range(0, len(flagged), batch_size)]
+
+        async def inspect_batch(batch):
+            content = [TextContent(text=self._build_deck_layout_inspection_prompt(
+                [(idx + 1, outline_slides[idx], layout_report) for idx, layout_report, _ in batch], total_pages
+            ))]
+            for idx, _, image_b64 in batch:
+                content.append(TextContent(text=f"第{idx + 1}页截图："))
+                content.append(ImageContent(image_url={"url": f"data:image/jpeg;base64,{image_b64}"}))
+            messages = [
+                AIMessage(
+                    role=MessageRole.SYSTEM,
+                    content="You are an expert presentation designer. Inspect slides for layout issues and respond with actionable insights."
+                ),
+                AIMessage(role=MessageRole.USER, content=content)
+            ]
+            label = "slides " + ", ".join(str(idx + 1) for idx, _, _ in batch)
+            report = await self._run_vision_inspection(vision_provider, model_name, messages, label)
+            sections = self._split_deck_inspection_report(report or "")
+
+            for idx, layout_report, _ in batch:
+                section = sections.get(idx + 1)
+                if section is None:
+                    # 视觉模型未给出该页结论时按DOM测量结果修复，且不写入缓存
+                    if layout_report is not None:
+                        verdicts[idx] = {"needs_repair": True, "report": self._format_layout_report(layout_report),
+                                         "layout": layout_report}
+                    continue
+                verdicts[idx] = {"needs_repair": not self._should_skip_layout_repair(section),
+                                 "report": section, "layout": layout_report}
+                await run_blocking_io(cache.put, keys[idx], verdicts[idx])
+
+        await asyncio.gather(*(inspect_batch(batch) for batch in batches))
+        await run_blocking_io(cache.evict)
+
+        to_repair = [idx for idx in indices if verdicts.get(idx, {}).get("needs_repair")]
+        logger.info(
+            "Deck layout inspection: %s slide(s) sent to vision in %s batch(es), %s flagged for repair",
+            len(flagged), len(batches), len(to_repair)
+        )
+
+        async def repair(idx):
+            verdict = verdicts[idx]
+            original_html = slides_data[idx]["html_content"]
+            try:
+                return idx, await self._repair_slide_layout(
+                    original_html, verdict["report"], idx + 1, verdict.get("layout")
+                )
+            except Exception as e:
+                logger.error(f"Auto layout repair failed for slide {idx + 1}: {e}", exc_info=True)
+                return idx, original_html
+
+        repaired: Dict[int, str] = {}
+        for idx, html_content in await asyncio.gather(*(repair(idx) for idx in to_repair)):
+            if html_content != slides_data[idx]["html_content"]:
+                repaired[idx] = html_content
+        return repaired
+
+    async def _apply_auto_layout_repair(
+        self,
+        html_content: str,
+        slide_data: Dict[str, Any],
+        page_number: int,
+        total_pages: int
+    ) -> str:
+        """Invoke multimodal vision model to inspect and repair layout when feature flag is enabled."""
+        feature_flag_enabled = self._auto_layout_repair_enabled()
+        logger.info("Auto layout repair feature flag enabled: %s", feature_flag_enabled)
+        if not html_content or not feature_flag_enabled:
+            return html_content
+
+        if _deck_layout_pass.get():
+            # 整套幻灯片生成完成后统一检测
+            return html_content
+
+        vision = self._get_layout_vision_provider()
+        if vision is None:
+            return html_content
+        vision_provider, vision_settings = vision
 
         try:
             pdf_converter = get_pdf_converter()
@@ -4691,12 +5268,34 @@ class EnhancedPPTService(PPTService):
 
                 html_path.write_text(html_content, encoding="utf-8")
 
-                screenshot_ok = await pdf_converter.screenshot_html(
+                # 先在渲染页面中测量元素边界，布局无问题时跳过视觉模型
+                layout_report = await pdf_converter.inspect_layout(
                     str(html_path),
                     str(screenshot_path),
                     width=1280,
                     height=720
                 )
+                if layout_report is not None and not layout_report.get("has_problems"):
+                    logger.info(
+                        "Skipping auto layout repair for slide %s: DOM layout check found no problems",
+                        page_number
+                    )
+                    return html_content
+
+                if layout_report is not None:
+                    logger.info(
+                        "DOM layout check found %s issue(s) on slide %s, requesting vision inspection",
+                        layout_report.get("issue_count", 0),
+                        page_number
+                    )
+                    screenshot_ok = screenshot_path.exists()
+                else:
+                    screenshot_ok = await pdf_converter.screenshot_html(
+                        str(html_path),
+                        str(screenshot_path),
+                        width=1280,
+                        height=720
+                    )
 
                 if not screenshot_ok or not screenshot_path.exists():
                     logger.warning("Auto layout repair skipped: screenshot capture failed")
@@ -4728,7 +5327,9 @@ class EnhancedPPTService(PPTService):
 
                 screenshot_b64 = base64.b64encode(screenshot_path.read_bytes()).decode("utf-8")
 
-            inspection_prompt = self._build_layout_inspection_prompt(slide_data, page_number, total_pages)
+            inspection_prompt = self._build_layout_inspection_prompt(
+                slide_data, page_number, total_pages, layout_report
+            )
 
             messages = [
                 AIMessage(
@@ -4745,38 +5346,12 @@ class EnhancedPPTService(PPTService):
             ]
 
             model_name = vision_settings.get("model") or vision_settings.get("default_model")
-            inspection_response = None
-            for attempt in range(3):
-                try:
-                    inspection_response = await vision_provider.chat_completion(messages=messages, model=model_name)
-                    if inspection_response and getattr(inspection_response, "content", None):
-                        break
-                    raise ValueError("Vision provider returned empty response")
-                except Exception as vision_error:
-                    logger.warning(
-                        "Vision inspection attempt %s failed for slide %s: %s",
-                        attempt + 1,
-                        page_number,
-                        vision_error,
-                        exc_info=True
-                    )
-                    inspection_response = None
-                    if attempt < 2:
-                        await asyncio.sleep(0.5 * (attempt + 1))
-
-            if not inspection_response or not getattr(inspection_response, "content", None):
-                logger.error(
-                    "Vision inspection could not be completed after retries for slide %s, skipping repair",
-                    page_number
-                )
-                return html_content
-
-            inspection_report = self._strip_think_tags(inspection_response.content)
-            logger.info(
-                "Vision inspection response for slide %s: %s",
-                page_number,
-                inspection_report[:1000]
+            inspection_report = await self._run_vision_inspection(
+                vision_provider, model_name, messages, f"slide {page_number}"
             )
+            if inspection_report is None:
+                logger.error("Skipping layout repair for slide %s", page_number)
+                return html_content
 
             if not inspection_report:
                 logger.debug("Vision analysis returned empty report, keeping original HTML")
@@ -4789,51 +5364,7 @@ class EnhancedPPTService(PPTService):
                 )
                 return html_content
 
-            repair_prompt = self._build_layout_repair_prompt(html_content, inspection_report)
-            repair_response = None
-            for attempt in range(3):
-                try:
-                    repair_response = await self._text_completion_for_role(
-                        "slide_generation",
-                        prompt=repair_prompt,
-                        max_tokens=min(ai_config.max_tokens, 4000),
-                        temperature=min(0.5, max(0.1, ai_config.temperature * 0.5))
-                    )
-                    if repair_response and getattr(repair_response, "content", None):
-                        break
-                    raise ValueError("Layout repair model returned empty response")
-                except Exception as repair_error:
-                    logger.warning(
-                        "Layout repair attempt %s failed for slide %s: %s",
-                        attempt + 1,
-                        page_number,
-                        repair_error,
-                        exc_info=True
-                    )
-                    repair_response = None
-                    if attempt < 2:
-                        await asyncio.sleep(0.5 * (attempt + 1))
-
-            if not repair_response or not getattr(repair_response, "content", None):
-                logger.error(
-                    "Layout repair could not be completed after retries for slide %s, returning original HTML",
-                    page_number
-                )
-                return html_content
-
-            repair_content = self._strip_think_tags(repair_response.content)
-            logger.debug(
-                "Layout repair response for slide %s: %s",
-                page_number,
-                repair_content[:1000]
-            )
-
-            repaired_html = self._clean_html_response(repair_content)
-            if repaired_html and repaired_html.strip() and repaired_html.strip() != html_content.strip():
-                logger.info(f"Auto layout repair applied for slide {page_number}")
-                return repaired_html
-
-            logger.debug("Auto layout repair produced no improvements, keeping original HTML")
+            return await self._repair_slide_layout(html_content, inspection_report, page_number, layout_report)
 
         except Exception as e:
             logger.error(f"Auto layout repair failed for slide {page_number}: {e}", exc_info=True)
@@ -4844,7 +5375,8 @@ class EnhancedPPTService(PPTService):
         self,
         slide_data: Dict[str, Any],
         page_number: int,
-        total_pages: int
+        total_pages: int,
+        layout_report: Optional[Dict[str, Any]] = None
     ) -> str:
         """Build prompt for multimodal layout inspection."""
         title = slide_data.get("title", "")
@@ -4858,6 +5390,7 @@ class EnhancedPPTService(PPTService):
             f"标题：{title}\n"
             f"正文摘要：{body}\n"
             f"要点：\n{bullet_text}\n\n"
+            f"{self._format_layout_report(layout_report)}"
             "请结合截图检查以下项目：\n"
             "1. 文本是否被遮挡、超出或断裂\n"
             "2. 元素是否重叠、错位或超出画布\n"
@@ -4871,13 +5404,80 @@ class EnhancedPPTService(PPTService):
             "- severity: high/medium/low\n"
         )
 
-    def _build_layout_repair_prompt(self, original_html: str, inspection_report: str) -> str:
+    @staticmethod
+    def _format_layout_report(layout_report: Optional[Dict[str, Any]]) -> str:
+        """Render DOM layout measurements as a prompt section (empty when there are none)."""
+        if not layout_report or not layout_report.get("issues"):
+            return ""
+
+        lines = ["【DOM测量结果】（在 1280x720 画布中实际渲染测得，坐标单位为像素）"]
+        for issue in layout_report["issues"]:
+            box = issue.get("box")
+            position = f" @({box['x']},{box['y']} {box['width']}x{box['height']})" if box else ""
+            lines.append(
+                f"- [{issue.get('severity')}] {issue.get('type')}: {issue.get('element')}{position}"
+                f" - {issue.get('detail')}"
+            )
+        omitted = layout_report.get("issue_count", 0) - len(layout_report["issues"])
+        if omitted > 0:
+            lines.append(f"- 另有 {omitted} 个问题未列出")
+        return "\n".join(lines) + "\n\n"
+
+    def _build_deck_layout_inspection_prompt(
+        self,
+        entries: List[Tuple[int, Dict[str, Any], Optional[Dict[str, Any]]]],
+        total_pages: int
+    ) -> str:
+        """Build prompt for inspecting several slide screenshots in one multimodal request."""
+        parts = [f"以下依次给出本套{total_pages}页幻灯片中第{'、'.join(str(page) for page, _, _ in entries)}页的截图，请逐页检查。\n\n"]
+        for page_number, slide_data, layout_report in entries:
+            parts.append(
+                f"=== 第{page_number}页 ===\n"
+                f"标题：{slide_data.get('title', '')}\n"
+                f"{self._format_layout_report(layout_report)}"
+            )
+        parts.append(
+            "\n请结合截图检查以下项目：\n"
+            "1. 文本是否被遮挡、超出或断裂\n"
+            "2. 元素是否重叠、错位或超出画布\n"
+            "3. 布局和留白是否平衡，避免大片空白\n"
+            "4. 颜色对比与字号是否影响可读性\n"
+            "5. 卡片或图片布局是否超出画布或显示不全\n"
+            "6. 内容是否完整，是否出现了滚动条(严禁出现滚动条)\n\n"
+            "请按页输出结构化结果，每页以单独一行的“=== 第N页 ===”开头，不要遗漏任何一页：\n"
+            "- issues: 每个问题的描述与定位\n"
+            "- recommendations: 对应的修复建议(不要推荐修改标题、页码、背景的样式)\n"
+            "- severity: high/medium/low\n"
+        )
+        return "".join(parts)
+
+    @staticmethod
+    def _split_deck_inspection_report(report: str) -> Dict[int, str]:
+        """Split a multi-slide inspection report into per-page sections keyed by page number."""
+        import re
+
+        sections: Dict[int, str] = {}
+        matches = list(re.finditer(r"^[#=\s*]*第\s*(\d+)\s*页[\s=*#:：]*$", report, flags=re.MULTILINE))
+        for position, match in enumerate(matches):
+            end = matches[position + 1].start() if position + 1 < len(matches) else len(report)
+            section = report[match.end():end].strip()
+            if section:
+                sections[int(match.group(1))] = section
+        return sections
+
+    def _build_layout_repair_prompt(
+        self,
+        original_html: str,
+        inspection_report: str,
+        layout_report: Optional[Dict[str, Any]] = None
+    ) -> str:
         """Prompt LLM to repair HTML based on inspection findings."""
         return (
             "你是资深前端工程师，请严格按照视觉检测报告中的每条建议对下方幻灯片 HTML 进行修改，"
             "确保 1280x720 画布内无遮挡、错位或溢出，并保持主题配色与结构一致。\n\n"
             "【视觉检测报告】\n"
             f"{inspection_report}\n\n"
+            f"{self._format_layout_report(layout_report)}"
             "【原始HTML】\n"
             "```html\n"
             f"{original_html}\n"
@@ -6961,13 +7561,12 @@ class EnhancedPPTService(PPTService):
 
     def clear_cached_style_genes(self, project_id: Optional[str] = None):
         """清理缓存的设计基因"""
-        if not hasattr(self, '_cached_style_genes'):
-            return
-
         if project_id:
-            # 清理特定项目的缓存
-            if project_id in self._cached_style_genes:
-                del self._cached_style_genes[project_id]
+            # 清理特定项目的缓存（该项目所有模板）
+            project_keys = [key for key in self._cached_style_genes if key[0] == project_id]
+            for key in project_keys:
+                del self._cached_style_genes[key]
+            if project_keys:
                 logger.info(f"清理项目 {project_id} 的设计基因缓存")
         else:
             # 清理所有缓存
@@ -6976,12 +7575,11 @@ class EnhancedPPTService(PPTService):
 
     def get_cached_style_genes_info(self) -> Dict[str, Any]:
         """获取缓存的设计基因信息"""
-        if not hasattr(self, '_cached_style_genes'):
-            return {"cached_projects": [], "total_count": 0}
-
         return {
-            "cached_projects": list(self._cached_style_genes.keys()),
-            "total_count": len(self._cached_style_genes)
+            "cached_projects": list(dict.fromkeys(key[0] for key in self._cached_style_genes)),
+            "total_count": len(self._cached_style_genes),
+            "max_entries": self.STYLE_GENES_CACHE_MAX_ENTRIES,
+            "in_flight": len(self._style_genes_inflight)
         }
 
     def _read_file_with_fallback_encoding(self, file_path: str) -> str:
@@ -0,0 +1,204 @@
+"""
+Speculative background rendering of project exports
+
+Once slide generation finishes or slide edits settle, the export artifacts a user is most
+likely to download next are rendered in the background, so the export endpoints can hand out
+an already-built file. Artifacts are tied to a fingerprint of the project's slides: any change
+makes the stored artifact stale and schedules a new render. Background renders only start while
+no interactive export is running, and a running one is cancelled when interactive work arrives.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import shutil
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..core.config import app_config
+from ..utils.thread_pool import run_blocking_io
+
+logger = logging.getLogger(__name__)
+
+# Export kind -> file extension of its artifact
+ARTIFACT_EXTENSIONS = {"pdf": "pdf"}
+
+Renderer = Callable[[Any, str], Awaitable[bool]]
+
+
+def project_fingerprint(project) -> str:
+    """Hash of everything an export is rendered from"""
+    payload = json.dumps(
+        {"topic": project.topic, "slides": project.slides_data or []},
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExportPrerenderer:
+    """Debounced, low-priority background renders of per-project export artifacts"""
+
+    def __init__(self, artifact_dir: Optional[Path] = None):
+        if artifact_dir is None:
+            project_root = Path(__file__).resolve().parent.parent.parent.parent
+            artifact_dir = project_root / "temp" / "export_artifacts"
+        self.artifact_dir = artifact_dir
+        self._renderers: Dict[str, Renderer] = {}
+        self._scheduled: Dict[str, asyncio.Task] = {}
+        # (project_id, kind) -> (fingerprint, render task)
+        self._rendering: Dict[tuple, tuple] = {}
+        self._interactive = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._render_lock = asyncio.Lock()
+        self.stats = {"scheduled": 0, "rendered": 0, "served": 0, "joined": 0, "preempted": 0, "failed": 0}
+
+    def register_renderer(self, kind: str, renderer: Renderer):
+        """Register ``renderer(project, output_path) -> bool`` for an export kind"""
+        self._renderers[kind] = renderer
+
+    def _artifact_path(self, project_id: str, kind: str) -> Path:
+        return self.artifact_dir / project_id / f"{kind}.{ARTIFACT_EXTENSIONS[kind]}"
+
+    def _read_fingerprint(self, project_id: str, kind: str) -> Optional[str]:
+        try:
+            return self._artifact_path(project_id, kind).with_suffix(".fingerprint").read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def _write_artifact(self, project_id: str, kind: str, rendered_path: str, fingerprint: str):
+        path = self._artifact_path(project_id, kind)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(rendered_path, path)
+        path.with_suffix(".fingerprint").write_text(fingerprint, encoding="utf-8")
+
+    def _invalidate(self, project_id: str):
+        shutil.rmtree(self.artifact_dir / project_id, ignore_errors=True)
+
+    def schedule(self, project_id: str):
+        """Drop the project's artifacts and re-render them once edits have settled"""
+        if not app_config.export_prerender_enabled or not self._renderers:
+            return
+        pending = self._scheduled.pop(project_id, None)
+        if pending:
+            pending.cancel()
+        for (rendering_project, _), (_, task) in list(self._rendering.items()):
+            if rendering_project == project_id:
+                task.cancel()
+        self.stats["scheduled"] += 1
+        task = asyncio.create_task(self._run(project_id))
+        self._scheduled[project_id] = task
+        task.add_done_callback(lambda finished: self._scheduled.get(project_id) is finished
+                               and self._scheduled.pop(project_id, None))
+
+    async def _run(self, project_id: str):
+        await run_blocking_io(self._invalidate, project_id)
+        await asyncio.sleep(app_config.export_prerender_delay)
+
+        from .service_instances import get_ppt_service
+        for kind, renderer in self._renderers.items():
+            while True:
+                async with self._render_lock:
+                    await self._idle.wait()
+                    project = await get_ppt_service().project_manager.get_project(project_id)
+                    if not project or not project.slides_data:
+                        return
+                    fingerprint = project_fingerprint(project)
+                    if self._read_fingerprint(project_id, kind) == fingerprint:
+                        break
+                    task = asyncio.create_task(self._render(project, kind, renderer, fingerprint))
+                    self._rendering[(project_id, kind)] = (fingerprint, task)
+                    try:
+                        await asyncio.shield(task)
+                        break
+                    except asyncio.CancelledError:
+                        if not task.cancelled():
+                            # The schedule itself was cancelled by a newer edit
+                            task.cancel()
+                            raise
+                        if self._scheduled.get(project_id) is not asyncio.current_task():
+                            return
+                        # Preempted by interactive work, retry once idle again
+                        self.stats["preempted"] += 1
+                    finally:
+                        self._rendering.pop((project_id, kind), None)
+
+    async def _render(self, project, kind: str, renderer: Renderer, fingerprint: str):
+        output_path = str(self.artifact_dir / f".{project.project_id}.{kind}.partial")
+        await run_blocking_io(self.artifact_dir.mkdir, parents=True, exist_ok=True)
+        try:
+            logger.info(f"🔮 Pre-rendering {kind} export for project {project.project_id}")
+            if await renderer(project, output_path):
+                await run_blocking_io(self._write_artifact, project.project_id, kind, output_path, fingerprint)
+                self.stats["rendered"] += 1
+            else:
+                self.stats["failed"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.warning(f"Pre-rendering {kind} export for project {project.project_id} failed: {e}")
+        finally:
+            await run_blocking_io(lambda: Path(output_path).unlink(missing_ok=True))
+
+    @asynccontextmanager
+    async def interactive(self):
+        """Mark interactive export work; background renders yield while any is running"""
+        self._interactive += 1
+        self._idle.clear()
+        for fingerprint, task in list(self._rendering.values()):
+            task.cancel()
+        try:
+            yield
+        finally:
+            self._interactive -= 1
+            if self._interactive == 0:
+                self._idle.set()
+
+    async def fetch_artifact(self, project, kind: str, destination: str) -> bool:
+        """Copy an up-to-date pre-rendered artifact to ``destination``, joining a render in progress"""
+        if kind not in ARTIFACT_EXTENSIONS:
+            return False
+        fingerprint = project_fingerprint(project)
+        rendering = self._rendering.get((project.project_id, kind))
+        if rendering and rendering[0] == fingerprint:
+            # Nearly done work is cheaper to wait for than to repeat
+            self.stats["joined"] += 1
+            await asyncio.gather(asyncio.shield(rendering[1]), return_exceptions=True)
+
+        def copy_if_current() -> bool:
+            if self._read_fingerprint(project.project_id, kind) != fingerprint:
+                return False
+            try:
+                shutil.copyfile(self._artifact_path(project.project_id, kind), destination)
+            except OSError:
+                return False
+            return True
+
+        if await run_blocking_io(copy_if_current):
+            self.stats["served"] += 1
+            logger.info(f"📦 Serving pre-rendered {kind} export for project {project.project_id}")
+            return True
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": app_config.export_prerender_enabled,
+            "scheduled_projects": len(self._scheduled),
+            "rendering": [f"{project_id}:{kind}" for project_id, kind in self._rendering],
+            "interactive": self._interactive,
+            **self.stats,
+        }
+
+
+_export_prerenderer: Optional[ExportPrerenderer] = None
+
+
+def get_export_prerenderer() -> ExportPrerenderer:
+    """Get the global export pre-renderer"""
+    global _export_prerenderer
+    if _export_prerenderer is None:
+        _export_prerenderer = ExportPrerenderer()
+    return _export_prerenderer
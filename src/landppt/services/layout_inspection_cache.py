@@ -0,0 +1,106 @@
+"""
+Content-addressed cache of slide layout inspection results
+
+Deck-level layout inspection records, per slide, whether the slide needs a layout repair and the
+findings it was based on. Results are keyed by a hash of the slide HTML and the vision model that
+judged it, so a slide that has not changed is never measured or sent to the vision model again.
+Entries are small JSON files; the least recently used ones are dropped beyond
+``MAX_ENTRIES``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .slide_render_cache import _normalize_html
+
+logger = logging.getLogger(__name__)
+
+# Bump when the inspection checks or prompt change in a way that invalidates earlier verdicts
+INSPECTION_VERSION = 1
+
+# Entries kept on disk before least recently used ones are evicted
+MAX_ENTRIES = 20000
+
+
+class LayoutInspectionCache:
+    """Disk store of per-slide layout inspection verdicts"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(slide_html: str, model: Optional[str]) -> str:
+        payload = json.dumps(
+            {"version": INSPECTION_VERSION, "model": model or "", "html": _normalize_html(slide_html)},
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached inspection result (blocking), None on a miss"""
+        path = self._path(key)
+        try:
+            result = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except FileNotFoundError:
+            self.stats["misses"] += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable layout inspection entry {path.name}: {e}")
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """Store an inspection result (blocking)"""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(path)
+        self.stats["stores"] += 1
+
+    def evict(self):
+        """Drop least recently used entries beyond ``MAX_ENTRIES`` (blocking)"""
+        with self._lock:
+            entries = []
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    entries.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    continue
+            if len(entries) <= MAX_ENTRIES:
+                return
+            entries.sort()
+            for _, path in entries[:len(entries) - MAX_ENTRIES]:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                self.stats["evictions"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"cache_dir": str(self.cache_dir), **self.stats}
+
+
+_layout_inspection_cache: Optional[LayoutInspectionCache] = None
+
+
+def get_layout_inspection_cache() -> LayoutInspectionCache:
+    """Get the global layout inspection cache"""
+    global _layout_inspection_cache
+    if _layout_inspection_cache is None:
+        project_root = Path(__file__).resolve().parent.parent.parent.parent
+        _layout_inspection_cache = LayoutInspectionCache(project_root / "temp" / "layout_inspection_cache")
+    return _layout_inspection_cache
@@ -3,8 +3,8 @@ PPT幻灯片图片信息数据模型
 支持多图片信息的数据结构，包含图片来源、用途、内容描述、绝对地址等信息
 """
 
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -222,6 +222,10 @@ class ImageRequirement:
     purpose: ImagePurpose            # 图片用途
     description: str                 # 需求描述
     priority: int = 1                # 优先级 (1-5, 5最高)
+    # 融合规划一次给出的执行细节，缺失时由各来源的处理流程单独调用AI生成
+    search_keywords: Optional[str] = None                       # 搜索关键词（本地/网络）
+    image_size: Optional[Tuple[int, int]] = None                # AI生成图片尺寸
+    generation_prompts: List[str] = field(default_factory=list) # AI生成图片提示词（每张一个）
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
@@ -230,7 +234,10 @@ class ImageRequirement:
             "count": self.count,
             "purpose": self.purpose.value,
             "description": self.description,
-            "priority": self.priority
+            "priority": self.priority,
+            "search_keywords": self.search_keywords,
+            "image_size": list(self.image_size) if self.image_size else None,
+            "generation_prompts": self.generation_prompts
         }
 
 
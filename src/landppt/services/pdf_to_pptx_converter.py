@@ -13,7 +13,7 @@ import zipfile
 import tarfile
 import requests
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -174,6 +174,21 @@ class SDKDownloadManager:
         return self.download_and_extract_sdk()
 
 
+def plan_page_ranges(total_pages: int, min_pages_per_range: int, parallelism: int) -> List[Tuple[int, int]]:
+    """Split ``total_pages`` into up to ``parallelism`` even [start, end) ranges of at least ``min_pages_per_range``"""
+    if min_pages_per_range <= 0 or parallelism < 2 or total_pages < 2 * min_pages_per_range:
+        return [(0, total_pages)]
+    count = min(parallelism, total_pages // min_pages_per_range)
+    size, extra = divmod(total_pages, count)
+    ranges = []
+    start = 0
+    for index in range(count):
+        end = start + size + (1 if index < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
 class PDFToPPTXConverter:
     """Converts PDF files to PPTX using Apryse SDK"""
 
@@ -305,6 +320,21 @@ class PDFToPPTXConverter:
 
         output_path_obj.parent.mkdir(parents=True, exist_ok=True)
 
+        from ..core.config import app_config
+        if app_config.pptx_worker_pool_size > 0:
+            # Warm workers keep the SDK initialized between conversions
+            from .pdf_to_pptx_pool import get_pptx_worker_pool
+            success, result = await get_pptx_worker_pool().convert(str(pdf_path_obj), str(output_path_obj), timeout)
+            if success and (not output_path_obj.exists() or output_path_obj.stat().st_size == 0):
+                error_msg = f"Worker reported success but output file is missing or empty: {output_path_obj}"
+                logger.error(error_msg)
+                return False, error_msg
+            if success:
+                logger.info(f"[Worker Pool] PDF to PPTX conversion successful: {output_path_obj}")
+            else:
+                logger.error(f"[Worker Pool] PDF to PPTX conversion failed: {result}")
+            return success, result
+
         command = [
             sys.executable,
             '-m',
@@ -315,15 +345,8 @@ class PDFToPPTXConverter:
             str(output_path_obj),
         ]
 
-        env = os.environ.copy()
-        src_path = str(Path(__file__).resolve().parents[2])
-        pythonpath = env.get('PYTHONPATH')
-        if pythonpath:
-            existing = pythonpath.split(os.pathsep)
-            if src_path not in existing:
-                env['PYTHONPATH'] = os.pathsep.join([src_path, pythonpath])
-        else:
-            env['PYTHONPATH'] = src_path
+        from .pdf_to_pptx_pool import worker_environment
+        env = worker_environment()
 
         project_root = str(Path(__file__).resolve().parents[3])
 
@@ -370,6 +393,86 @@ class PDFToPPTXConverter:
         logger.error(f"[Async Worker] PDF to PPTX conversion failed: {error_msg}")
         return False, error_msg
 
+    @staticmethod
+    def _count_pdf_pages_sync(pdf_path: str) -> int:
+        try:
+            from PyPDF2 import PdfReader
+        except ImportError:
+            from pypdf import PdfReader
+        return len(PdfReader(pdf_path).pages)
+
+    @staticmethod
+    def _split_pdf_sync(pdf_path: str, ranges: List[Tuple[int, int]], output_dir: str) -> List[str]:
+        """Write each [start, end) page range of ``pdf_path`` to its own PDF"""
+        try:
+            from PyPDF2 import PdfReader, PdfWriter
+        except ImportError:
+            from pypdf import PdfReader, PdfWriter
+
+        reader = PdfReader(pdf_path)
+        range_paths = []
+        for index, (start, end) in enumerate(ranges):
+            writer = PdfWriter()
+            for page_number in range(start, end):
+                writer.add_page(reader.pages[page_number])
+            range_path = os.path.join(output_dir, f"range_{index}.pdf")
+            with open(range_path, 'wb') as range_file:
+                writer.write(range_file)
+            range_paths.append(range_path)
+        return range_paths
+
+    async def convert_pdf_to_pptx_parallel_async(
+        self,
+        pdf_path: str,
+        output_path: str,
+        notes: Optional[Dict[int, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[bool, str]:
+        """
+        Convert a PDF by page ranges on parallel workers and merge the presentations in order,
+        applying ``notes`` (speaker notes by 0-based slide index) in the merge step.
+        Small documents, or any failed range, are converted as a whole.
+        """
+        from ..core.config import app_config
+        from ..utils.thread_pool import run_blocking_io
+        from .pptx_merge import merge_presentations
+
+        parallelism = app_config.pptx_worker_pool_size if app_config.pptx_worker_pool_size > 0 else (os.cpu_count() or 1)
+        try:
+            total_pages = await run_blocking_io(self._count_pdf_pages_sync, pdf_path)
+        except Exception as e:
+            logger.warning(f"Could not count PDF pages, converting as a whole: {e}")
+            total_pages = 0
+        ranges = plan_page_ranges(total_pages, app_config.pptx_range_pages, parallelism)
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            if len(ranges) > 1:
+                logger.info(f"Converting {total_pages} pages in {len(ranges)} parallel ranges: {ranges}")
+                try:
+                    range_pdfs = await run_blocking_io(self._split_pdf_sync, pdf_path, ranges, work_dir)
+                    range_pptx = [str(Path(range_pdf).with_suffix('.pptx')) for range_pdf in range_pdfs]
+                    results = await asyncio.gather(*(
+                        self.convert_pdf_to_pptx_async(range_pdf, range_output, timeout)
+                        for range_pdf, range_output in zip(range_pdfs, range_pptx)
+                    ))
+                    failures = [result for success, result in results if not success]
+                    if not failures and await run_blocking_io(merge_presentations, range_pptx, output_path, notes):
+                        return True, str(output_path)
+                    logger.warning(f"Page-range conversion failed ({failures[0] if failures else 'merge failed'}), "
+                                   f"converting as a whole")
+                except Exception as e:
+                    logger.warning(f"Page-range conversion failed ({e}), converting as a whole")
+
+            success, result = await self.convert_pdf_to_pptx_async(pdf_path, output_path, timeout)
+            if not success:
+                return False, result
+            if notes:
+                try:
+                    await run_blocking_io(merge_presentations, [output_path], output_path, notes)
+                except Exception as e:
+                    logger.warning(f"Failed to add speech scripts to PPTX: {e}")
+            return True, result
+
     def convert_pdf_to_pptx(self, pdf_path: str, output_path: Optional[str] = None) -> Tuple[bool, str]:
         """
         Convert PDF file to PPTX format
@@ -504,6 +607,9 @@ def reload_pdf_to_pptx_converter():
     if _converter_instance is not None:
         try:
             _converter_instance.reload_config()
+            # Pooled workers initialized the SDK with the previous license
+            from .pdf_to_pptx_pool import get_pptx_worker_pool
+            get_pptx_worker_pool().recycle_all()
             logger.info("PDF to PPTX converter configuration reloaded successfully")
         except Exception as e:
             logger.warning(f"Failed to reload PDF to PPTX converter config: {e}")
@@ -0,0 +1,249 @@
+"""
+Pool of long-lived PDF->PPTX worker processes
+
+Each worker (``pdf_to_pptx_worker --serve``) imports the Apryse SDK and initializes the license
+once, then handles conversion jobs sent as JSON lines over its stdin. Jobs queue for an idle
+worker; a job that exceeds its timeout, fails or is cancelled kills the worker, and workers are
+replaced after a number of jobs so SDK memory growth stays bounded.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds a starting worker may take to import and initialize the SDK
+WORKER_START_TIMEOUT = 120
+
+
+def worker_environment() -> Dict[str, str]:
+    """Environment for worker processes, with the ``src`` directory importable"""
+    env = os.environ.copy()
+    src_path = str(Path(__file__).resolve().parents[2])
+    pythonpath = env.get('PYTHONPATH')
+    if pythonpath:
+        existing = pythonpath.split(os.pathsep)
+        if src_path not in existing:
+            env['PYTHONPATH'] = os.pathsep.join([src_path, pythonpath])
+    else:
+        env['PYTHONPATH'] = src_path
+    return env
+
+
+class WorkerError(Exception):
+    """A worker process could not start or died while handling a job"""
+
+
+class _PPTXWorker:
+    """One serving worker process"""
+
+    def __init__(self, process):
+        self.process = process
+        self.jobs = 0
+
+    @classmethod
+    async def start(cls) -> "_PPTXWorker":
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, '-m', 'landppt.services.pdf_to_pptx_worker', '--serve',
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            env=worker_environment(),
+            cwd=str(Path(__file__).resolve().parents[3]),
+        )
+        worker = cls(process)
+        try:
+            message = await asyncio.wait_for(worker._read_message(), timeout=WORKER_START_TIMEOUT)
+        except (asyncio.TimeoutError, WorkerError, ValueError) as e:
+            await worker.kill()
+            raise WorkerError(f"PDF to PPTX worker failed to start: {e}")
+        except BaseException:
+            # Cancelled while starting: do not leave the process behind
+            worker.terminate()
+            raise
+        if not message.get("ready"):
+            await worker.kill()
+            raise WorkerError(message.get("error") or "PDF to PPTX worker could not initialize the SDK")
+        logger.info(f"[Worker Pool] PDF to PPTX worker {process.pid} ready")
+        return worker
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def _read_message(self) -> Dict[str, Any]:
+        line = await self.process.stdout.readline()
+        if not line:
+            raise WorkerError(f"worker exited with code {await self.process.wait()}")
+        return json.loads(line)
+
+    async def run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        self.jobs += 1
+        self.process.stdin.write((json.dumps(job) + "\n").encode("utf-8"))
+        await self.process.stdin.drain()
+        while True:
+            message = await self._read_message()
+            if message.get("id") == job["id"]:
+                return message
+
+    def terminate(self):
+        """Kill the process without waiting for it to exit"""
+        if self.alive:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+
+    async def kill(self):
+        self.terminate()
+        await self.process.wait()
+
+    async def stop(self):
+        """Let the worker finish and exit on end of input, killing it if it does not"""
+        if not self.alive:
+            return
+        try:
+            self.process.stdin.close()
+            await asyncio.wait_for(self.process.wait(), timeout=5)
+        except (asyncio.TimeoutError, OSError):
+            await self.kill()
+
+
+class PPTXWorkerPool:
+    """Bounded set of warm conversion workers with a job queue"""
+
+    def __init__(self, size: int = 2, max_jobs_per_worker: int = 50, job_timeout: float = 600):
+        self.size = max(1, size)
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.job_timeout = job_timeout
+        self._idle: List[_PPTXWorker] = []
+        self._slots = asyncio.Semaphore(self.size)
+        self._job_ids = itertools.count(1)
+        self._generation = 0
+        self._generations: Dict[_PPTXWorker, int] = {}
+        self.queue_depth = 0
+        self.running = 0
+        self.stats = {"jobs": 0, "failed": 0, "timeouts": 0, "started": 0, "recycled": 0}
+
+    async def _acquire(self) -> _PPTXWorker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.alive and self._generations.get(worker) == self._generation:
+                return worker
+            await self._discard(worker)
+        worker = await _PPTXWorker.start()
+        self._generations[worker] = self._generation
+        self.stats["started"] += 1
+        return worker
+
+    def _release(self, worker: _PPTXWorker):
+        if (worker.alive and self._generations.get(worker) == self._generation
+                and (self.max_jobs_per_worker <= 0 or worker.jobs < self.max_jobs_per_worker)):
+            self._idle.append(worker)
+        else:
+            asyncio.create_task(self._discard(worker, recycled=worker.alive))
+
+    def _abandon(self, worker: _PPTXWorker):
+        """Drop a worker whose job did not complete normally; it may still be converting"""
+        worker.terminate()
+        asyncio.create_task(self._discard(worker, recycled=False))
+
+    async def _discard(self, worker: _PPTXWorker, recycled: bool = True):
+        self._generations.pop(worker, None)
+        if recycled:
+            self.stats["recycled"] += 1
+        await worker.stop()
+
+    async def convert(self, pdf_path: str, output_path: str, timeout: Optional[float] = None) -> Tuple[bool, str]:
+        """Convert on a pooled worker; ``timeout`` covers the conversion, not the wait for a worker"""
+        timeout = timeout or self.job_timeout
+        self.queue_depth += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queue_depth -= 1
+
+        self.running += 1
+        worker = None
+        completed = False
+        try:
+            try:
+                worker = await self._acquire()
+            except WorkerError as e:
+                self.stats["failed"] += 1
+                return False, str(e)
+
+            job = {"id": next(self._job_ids), "input": pdf_path, "output": output_path}
+            start_time = time.time()
+            try:
+                message = await asyncio.wait_for(worker.run(job), timeout=timeout)
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                await worker.kill()
+                return False, f"PDF to PPTX conversion timed out after {timeout} seconds"
+            except (WorkerError, ValueError, OSError) as e:
+                self.stats["failed"] += 1
+                await worker.kill()
+                return False, f"PDF to PPTX worker failed: {e}"
+            completed = True
+
+            self.stats["jobs"] += 1
+            logger.info(f"[Worker Pool] Job {job['id']} finished on worker {worker.process.pid} "
+                        f"in {time.time() - start_time:.1f}s")
+            if not message.get("success"):
+                self.stats["failed"] += 1
+            return bool(message.get("success")), message.get("result", "")
+        finally:
+            self.running -= 1
+            if worker is not None:
+                if completed:
+                    self._release(worker)
+                else:
+                    # Timed out, failed or cancelled mid-job (including CancelledError): never hand
+                    # a worker that may still be converting to the next job
+                    self._abandon(worker)
+            self._slots.release()
+
+    def recycle_all(self):
+        """Replace every worker once its current job is done (e.g. after a license change)"""
+        self._generation += 1
+        idle, self._idle = self._idle, []
+        for worker in idle:
+            asyncio.create_task(self._discard(worker))
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for worker in idle:
+            await worker.stop()
+        self._generations.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "idle_workers": len(self._idle),
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            **self.stats,
+        }
+
+
+_worker_pool: Optional[PPTXWorkerPool] = None
+
+
+def get_pptx_worker_pool() -> PPTXWorkerPool:
+    """Get the global PDF->PPTX worker pool"""
+    global _worker_pool
+    if _worker_pool is None:
+        from ..core.config import app_config
+        _worker_pool = PPTXWorkerPool(
+            size=app_config.pptx_worker_pool_size,
+            max_jobs_per_worker=app_config.pptx_worker_max_jobs,
+            job_timeout=app_config.pptx_worker_job_timeout
+        )
+    return _worker_pool
@@ -1,9 +1,14 @@
 ﻿"""
 Worker entrypoint to run PDF->PPTX conversion in a separate process.
+
+With ``--serve`` the worker initializes the SDK once and then handles jobs sent as
+JSON lines on stdin, answering with one JSON line per job on stdout.
 """
 
 import argparse
+import json
 import logging
+import os
 import sys
 from pathlib import Path
 
@@ -18,23 +23,65 @@ def configure_logging(level: int) -> None:
     )
 
 
+def serve() -> int:
+    """Serve conversion jobs from stdin until it is closed."""
+    # Keep the protocol stream clean: anything else written to stdout (including by the SDK) goes to stderr
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    def send(message: dict) -> None:
+        protocol.write(json.dumps(message, ensure_ascii=False) + "\n")
+
+    converter = PDFToPPTXConverter()
+    if not converter.is_available():
+        send({"ready": False, "error": "PDF to PPTX converter is not available. Please check Apryse SDK installation and license."})
+        return 1
+    send({"ready": True, "pid": os.getpid()})
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = None
+        try:
+            # A malformed job must not take down the worker serving the pool
+            job = json.loads(line)
+            output_path = Path(job["output"]).expanduser().resolve()
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            success, result = converter.convert_pdf_to_pptx(str(Path(job["input"]).expanduser().resolve()),
+                                                            str(output_path))
+        except Exception as e:
+            success, result = False, f"PDF to PPTX conversion failed: {e}"
+        send({"id": job.get("id") if isinstance(job, dict) else None, "success": success, "result": result})
+    return 0
+
+
 def main() -> int:
     """CLI entry point."""
     parser = argparse.ArgumentParser(
         description="Convert PDF to PPTX using Apryse SDK."
     )
-    parser.add_argument("--input", required=True, help="Path to the source PDF file.")
+    parser.add_argument("--input", help="Path to the source PDF file.")
     parser.add_argument("--output", help="Path for the output PPTX file.")
     parser.add_argument(
         "--log-level",
         default="INFO",
         help="Logging level (default: INFO)."
     )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Keep the SDK initialized and serve JSON-line jobs from stdin."
+    )
     args = parser.parse_args()
 
     log_level = getattr(logging, args.log_level.upper(), logging.INFO)
     configure_logging(log_level)
 
+    if args.serve:
+        return serve()
+    if not args.input:
+        parser.error("--input is required unless --serve is given")
+
     pdf_path = Path(args.input).expanduser().resolve()
     if not pdf_path.exists():
         print(f"Input PDF not found: {pdf_path}", file=sys.stderr)
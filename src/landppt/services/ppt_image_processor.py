@@ -22,6 +22,15 @@ from .image.models import ImageSourceType
 
 logger = logging.getLogger(__name__)
 
+# AI生成图片的可选尺寸（与_ai_decide_image_dimensions提示词中的编号对应）
+IMAGE_SIZE_OPTIONS = {
+    "1": (2048, 1152),  # 16:9横向
+    "2": (1152, 2048),  # 9:16竖向
+    "3": (1024, 1024),  # 1:1正方形
+    "4": (1920, 1080),  # 16:9标准
+    "5": (1080, 1920),  # 9:16标准
+}
+
 
 class PPTImageProcessor:
     """PPT图片处理器"""
@@ -97,10 +106,18 @@ class PPTImageProcessor:
                 logger.info(f"第{page_number}页没有启用任何图片来源，跳过图片处理")
                 return None
 
-            # 让AI分析并决定图片需求（只考虑启用的来源）
-            image_requirements = await self._ai_analyze_image_requirements(
-                slide_data, project_topic, project_scenario, page_number, total_pages, template_html, enabled_sources, image_config
-            )
+            # 融合规划：一次调用同时给出需求、搜索关键词、尺寸和生成提示词；失败时回退到逐项调用
+            image_requirements = None
+            if image_config.get('enable_fused_image_planning', True):
+                image_requirements = await self._ai_plan_slide_images(
+                    slide_data, project_topic, project_scenario, page_number, total_pages, template_html, enabled_sources, image_config
+                )
+
+            if image_requirements is None:
+                # 让AI分析并决定图片需求（只考虑启用的来源）
+                image_requirements = await self._ai_analyze_image_requirements(
+                    slide_data, project_topic, project_scenario, page_number, total_pages, template_html, enabled_sources, image_config
+                )
 
             if not image_requirements or not image_requirements.requirements:
                 logger.info(f"AI判断第{page_number}页不需要添加图片，跳过图片处理")
@@ -344,6 +361,188 @@ class PPTImageProcessor:
         logger.error("AI分析图片需求失败，已达到最大重试次数")
         return None
 
+    async def _ai_plan_slide_images(self, slide_data: Dict[str, Any], project_topic: str,
+                                    project_scenario: str, page_number: int, total_pages: int,
+                                    template_html: str, enabled_sources: List[ImageSource],
+                                    image_config: Dict[str, Any]) -> Optional[SlideImageRequirements]:
+        """一次AI调用完成整页图片规划
+
+        返回的需求中已带有搜索关键词、AI生图尺寸和提示词，处理各来源时无需再分别调用AI。
+        不需要配图时返回空需求；调用或校验失败时返回None，由调用方回退到逐项分析。
+        """
+        slide_title = slide_data.get('title', '')
+        slide_content = slide_data.get('content_points', [])
+        slide_content_text = '\n'.join(slide_content) if isinstance(slide_content, list) else str(slide_content)
+        content_points_count = len(slide_content) if isinstance(slide_content, list) else 0
+
+        limits = self._get_image_limits(image_config)
+        source_desc = {
+            ImageSource.LOCAL: f"local: 本地图床中的图片，适合通用性图片 (最多{limits[ImageSource.LOCAL]}张)，需给出3-5个中英文搜索关键词",
+            ImageSource.NETWORK: f"network: 网络搜索图片，适合特定主题的高质量图片 (最多{limits[ImageSource.NETWORK]}张)，需给出3-5个搜索关键词",
+            ImageSource.AI_GENERATED: f"ai_generated: AI生成图片，适合定制化、创意性图片 (最多{limits[ImageSource.AI_GENERATED]}张)，需给出尺寸编号和每张图片的英文生成提示词",
+        }
+        enabled_sources_desc = [source_desc[source] for source in enabled_sources]
+
+        project_language = self._detect_project_language(project_topic, slide_title, slide_content_text)
+        keyword_language = "中文" if project_language == "zh" else "英文"
+
+        template_context = ""
+        if template_html.strip():
+            template_context = f"""
+当前PPT模板HTML参考：
+{template_html[:500]}...
+"""
+
+        prompt = f"""作为专业的PPT设计师，请为以下幻灯片一次性完成配图规划：判断是否需要配图，如需要则给出每项图片需求的来源、数量、用途，以及执行所需的搜索关键词、尺寸和生成提示词。
+
+【项目信息】
+- 主题：{project_topic}
+- 场景：{project_scenario}
+- 当前页：{page_number}/{total_pages}
+
+【幻灯片内容】
+- 标题：{slide_title}
+- 内容要点数量：{content_points_count}个
+- 内容字数：{len(slide_content_text.strip())}字
+- 具体内容：
+{slide_content_text}
+
+{template_context}
+
+【可用图片来源及限制】
+{chr(10).join(enabled_sources_desc)}
+
+【图片用途】decoration(装饰) / illustration(说明) / background(背景) / icon(图标) / chart_support(图表辅助) / content_visual(内容可视化)
+
+【配图判断】
+- 目录、索引、致谢、参考文献、纯数据表格、文字密集或过于抽象的页面通常不需要配图
+- 封面页、章节页通常需要装饰性图片；内容较少或复杂难懂的页面适合说明性图片
+
+【AI生图尺寸编号】
+1: 2048x1152 横向宽屏 / 2: 1152x2048 竖向 / 3: 正方形 / 4: 1920x1080 标准横向 / 5: 1080x1920 标准竖向
+
+【重要限制】
+- 总图片数量不能超过{limits['total']}张，只能使用已启用的来源，并遵守各来源数量限制
+- network来源的search_keywords使用{keyword_language}，总长度不超过80个字符
+- generation_prompts为英文，每张图片一个（不超过120词），不包含文字内容，适合PPT演示，多张图片风格一致但内容不同
+
+请以JSON格式返回，格式如下：
+{{
+    "needs_images": true/false,
+    "reasoning": "分析理由",
+    "requirements": [
+        {{
+            "source": "仅限已启用的来源",
+            "count": 数字,
+            "purpose": "decoration/illustration/background/icon/chart_support/content_visual",
+            "description": "具体需求描述",
+            "priority": 1-5,
+            "search_keywords": "local/network来源必填",
+            "size_option": 1-5（ai_generated来源必填）,
+            "generation_prompts": ["ai_generated来源必填，数量与count一致"]
+        }}
+    ]
+}}
+
+如果不需要配图，设置needs_images为false，requirements为空数组。
+必须返回有效的JSON格式，不要使用markdown代码块包装，不要添加任何解释文字："""
+
+        try:
+            response = await self._text_completion(
+                prompt=prompt,
+                temperature=0.5
+            )
+            json_content = self._extract_json_from_response(response.content.strip())
+            if not json_content:
+                raise ValueError("无法从AI响应中提取有效JSON")
+
+            requirements = self._validate_image_plan(json.loads(json_content), page_number, enabled_sources, limits)
+            if requirements.requirements:
+                logger.info(f"AI融合规划第{page_number}页图片: {requirements.total_images_needed}张")
+            else:
+                logger.info(f"AI融合规划判断第{page_number}页不需要配图")
+            return requirements
+
+        except Exception as e:
+            logger.warning(f"第{page_number}页图片融合规划失败，回退到逐项分析: {e}")
+            return None
+
+    def _get_image_limits(self, image_config: Dict[str, Any]) -> Dict[Any, int]:
+        """获取各来源及总数的图片数量限制"""
+        return {
+            ImageSource.LOCAL: int(image_config.get('max_local_images_per_slide', 2)),
+            ImageSource.NETWORK: int(image_config.get('max_network_images_per_slide', 2)),
+            ImageSource.AI_GENERATED: int(image_config.get('max_ai_images_per_slide', 1)),
+            'total': int(image_config.get('max_total_images_per_slide', 3)),
+        }
+
+    def _validate_image_plan(self, plan: Any, page_number: int, enabled_sources: List[ImageSource],
+                             limits: Dict[Any, int]) -> SlideImageRequirements:
+        """校验融合规划结果的结构，并按配置限制裁剪数量
+
+        结构错误（类型不符、来源或用途非法）抛出ValueError；执行细节缺失时保留为空，
+        由对应来源的处理流程单独调用AI补齐。
+        """
+        if not isinstance(plan, dict):
+            raise ValueError("规划结果必须是JSON对象")
+        needs_images = plan.get('needs_images')
+        if not isinstance(needs_images, bool):
+            raise ValueError("needs_images必须是布尔值")
+        raw_requirements = plan.get('requirements', [])
+        if not isinstance(raw_requirements, list):
+            raise ValueError("requirements必须是数组")
+
+        requirements = SlideImageRequirements(page_number=page_number, requirements=[])
+        if not needs_images:
+            return requirements
+
+        remaining_total = limits['total']
+        used_per_source: Dict[ImageSource, int] = {}
+        for item in raw_requirements:
+            if not isinstance(item, dict):
+                raise ValueError("requirements中的每一项必须是JSON对象")
+
+            source = ImageSource(item.get('source'))
+            purpose = ImagePurpose(item.get('purpose'))
+            count = item.get('count')
+            if isinstance(count, bool) or not isinstance(count, int):
+                raise ValueError(f"count必须是整数: {count!r}")
+            if source not in enabled_sources:
+                logger.warning(f"规划使用了未启用的图片来源 {source.value}，已忽略")
+                continue
+
+            # 按来源和总数限制裁剪
+            count = min(count, limits[source] - used_per_source.get(source, 0), remaining_total)
+            if count <= 0:
+                continue
+            used_per_source[source] = used_per_source.get(source, 0) + count
+            remaining_total -= count
+
+            priority = item.get('priority', 1)
+            requirement = ImageRequirement(
+                source=source,
+                count=count,
+                purpose=purpose,
+                description=str(item.get('description', '')),
+                priority=priority if isinstance(priority, int) and 1 <= priority <= 5 else 1
+            )
+
+            keywords = item.get('search_keywords')
+            if isinstance(keywords, str) and keywords.strip():
+                requirement.search_keywords = keywords.strip()
+
+            if source == ImageSource.AI_GENERATED:
+                requirement.image_size = IMAGE_SIZE_OPTIONS.get(str(item.get('size_option')))
+                prompts = item.get('generation_prompts')
+                if isinstance(prompts, list):
+                    requirement.generation_prompts = [
+                        prompt.strip() for prompt in prompts if isinstance(prompt, str) and prompt.strip()
+                    ][:count]
+
+            requirements.add_requirement(requirement)
+
+        return requirements
+
     def _extract_json_from_response(self, content: str) -> Optional[str]:
         """从AI响应中提取JSON内容"""
         try:
@@ -395,8 +594,8 @@ class PPTImageProcessor:
                 logger.info("本地图片库为空，跳过本地图片选择")
                 return images
 
-            # 让AI生成搜索关键词
-            search_keywords = await self._ai_generate_local_search_keywords(
+            # 优先使用融合规划给出的关键词，否则让AI生成搜索关键词
+            search_keywords = requirement.search_keywords or await self._ai_generate_local_search_keywords(
                 slide_title, slide_content, project_topic, project_scenario, requirement
             )
 
@@ -457,10 +656,13 @@ class PPTImageProcessor:
                 logger.warning(f"SearXNG Host: {'已配置' if image_config.get('searxng_host') else '未配置'}")
                 return images
 
-            # 让AI生成搜索关键词
-            search_query = await self._ai_generate_search_query(
-                slide_title, slide_content, project_topic, project_scenario, requirement
-            )
+            # 优先使用融合规划给出的关键词，否则让AI生成搜索关键词
+            if requirement.search_keywords:
+                search_query = self._fit_search_query_to_provider(requirement.search_keywords)
+            else:
+                search_query = await self._ai_generate_search_query(
+                    slide_title, slide_content, project_topic, project_scenario, requirement
+                )
 
             if not search_query:
                 logger.warning("无法生成搜索关键词")
@@ -628,18 +830,24 @@ class PPTImageProcessor:
             default_provider = image_config.get('default_ai_image_provider', 'dalle')
             logger.info(f"使用AI图片提供商: {default_provider}")
 
-            # 让AI决定图片尺寸（对于多张图片，使用相同尺寸保持一致性）
-            width, height = await self._ai_decide_image_dimensions(
-                slide_title, slide_content, project_topic, project_scenario, requirement
-            )
+            # 让AI决定图片尺寸（对于多张图片，使用相同尺寸保持一致性），融合规划已给出时直接使用
+            if requirement.image_size:
+                width, height = requirement.image_size
+            else:
+                width, height = await self._ai_decide_image_dimensions(
+                    slide_title, slide_content, project_topic, project_scenario, requirement
+                )
 
             # 为每张图片生成不同的提示词
             for i in range(requirement.count):
-                # 让AI生成图片提示词
-                image_prompt = await self._ai_generate_image_prompt(
-                    slide_title, slide_content, project_topic, project_scenario,
-                    page_number, total_pages, template_html, requirement, i + 1
-                )
+                # 优先使用融合规划给出的提示词，否则让AI生成图片提示词
+                if i < len(requirement.generation_prompts):
+                    image_prompt = requirement.generation_prompts[i]
+                else:
+                    image_prompt = await self._ai_generate_image_prompt(
+                        slide_title, slide_content, project_topic, project_scenario,
+                        page_number, total_pages, template_html, requirement, i + 1
+                    )
 
                 if not image_prompt:
                     logger.warning(f"无法生成第{i+1}张图片的提示词")
@@ -1338,26 +1546,29 @@ class PPTImageProcessor:
 
             search_query = response.content.strip()
 
-            # 根据不同提供商截断查询
-            from .config_service import get_config_service
-            config_service = get_config_service()
-            all_config = config_service.get_all_config()
-            default_provider = all_config.get('default_network_search_provider', 'unsplash')
-
-            # Pixabay API的100字符限制，其他提供商使用更宽松的限制
-            max_length = 100 if default_provider == 'pixabay' else 200
-            truncated_query = self._truncate_search_query(search_query, max_length)
-
-            if len(search_query) > max_length:
-                logger.warning(f"搜索关键词过长，已截断: '{search_query}' -> '{truncated_query}'")
-
-            # logger.info(f"AI生成搜索关键词: {truncated_query}")
-            return truncated_query
+            # logger.info(f"AI生成搜索关键词: {search_query}")
+            return self._fit_search_query_to_provider(search_query)
 
         except Exception as e:
             logger.error(f"AI生成搜索关键词失败: {e}")
             return None
 
+    def _fit_search_query_to_provider(self, search_query: str) -> str:
+        """根据不同提供商截断查询"""
+        from .config_service import get_config_service
+        config_service = get_config_service()
+        all_config = config_service.get_all_config()
+        default_provider = all_config.get('default_network_search_provider', 'unsplash')
+
+        # Pixabay API的100字符限制，其他提供商使用更宽松的限制
+        max_length = 100 if default_provider == 'pixabay' else 200
+        truncated_query = self._truncate_search_query(search_query, max_length)
+
+        if len(search_query) > max_length:
+            logger.warning(f"搜索关键词过长，已截断: '{search_query}' -> '{truncated_query}'")
+
+        return truncated_query
+
     def _detect_project_language(self, project_topic: str, slide_title: str, slide_content: str) -> str:
         """检测项目语言"""
         import re
@@ -1422,15 +1633,7 @@ class PPTImageProcessor:
             choice = response.content.strip()
 
             # 解析AI的选择
-            dimensions_map = {
-                "1": (2048, 1152),  # 16:9横向
-                "2": (1152, 2048),  # 9:16竖向
-                "3": (1024, 1024),  # 1:1正方形
-                "4": (1920, 1080),  # 16:9标准
-                "5": (1080, 1920),  # 9:16标准
-            }
-
-            selected_dimensions = dimensions_map.get(choice, (2048, 1152))
+            selected_dimensions = IMAGE_SIZE_OPTIONS.get(choice, (2048, 1152))
             logger.info(f"AI选择图片尺寸: {selected_dimensions[0]}x{selected_dimensions[1]} (选项{choice})")
 
             return selected_dimensions
@@ -1570,7 +1773,8 @@ class PPTImageProcessor:
 
             response = await self._text_completion(
                 prompt=prompt,
-                temperature=0.7
+                temperature=0.7,
+                cache=True  # 同一页内容的判断结果可复用
             )
             # logger.info(f"AI判断是否需要图片的回复: {response.content}")
             decision = response.content.strip().lower()
@@ -0,0 +1,123 @@
+"""
+Stitch presentations converted from consecutive PDF page ranges into one PPTX
+
+python-pptx has no slide import, so each slide of the later presentations is recreated in the
+first one: same layout (matched by name), a copy of the slide's shape tree and background, and
+its relationships (images, media, hyperlinks, embedded parts) re-created in the target package.
+Notes are carried over and then overridden by the given per-slide notes (speech scripts).
+"""
+
+import copy
+import logging
+import re
+from io import BytesIO
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_R_NAMESPACE = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+
+def _copy_part(target_package, source_part):
+    """Copy an internal part (without nested relationships) under a fresh part name"""
+    from pptx.opc.package import Part
+
+    template = re.sub(r"\d*(\.\w+)$", r"%d\1", str(source_part.partname))
+    return Part(
+        partname=target_package.next_partname(template),
+        content_type=source_part.content_type,
+        blob=source_part.blob,
+        package=target_package,
+    )
+
+
+def _copy_relationships(source_slide, target_slide) -> Dict[str, str]:
+    """Re-create the source slide's relationships on the target slide, returns old rId -> new rId"""
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+    mapping: Dict[str, str] = {}
+    target_part = target_slide.part
+    for r_id, rel in source_slide.part.rels.items():
+        if rel.reltype in (RT.SLIDE_LAYOUT, RT.NOTES_SLIDE):
+            continue
+        if rel.is_external:
+            mapping[r_id] = target_part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+        elif rel.reltype == RT.IMAGE:
+            _, mapping[r_id] = target_part.get_or_add_image_part(BytesIO(rel.target_part.blob))
+        else:
+            if rel.target_part.rels:
+                logger.debug(f"Copying {rel.target_part.partname} without its nested relationships")
+            mapping[r_id] = target_part.relate_to(_copy_part(target_part.package, rel.target_part), rel.reltype)
+    return mapping
+
+
+def _find_layout(presentation, layout_name: str):
+    for layout in presentation.slide_layouts:
+        if layout.name == layout_name:
+            return layout
+    # Fall back to the layout with the fewest placeholders; the copied shape tree replaces them anyway
+    return min(presentation.slide_layouts, key=lambda layout: len(layout.placeholders))
+
+
+def _append_slide(presentation, source_slide):
+    target_slide = presentation.slides.add_slide(_find_layout(presentation, source_slide.slide_layout.name))
+    mapping = _copy_relationships(source_slide, target_slide)
+
+    # Replace the layout's placeholders with the source shape tree and background
+    c_sld = copy.deepcopy(source_slide._element.cSld)
+    for element in c_sld.iter():
+        for attribute, value in element.attrib.items():
+            if attribute.startswith(_R_NAMESPACE) and value in mapping:
+                element.set(attribute, mapping[value])
+    layout_c_sld = target_slide._element.cSld
+    layout_c_sld.addprevious(c_sld)
+    target_slide._element.remove(layout_c_sld)
+    return target_slide
+
+
+def _copy_notes(source_slide, target_slide):
+    if source_slide.has_notes_slide:
+        text = source_slide.notes_slide.notes_text_frame.text
+        if text:
+            target_slide.notes_slide.notes_text_frame.text = text
+
+
+def apply_slide_notes(presentation, notes: Dict[int, str]) -> int:
+    """Set speaker notes by 0-based slide index, returns the number of slides updated"""
+    applied = 0
+    for index, slide in enumerate(presentation.slides):
+        if notes.get(index):
+            slide.notes_slide.notes_text_frame.text = notes[index]
+            applied += 1
+    return applied
+
+
+def merge_presentations(pptx_paths: List[str], output_path: str, notes: Optional[Dict[int, str]] = None) -> bool:
+    """
+    Merge presentations in order into ``output_path`` and apply per-slide notes (blocking).
+
+    With a single input this only applies the notes.
+    """
+    from pptx import Presentation
+
+    try:
+        merged = Presentation(pptx_paths[0])
+        for path in pptx_paths[1:]:
+            for source_slide in Presentation(path).slides:
+                target_slide = _append_slide(merged, source_slide)
+                _copy_notes(source_slide, target_slide)
+    except Exception as e:
+        logger.error(f"Failed to merge presentations: {e}")
+        return False
+
+    if notes:
+        try:
+            applied = apply_slide_notes(merged, notes)
+            logger.info(f"Added {applied} speech scripts to PPTX notes")
+        except Exception as e:
+            # Notes are optional, the slides are still worth returning
+            logger.warning(f"Failed to add speech scripts to PPTX: {e}")
+
+    merged.save(output_path)
+    logger.info(f"Merged {len(pptx_paths)} presentation(s) into {output_path} ({len(merged.slides)} slides)")
+    return True
@@ -3,7 +3,7 @@ PPT提示词模块统一入口
 提供所有提示词类的便捷导入
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from .outline_prompts import OutlinePrompts
 from .content_prompts import ContentPrompts
 from .design_prompts import DesignPrompts
@@ -85,6 +85,9 @@ class PPTPromptsManager:
 
     def get_creative_template_context_prompt(self, *args, **kwargs):
         return self.design.get_creative_template_context_prompt(*args, **kwargs)
+
+    def get_creative_template_context_prompt_parts(self, *args, **kwargs):
+        return self.design.get_creative_template_context_prompt_parts(*args, **kwargs)
     
     # 系统相关提示词
     def get_default_ppt_system_prompt(self, *args, **kwargs):
@@ -136,6 +139,16 @@ class PPTPromptsManager:
             context_info, style_genes, unified_design_guide, template_html
         )
 
+    def get_single_slide_html_prompt_parts(self, slide_data: Dict[str, Any], confirmed_requirements: Dict[str, Any],
+                                         page_number: int, total_pages: int, context_info: str,
+                                         style_genes: str, unified_design_guide: str,
+                                         template_html: str, deck_context: str = "") -> Tuple[str, str]:
+        """获取单页HTML生成提示词，拆分为(稳定前缀, 当前页内容)以便复用提示词前缀缓存"""
+        return self.design.get_single_slide_html_prompt_parts(
+            slide_data, confirmed_requirements, page_number, total_pages,
+            context_info, style_genes, unified_design_guide, template_html, deck_context
+        )
+
     def get_slide_context_prompt(self, page_number: int, total_pages: int) -> str:
         """获取幻灯片上下文提示词（特殊页面设计要求）"""
         return self.design.get_slide_context_prompt(page_number, total_pages)
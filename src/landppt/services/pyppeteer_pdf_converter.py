@@ -8,9 +8,14 @@ import logging
 import os
 import tempfile
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from collections import deque
+from typing import List, Optional, Dict, Any, Tuple, Deque
 import time
 
+from ..core.config import app_config
+from .browser_pool import BrowserPool
+from .render_asset_cache import AssetInterceptionReport, get_render_asset_cache
+
 try:
     from playwright.async_api import async_playwright, Browser, Page, BrowserContext
     PLAYWRIGHT_AVAILABLE = True
@@ -26,6 +31,350 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Batch PDF rendering: estimated memory per concurrently rendered slide (2x scale, charts)
+PAGE_MEMORY_BUDGET = 300 * 1024 * 1024
+MAX_PAGE_POOL_SIZE = 8
+PAGE_MAX_RETRIES = 3
+PAGE_RETRY_BACKOFF = 0.5  # seconds, multiplied by the attempt number
+
+# Page readiness: a slide is ready once the DOM, network and chart renders have been quiet this long
+READY_QUIET_PERIOD_MS = 300
+READINESS_HISTORY_SIZE = 200
+ASSET_REPORT_HISTORY_SIZE = 50
+
+# Batch PDF render modes: one page.pdf() per slide, or one combined document printed once
+RENDER_MODE_PER_SLIDE = "per_slide"
+RENDER_MODE_SINGLE_PASS = "single_pass"
+# Batches each mode must have rendered (in the same batch-size bucket) before "auto" picks the faster one
+RENDER_MODE_MIN_SAMPLES = 3
+# Upper bounds of the batch-size buckets "auto" compares within: single-pass amortizes its shared
+# document load over the batch, so seconds per slide are only comparable between similar batch sizes
+RENDER_MODE_BATCH_BUCKETS = (2, 8, 20)
+# Pixels slide content may exceed the 1280x720 canvas (or an element overlap another) before it
+# counts as overflow: such slides are rendered per slide and reported by the layout inspection
+SLIDE_OVERFLOW_TOLERANCE = 2
+
+# Combined document for single-pass rendering; each slide is isolated in its own 1280x720 iframe
+SINGLE_PASS_DOCUMENT = '''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<style>
+    @page { size: 1280px 720px; margin: 0; }
+    html, body { margin: 0; padding: 0; }
+    iframe.slide-frame {
+        display: block;
+        width: 1280px;
+        height: 720px;
+        border: 0;
+        overflow: hidden;
+        break-after: page;
+        page-break-after: always;
+    }
+    iframe.slide-frame:last-child { break-after: auto; page-break-after: auto; }
+</style>
+</head>
+<body>
+__SLIDE_FRAMES__
+</body>
+</html>
+'''
+
+# Settings that determine the rendered slide PDF; part of the per-slide PDF cache key
+PDF_RENDER_SETTINGS = {
+    "viewport": [1280, 720],
+    "device_scale_factor": 2,
+    "page_size": ["338.67mm", "190.5mm"],
+    "print_background": True,
+}
+# Settings that determine a slide screenshot; part of the per-slide screenshot cache key
+SCREENSHOT_RENDER_SETTINGS = {
+    "viewport": [1280, 720],
+    "device_scale_factor": 2,
+    "format": "png",
+}
+
+# Installed before navigation (and re-evaluated as a no-op afterwards). Tracks in-flight requests,
+# DOM mutations, font loading and Chart.js / ECharts render callbacks so readiness can be awaited
+# as an event instead of fixed sleeps. All timestamps are ms since navigation start.
+READINESS_TRACKER_SCRIPT = '''
+(function () {
+    if (window.__landpptReadiness) {
+        return;
+    }
+    const now = () => performance.now();
+    const state = {
+        pendingRequests: 0,
+        lastNetworkAt: 0,
+        lastMutationAt: 0,
+        lastChartAt: 0,
+        fontsLoadedAt: null,
+        loadAt: null,
+        pendingCharts: 0,
+        renderedCharts: 0,
+        waitingOn: []
+    };
+
+    const networkStart = () => { state.pendingRequests++; state.lastNetworkAt = now(); };
+    const networkEnd = () => { state.pendingRequests = Math.max(0, state.pendingRequests - 1); state.lastNetworkAt = now(); };
+    if (window.fetch) {
+        const originalFetch = window.fetch;
+        window.fetch = function () {
+            networkStart();
+            return originalFetch.apply(this, arguments).finally(networkEnd);
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        networkStart();
+        this.addEventListener('loadend', networkEnd, { once: true });
+        return originalSend.apply(this, arguments);
+    };
+    try {
+        new PerformanceObserver(list => {
+            list.getEntries().forEach(entry => {
+                state.lastNetworkAt = Math.max(state.lastNetworkAt, entry.responseEnd || now());
+            });
+        }).observe({ type: 'resource', buffered: true });
+    } catch (e) {}
+
+    window.addEventListener('load', () => { state.loadAt = now(); });
+    if (document.fonts) {
+        document.fonts.addEventListener('loadingdone', () => { state.fontsLoadedAt = now(); });
+    }
+
+    const observeMutations = () => {
+        new MutationObserver(() => { state.lastMutationAt = now(); }).observe(document.documentElement, {
+            subtree: true, childList: true, attributes: true, characterData: true
+        });
+    };
+    if (document.documentElement) {
+        observeMutations();
+    } else {
+        document.addEventListener('DOMContentLoaded', observeMutations, { once: true });
+    }
+
+    const chartRendered = (chart) => {
+        state.lastChartAt = now();
+        if (chart.__landpptPending) {
+            chart.__landpptPending = false;
+            state.pendingCharts = Math.max(0, state.pendingCharts - 1);
+            state.renderedCharts++;
+        }
+    };
+    const chartDropped = (chart) => {
+        if (chart.__landpptPending) {
+            chart.__landpptPending = false;
+            state.pendingCharts = Math.max(0, state.pendingCharts - 1);
+        }
+    };
+    const hookChartJs = (Chart) => {
+        if (!Chart || Chart.__landpptHooked) {
+            return;
+        }
+        const plugin = {
+            id: 'landpptReadiness',
+            beforeInit: (chart) => { chart.__landpptPending = true; state.pendingCharts++; },
+            afterRender: chartRendered,
+            destroy: chartDropped,
+            afterDestroy: chartDropped
+        };
+        try {
+            if (Chart.register) {
+                Chart.register(plugin);
+            } else if (Chart.plugins && Chart.plugins.register) {
+                Chart.plugins.register(plugin);
+            } else {
+                return;
+            }
+            Chart.__landpptHooked = true;
+        } catch (e) {}
+    };
+    const hookEcharts = (echarts) => {
+        if (!echarts || echarts.__landpptHooked || typeof echarts.init !== 'function') {
+            return;
+        }
+        const originalInit = echarts.init;
+        echarts.init = function () {
+            const chart = originalInit.apply(this, arguments);
+            if (chart && !chart.__landpptTracked) {
+                chart.__landpptTracked = true;
+                // Only charts that received an option are expected to finish rendering
+                const originalSetOption = chart.setOption;
+                chart.setOption = function () {
+                    if (!chart.__landpptSeen) {
+                        chart.__landpptSeen = true;
+                        chart.__landpptPending = true;
+                        state.pendingCharts++;
+                    }
+                    return originalSetOption.apply(this, arguments);
+                };
+                chart.on('finished', () => chartRendered(chart));
+                const originalDispose = chart.dispose;
+                chart.dispose = function () {
+                    chartDropped(chart);
+                    return originalDispose.apply(this, arguments);
+                };
+            }
+            return chart;
+        };
+        echarts.__landpptHooked = true;
+    };
+    const hookCharts = () => {
+        hookChartJs(window.Chart);
+        hookEcharts(window.echarts);
+    };
+    // Hook chart libraries the moment their UMD bundle assigns the global; the microtask lets
+    // bundles that populate the global after assigning it finish first
+    [['Chart', hookChartJs], ['echarts', hookEcharts]].forEach(([name, hook]) => {
+        let value = window[name];
+        if (value) {
+            hook(value);
+            return;
+        }
+        try {
+            Object.defineProperty(window, name, {
+                configurable: true,
+                enumerable: true,
+                get() { return value; },
+                set(next) { value = next; queueMicrotask(() => hook(next)); }
+            });
+        } catch (e) {}
+    });
+
+    state.hookCharts = hookCharts;
+    state.isReady = (quietMs) => {
+        hookCharts();
+        const t = now();
+        const waiting = [];
+        if (document.readyState !== 'complete') waiting.push('load');
+        if (document.fonts && document.fonts.status !== 'loaded') waiting.push('fonts');
+        if (Array.from(document.images).some(img => !img.complete)) waiting.push('images');
+        if (state.pendingRequests > 0 || t - state.lastNetworkAt < quietMs) waiting.push('network');
+        if (state.pendingCharts > 0 || t - state.lastChartAt < quietMs) waiting.push('charts');
+        if (t - state.lastMutationAt < quietMs) waiting.push('dom');
+        state.waitingOn = waiting;
+        return waiting.length === 0;
+    };
+    state.report = () => ({
+        now: Math.round(now()),
+        loadAt: state.loadAt === null ? null : Math.round(state.loadAt),
+        fontsLoadedAt: state.fontsLoadedAt === null ? null : Math.round(state.fontsLoadedAt),
+        lastNetworkAt: Math.round(state.lastNetworkAt),
+        lastMutationAt: Math.round(state.lastMutationAt),
+        lastChartAt: Math.round(state.lastChartAt),
+        pendingRequests: state.pendingRequests,
+        pendingCharts: state.pendingCharts,
+        renderedCharts: state.renderedCharts,
+        waitingOn: state.waitingOn
+    });
+    window.__landpptReadiness = state;
+})();
+'''
+
+# Deterministic layout check run in the rendered slide: measures element boxes against the canvas
+# and reports page overflow/scrollbars, clipped text, off-canvas text and media, and overlapping
+# text blocks. Decorative elements without text or media are ignored (they often bleed on purpose).
+LAYOUT_INSPECTION_SCRIPT = '''
+({width, height, tolerance}) => {
+    const issues = [];
+    const describe = (el) => {
+        let label = el.tagName.toLowerCase();
+        if (el.id) label += '#' + el.id;
+        const classes = (typeof el.className === 'string' ? el.className : '').trim().split(/\\s+/).filter(Boolean);
+        if (classes.length) label += '.' + classes.slice(0, 2).join('.');
+        const text = (el.innerText || el.getAttribute('alt') || '').replace(/\\s+/g, ' ').trim();
+        return text ? `${label} "${text.slice(0, 40)}"` : label;
+    };
+    const box = (rect) => ({
+        x: Math.round(rect.left), y: Math.round(rect.top),
+        width: Math.round(rect.width), height: Math.round(rect.height)
+    });
+    const isVisible = (el, style, rect) => rect.width > 0 && rect.height > 0 &&
+        style.visibility !== 'hidden' && style.display !== 'none' && parseFloat(style.opacity || '1') > 0.05;
+    const ownText = (el) => Array.from(el.childNodes).some(
+        node => node.nodeType === Node.TEXT_NODE && node.textContent.trim().length > 0);
+
+    const root = document.documentElement;
+    const scrollWidth = Math.max(root.scrollWidth, document.body ? document.body.scrollWidth : 0);
+    const scrollHeight = Math.max(root.scrollHeight, document.body ? document.body.scrollHeight : 0);
+    if (scrollWidth > width + tolerance || scrollHeight > height + tolerance) {
+        issues.push({type: 'page_overflow', severity: 'high', element: 'document',
+                     detail: `content size ${scrollWidth}x${scrollHeight} exceeds ${width}x${height} canvas`});
+    }
+
+    const textBlocks = [];
+    for (const el of document.body ? document.body.querySelectorAll('*') : []) {
+        if (['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE', 'BR'].includes(el.tagName)) continue;
+        const style = getComputedStyle(el);
+        const rect = el.getBoundingClientRect();
+        if (!isVisible(el, style, rect)) continue;
+
+        const isMedia = ['IMG', 'CANVAS', 'SVG', 'VIDEO', 'svg'].includes(el.tagName);
+        const hasText = ownText(el);
+
+        if (hasText || isMedia) {
+            const outside = Math.max(0, -rect.left) + Math.max(0, rect.right - width) +
+                            Math.max(0, -rect.top) + Math.max(0, rect.bottom - height);
+            if (outside > tolerance) {
+                const visibleWidth = Math.max(0, Math.min(rect.right, width) - Math.max(rect.left, 0));
+                const visibleHeight = Math.max(0, Math.min(rect.bottom, height) - Math.max(rect.top, 0));
+                const hiddenShare = 1 - (visibleWidth * visibleHeight) / (rect.width * rect.height);
+                issues.push({
+                    type: isMedia ? 'off_canvas_media' : 'off_canvas_text',
+                    severity: isMedia && hiddenShare < 0.2 ? 'medium' : 'high',
+                    element: describe(el), box: box(rect),
+                    detail: `${Math.round(hiddenShare * 100)}% outside the canvas`
+                });
+            }
+        }
+
+        const overflowX = style.overflowX, overflowY = style.overflowY;
+        const clipsX = overflowX !== 'visible', clipsY = overflowY !== 'visible';
+        const overflowsX = el.scrollWidth > el.clientWidth + 1, overflowsY = el.scrollHeight > el.clientHeight + 1;
+        if (el.clientHeight > 0 && ((clipsX && overflowsX) || (clipsY && overflowsY)) && (el.innerText || '').trim()) {
+            const scrolls = ['auto', 'scroll'].includes(overflowX) || ['auto', 'scroll'].includes(overflowY);
+            issues.push({
+                type: scrolls ? 'scrollbar' : 'clipped_text', severity: 'high',
+                element: describe(el), box: box(rect),
+                detail: `content ${el.scrollWidth}x${el.scrollHeight} in ${el.clientWidth}x${el.clientHeight} box`
+            });
+        }
+
+        if (hasText && textBlocks.length < 300) {
+            textBlocks.push({el, rect});
+        }
+    }
+
+    for (let i = 0; i < textBlocks.length; i++) {
+        for (let j = i + 1; j < textBlocks.length; j++) {
+            const a = textBlocks[i], b = textBlocks[j];
+            if (a.el.contains(b.el) || b.el.contains(a.el)) continue;
+            const overlapWidth = Math.min(a.rect.right, b.rect.right) - Math.max(a.rect.left, b.rect.left);
+            const overlapHeight = Math.min(a.rect.bottom, b.rect.bottom) - Math.max(a.rect.top, b.rect.top);
+            if (overlapWidth <= tolerance || overlapHeight <= tolerance) continue;
+            const smaller = Math.min(a.rect.width * a.rect.height, b.rect.width * b.rect.height);
+            const share = (overlapWidth * overlapHeight) / smaller;
+            if (share > 0.2) {
+                issues.push({
+                    type: 'text_overlap', severity: share > 0.5 ? 'high' : 'medium',
+                    element: `${describe(a.el)} / ${describe(b.el)}`, box: box(a.rect),
+                    detail: `${Math.round(share * 100)}% of the smaller block is covered`
+                });
+            }
+        }
+    }
+
+    return {
+        canvas: {width, height},
+        content: {width: scrollWidth, height: scrollHeight},
+        issues: issues.slice(0, 30),
+        issue_count: issues.length,
+        has_problems: issues.some(issue => issue.severity !== 'low')
+    };
+}
+'''
+
 
 class PlaywrightPDFConverter:
     """
@@ -34,10 +383,25 @@ class PlaywrightPDFConverter:
     """
 
     def __init__(self):
-        self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
         self.playwright = None
+        self.readiness_timings: Deque[Dict[str, Any]] = deque(maxlen=READINESS_HISTORY_SIZE)
+        self.asset_reports: Deque[Dict[str, Any]] = deque(maxlen=ASSET_REPORT_HISTORY_SIZE)
+        # Seconds per slide of recent batches, by batch-size bucket and render mode
+        self.render_mode_timings: Dict[str, Dict[str, Deque[float]]] = {
+            self._batch_bucket(upper): {
+                RENDER_MODE_PER_SLIDE: deque(maxlen=20),
+                RENDER_MODE_SINGLE_PASS: deque(maxlen=20),
+            }
+            for upper in RENDER_MODE_BATCH_BUCKETS + (RENDER_MODE_BATCH_BUCKETS[-1] + 1,)
+        }
         self._browser_lock = asyncio.Lock()
+        # 常驻浏览器池：PDF导出、PPTX截图导出和布局修复共享，避免每次冷启动Chromium
+        self.browser_pool = BrowserPool(
+            self._launch_browser,
+            size=app_config.browser_pool_size,
+            recycle_after_pages=app_config.browser_recycle_pages,
+            recycle_memory_mb=app_config.browser_recycle_memory_mb
+        )
 
     def is_available(self) -> bool:
         """Check if Playwright is available"""
@@ -267,290 +631,107 @@ class PlaywrightPDFConverter:
             )
             raise ImportError(error_msg)
 
-    async def _get_or_create_browser(self) -> Browser:
-        """Get existing browser or create a new one (with thread safety)"""
-        async with self._browser_lock:
-            if self.browser is None:
-                self.browser = await self._launch_browser()
-                # Create a browser context for better isolation
-                self.context = await self.browser.new_context(
-                    viewport={'width': 1280, 'height': 720},
-                    device_scale_factor=2,
-                    ignore_https_errors=True
-                )
-            return self.browser
-    
-    async def _wait_for_charts_and_dynamic_content(self, page: Page, max_wait_time: int = 15000):
-        """
-        Enhanced function to wait for Chart.js, ECharts.js, D3.js charts and dynamic content to fully render
-        Improved detection for multiple chart libraries and animations with extended wait time
-        """
-        logger.debug("🎯 等待图表和动态内容完全渲染...")
+    async def warm_up(self):
+        """Launch the pooled browsers ahead of the first export"""
+        await self.browser_pool.warm_up()
 
-        start_time = time.time() * 1000  # Convert to milliseconds
-        attempts = 0
-        max_attempts = 30  # 进一步增加尝试次数以确保所有动态内容完全加载
-
-        # 首先等待基础DOM和资源加载
-        await page.wait_for_selector('body', timeout=5000)
-
-        # 等待所有图片加载完成
-        await page.evaluate('''() => {
-            return new Promise((resolve) => {
-                const images = Array.from(document.querySelectorAll('img'));
-                if (images.length === 0) {
-                    resolve();
-                    return;
-                }
-
-                let loadedCount = 0;
-                const checkComplete = () => {
-                    loadedCount++;
-                    if (loadedCount === images.length) {
-                        resolve();
-                    }
-                };
-
-                images.forEach(img => {
-                    if (img.complete) {
-                        checkComplete();
-                    } else {
-                        img.onload = checkComplete;
-                        img.onerror = checkComplete;
-                    }
-                });
+    async def _install_readiness_tracker(self, page: Page):
+        """Install the readiness tracker before navigation so it sees every request, mutation and chart"""
+        await page.add_init_script(script=READINESS_TRACKER_SCRIPT)
 
-                // 超时保护
-                setTimeout(resolve, 3000);
-            });
-        }''')
-
-        while (time.time() * 1000 - start_time) < max_wait_time and attempts < max_attempts:
-            attempts += 1
+    async def _wait_for_page_ready(self, page: Page, max_wait_time: int = 15000,
+                                   quiet_period: int = READY_QUIET_PERIOD_MS, stage: str = "ready") -> Dict[str, Any]:
+        """
+        Wait until the page is stable: loaded, fonts ready, no pending images, requests or chart renders,
+        and no DOM mutation for ``quiet_period`` ms. Returns immediately once stable; the timing report
+        (what the page was still waiting on, when each signal settled) is logged and kept in
+        ``readiness_timings``.
+        """
+        start_time = time.time()
+        timed_out = False
+        try:
+            # No-op when the tracker was installed before navigation
+            await page.evaluate(READINESS_TRACKER_SCRIPT)
+            await page.wait_for_function(
+                "quiet => window.__landpptReadiness.isReady(quiet)",
+                arg=quiet_period,
+                polling=50,
+                timeout=max_wait_time
+            )
+        except Exception as error:
+            timed_out = True
+            logger.debug(f"⚠️ 页面就绪等待未完成 ({stage}): {error}")
 
+        try:
+            report = await page.evaluate("() => window.__landpptReadiness.report()")
+        except Exception:
+            report = {}
+
+        report.update({
+            "page": Path(page.url).name if page.url else "",
+            "stage": stage,
+            "waited_ms": round((time.time() - start_time) * 1000),
+            "timed_out": timed_out,
+        })
+        self.readiness_timings.append(report)
+
+        if timed_out:
+            logger.info(f"⏱️ {report['page']} [{stage}] 等待 {report['waited_ms']}ms 超时，仍在等待: {report.get('waitingOn')}")
+        else:
+            logger.debug(f"⏱️ {report['page']} [{stage}] 就绪，等待 {report['waited_ms']}ms "
+                         f"(图表:{report.get('renderedCharts', 0)}, 最后网络活动:{report.get('lastNetworkAt')}ms, "
+                         f"最后DOM变化:{report.get('lastMutationAt')}ms)")
+        return report
+
+    def get_readiness_timings(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent per-page readiness timings"""
+        return list(self.readiness_timings)[-limit:]
+
+    async def _install_asset_routing(self, page: Page, report: AssetInterceptionReport):
+        """Route the page's network requests through the local render asset store"""
+        if app_config.render_network_mode == "direct":
+            return
+        asset_cache = get_render_asset_cache()
+
+        async def handle(route):
             try:
-                # 详细检查页面状态，包括多种图表库的动态内容
-                chart_status = await page.evaluate('''() => {
-                    const results = {
-                        domReady: document.readyState === 'complete',
-                        chartJsLoaded: typeof window.Chart !== 'undefined',
-                        echartsLoaded: typeof window.echarts !== 'undefined',
-                        d3Loaded: typeof window.d3 !== 'undefined',
-                        canvasElements: 0,
-                        svgElements: 0,
-                        totalCharts: 0,
-                        renderedCharts: 0,
-                        echartsInstances: 0,
-                        renderedEcharts: 0,
-                        d3Elements: 0,
-                        renderedD3: 0,
-                        animationsComplete: true,
-                        scriptsLoaded: true,
-                        imagesLoaded: true
-                    };
-
-                    // 检查所有canvas元素
-                    const canvasElements = document.querySelectorAll('canvas');
-                    results.canvasElements = canvasElements.length;
-
-                    // 检查所有SVG元素
-                    const svgElements = document.querySelectorAll('svg');
-                    results.svgElements = svgElements.length;
-
-                    // 检查图片是否全部加载完成
-                    const images = document.querySelectorAll('img');
-                    images.forEach(img => {
-                        if (!img.complete || img.naturalWidth === 0) {
-                            results.imagesLoaded = false;
-                        }
-                    });
-
-                    // 检查脚本是否加载完成
-                    const scripts = document.querySelectorAll('script[src]');
-                    scripts.forEach(script => {
-                        if (script.readyState && script.readyState !== 'complete' && script.readyState !== 'loaded') {
-                            results.scriptsLoaded = false;
-                        }
-                    });
-
-                    // 详细检查Chart.js实例和渲染状态
-                    if (results.chartJsLoaded && window.Chart && window.Chart.instances) {
-                        results.totalCharts = Object.keys(window.Chart.instances).length;
-
-                        // 检查每个图表的渲染状态
-                        Object.values(window.Chart.instances).forEach(chart => {
-                            if (chart && chart.canvas) {
-                                try {
-                                    const ctx = chart.canvas.getContext('2d');
-                                    if (ctx) {
-                                        // 检查canvas是否有实际内容
-                                        const imageData = ctx.getImageData(0, 0, Math.min(chart.canvas.width, 100), Math.min(chart.canvas.height, 100));
-                                        let hasContent = false;
-
-                                        // 检查前100x100像素区域是否有非透明内容
-                                        for (let i = 3; i < imageData.data.length; i += 4) {
-                                            if (imageData.data[i] > 0) { // alpha channel > 0
-                                                hasContent = true;
-                                                break;
-                                            }
-                                        }
-
-                                        if (hasContent) {
-                                            results.renderedCharts++;
-                                        }
-                                    }
-                                } catch (e) {
-                                    // 如果无法检查内容，假设已渲染
-                                    results.renderedCharts++;
-                                }
-
-                                // 检查图表动画是否完成
-                                if (chart.animating || (chart.options && chart.options.animation && chart.options.animation.duration > 0)) {
-                                    results.animationsComplete = false;
-                                }
-                            }
-                        });
-                    }
-
-                    // 详细检查ECharts实例和渲染状态
-                    if (results.echartsLoaded && window.echarts) {
-                        // 查找所有ECharts实例
-                        document.querySelectorAll('[_echarts_instance_], [id*="chart"], [class*="chart"], [class*="echarts"]').forEach(el => {
-                            const instance = window.echarts.getInstanceByDom(el);
-                            if (instance) {
-                                results.echartsInstances++;
-
-                                try {
-                                    // 检查ECharts是否已完成渲染
-                                    const option = instance.getOption();
-                                    if (option && option.series && option.series.length > 0) {
-                                        // 检查canvas内容
-                                        const canvas = el.querySelector('canvas');
-                                        if (canvas) {
-                                            const ctx = canvas.getContext('2d');
-                                            if (ctx) {
-                                                const imageData = ctx.getImageData(0, 0, Math.min(canvas.width, 100), Math.min(canvas.height, 100));
-                                                let hasContent = false;
-
-                                                for (let i = 3; i < imageData.data.length; i += 4) {
-                                                    if (imageData.data[i] > 0) {
-                                                        hasContent = true;
-                                                        break;
-                                                    }
-                                                }
-
-                                                if (hasContent) {
-                                                    results.renderedEcharts++;
-                                                }
-                                            }
-                                        } else {
-                                            // 如果没有canvas，假设已渲染（可能是SVG模式）
-                                            results.renderedEcharts++;
-                                        }
-                                    }
-
-                                    // 检查ECharts动画状态
-                                    if (option && option.animation !== false) {
-                                        results.animationsComplete = false;
-                                    }
-                                } catch (e) {
-                                    // 出错时保守处理，假设已渲染
-                                    results.renderedEcharts++;
-                                }
-                            }
-                        });
-                    }
-
-                    // 详细检查D3.js SVG元素和渲染状态
-                    if (results.d3Loaded && window.d3) {
-                        svgElements.forEach(svg => {
-                            results.d3Elements++;
-
-                            try {
-                                // 检查SVG是否有实际内容
-                                const children = svg.children;
-                                let hasContent = false;
-
-                                // 检查是否有路径、圆形、矩形等图形元素
-                                const graphicElements = svg.querySelectorAll('path, circle, rect, line, polygon, polyline, ellipse, text, g');
-                                if (graphicElements.length > 0) {
-                                    // 进一步检查是否有实际的绘制内容
-                                    for (let elem of graphicElements) {
-                                        const bbox = elem.getBBox ? elem.getBBox() : null;
-                                        if (bbox && (bbox.width > 0 || bbox.height > 0)) {
-                                            hasContent = true;
-                                            break;
-                                        }
-                                        // 检查是否有填充或描边
-                                        const style = window.getComputedStyle(elem);
-                                        if (style.fill !== 'none' || style.stroke !== 'none') {
-                                            hasContent = true;
-                                            break;
-                                        }
-                                    }
-                                }
-
-                                if (hasContent) {
-                                    results.renderedD3++;
-                                }
-                            } catch (e) {
-                                // 出错时保守处理，假设已渲染
-                                results.renderedD3++;
-                            }
-                        });
-                    }
-
-                    // 检查其他可能的动态内容
-                    const dynamicElements = document.querySelectorAll('[class*="animate"], [class*="transition"], [style*="transition"], [style*="animation"]');
-                    if (dynamicElements.length > 0) {
-                        // 给动态元素一些时间完成动画
-                        results.animationsComplete = false;
-                    }
-
-                    return results;
-                }''')
-
-                logger.debug(f"📊 图表检查 (第{attempts}次): DOM:{chart_status['domReady']}, Chart.js:{chart_status['renderedCharts']}/{chart_status['totalCharts']}, ECharts:{chart_status['renderedEcharts']}/{chart_status['echartsInstances']}, D3:{chart_status['renderedD3']}/{chart_status['d3Elements']}, 动画:{chart_status['animationsComplete']}")
-
-                # 判断是否所有内容都已准备就绪
-                all_charts_ready = (
-                    (chart_status['totalCharts'] == 0 or chart_status['renderedCharts'] >= chart_status['totalCharts']) and
-                    (chart_status['echartsInstances'] == 0 or chart_status['renderedEcharts'] >= chart_status['echartsInstances']) and
-                    (chart_status['d3Elements'] == 0 or chart_status['renderedD3'] >= chart_status['d3Elements'])
-                )
-
-                all_ready = (chart_status['domReady'] and
-                           chart_status['scriptsLoaded'] and
-                           chart_status['imagesLoaded'] and
-                           chart_status['animationsComplete'] and
-                           all_charts_ready)
-
-                if all_ready:
-                    logger.debug("✅ 所有图表和动态内容已完全渲染")
-                    break
-
-                # 动态等待时间：如果有图表内容，等待时间更短
-                total_rendered = chart_status['renderedCharts'] + chart_status['renderedEcharts'] + chart_status['renderedD3']
-                total_expected = chart_status['totalCharts'] + chart_status['echartsInstances'] + chart_status['d3Elements']
-
-                if total_rendered > 0 or total_expected == 0:
-                    await asyncio.sleep(0.2)  # 已有内容，快速检查
-                else:
-                    await asyncio.sleep(0.5)  # 等待内容加载
-
-            except Exception as error:
-                logger.warning(f"⚠️ 渲染检查出错 (第{attempts}次): {error}")
-                await asyncio.sleep(0.5)
+                await asset_cache.handle_route(route, report)
+            except Exception as e:
+                # An unresolved route would hang the request until the load/readiness timeout
+                logger.debug(f"Asset routing failed for {route.request.url}: {e}")
+                try:
+                    await route.abort("failed")
+                except Exception:
+                    pass
+                report.record("failed", route.request.url)
+
+        await page.route("**/*", handle)
+
+    def _finish_asset_report(self, report: AssetInterceptionReport):
+        """Keep an export's interception report and log the requests that missed the store"""
+        summary = report.to_dict()
+        self.asset_reports.append(summary)
+        if report.missed:
+            logger.info(f"📦 {report.label}: {summary['intercepted']} 个请求被拦截，{report.missed} 个未命中本地资源 "
+                        f"(网络获取 {summary['fetched']}，拦截 {summary['blocked']}，失败 {summary['failed']})")
+        else:
+            logger.debug(f"📦 {report.label}: {summary['intercepted']} 个请求全部由本地资源提供")
+
+    def get_asset_reports(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent per-export asset interception reports"""
+        return list(self.asset_reports)[-limit:]
+
+    async def _wait_for_charts_and_dynamic_content(self, page: Page, max_wait_time: int = 15000) -> bool:
+        """
+        Wait for Chart.js, ECharts.js, D3.js charts and dynamic content to fully render
+        Driven by chart render callbacks and a DOM quiet period, returns as soon as the slide is stable;
+        False if the slide did not become stable within ``max_wait_time``
+        """
+        logger.debug("🎯 等待图表和动态内容完全渲染...")
 
-        # 根据检测结果决定最终等待时间
-        if attempts < 5:  # 如果很快就检测到内容完成，只需短暂等待
-            await asyncio.sleep(0.5)
-        else:  # 如果需要较长时间检测，给更多稳定时间
-            await asyncio.sleep(1.2)
+        start_time = time.time() * 1000  # Convert to milliseconds
 
-        # 额外的稳定等待，确保所有异步渲染完成
-        logger.debug("🔄 执行最终稳定等待...")
-        await asyncio.sleep(1.0)
+        report = await self._wait_for_page_ready(page, max_wait_time=max_wait_time, stage="charts")
 
         # 强制触发一次重排和重绘
         await page.evaluate('''() => {
@@ -570,6 +751,7 @@ class PlaywrightPDFConverter:
 
         total_time = time.time() * 1000 - start_time
         logger.debug(f"✨ 图表和动态内容等待完成，总耗时: {total_time:.0f}ms")
+        return not report.get("timed_out")
 
     async def _perform_final_chart_verification(self, page: Page) -> Optional[Dict]:
         """Enhanced final verification for Chart.js, ECharts, and D3.js charts"""
@@ -931,9 +1113,6 @@ class PlaywrightPDFConverter:
 
             logger.debug(f"🔄 重新执行了 {script_count} 个图表相关脚本")
 
-            # 等待脚本执行
-            await asyncio.sleep(0.5)
-
             # 第二步：强制触发图表渲染和更新
             chart_results = await page.evaluate('''() => {
                 const results = {
@@ -1111,89 +1290,36 @@ class PlaywrightPDFConverter:
         except Exception as error:
             logger.debug(f"⚠️ 图表强制初始化失败: {error}")
 
-    async def _wait_for_fonts_and_resources(self, page: Page, max_wait_time: int = 8000):
-        """等待所有字体和外部资源加载完成"""
+    async def _wait_for_fonts_and_resources(self, page: Page, max_wait_time: int = 8000) -> bool:
+        """等待所有字体和外部资源加载完成，超时或出错时返回False"""
         logger.debug("🔤 等待字体和外部资源加载...")
 
         start_time = time.time() * 1000
 
         try:
-            # 等待字体加载完成
+            # 触发所有可能的懒加载内容，随后的就绪等待会覆盖由此产生的请求
             await page.evaluate('''() => {
-                return new Promise((resolve) => {
-                    if (document.fonts && document.fonts.ready) {
-                        document.fonts.ready.then(resolve);
-                        // 超时保护
-                        setTimeout(resolve, 5000);
-                    } else {
-                        // 如果不支持 document.fonts，等待一段时间
-                        setTimeout(resolve, 2000);
-                    }
-                });
-            }''')
-
-            # 等待所有样式表加载完成
-            await page.evaluate('''() => {
-                return new Promise((resolve) => {
-                    const stylesheets = Array.from(document.styleSheets);
-                    let loadedCount = 0;
-
-                    if (stylesheets.length === 0) {
-                        resolve();
-                        return;
-                    }
-
-                    const checkComplete = () => {
-                        loadedCount++;
-                        if (loadedCount === stylesheets.length) {
-                            resolve();
-                        }
-                    };
-
-                    stylesheets.forEach(sheet => {
-                        try {
-                            // 尝试访问样式表规则来确认加载完成
-                            const rules = sheet.cssRules || sheet.rules;
-                            checkComplete();
-                        } catch (e) {
-                            // 如果无法访问，可能还在加载中
-                            if (sheet.ownerNode) {
-                                sheet.ownerNode.onload = checkComplete;
-                                sheet.ownerNode.onerror = checkComplete;
-                            } else {
-                                checkComplete();
-                            }
-                        }
-                    });
-
-                    // 超时保护
-                    setTimeout(resolve, 3000);
-                });
-            }''')
-
-            # 检查是否有延迟加载的内容
-            await page.evaluate('''() => {
-                // 触发所有可能的懒加载内容
                 const lazyElements = document.querySelectorAll('[data-src], [loading="lazy"], .lazy');
                 lazyElements.forEach(el => {
                     if (el.dataset.src) {
                         el.src = el.dataset.src;
                     }
-                    // 滚动到元素位置触发懒加载
-                    el.scrollIntoView();
-                });
-
-                // 强制重新计算所有元素的样式
-                document.querySelectorAll('*').forEach(el => {
-                    window.getComputedStyle(el).getPropertyValue('opacity');
+                    if (el.loading === 'lazy') {
+                        el.loading = 'eager';
+                    }
                 });
             }''')
 
+            # 字体(document.fonts)、图片和网络请求全部就绪后立即返回
+            report = await self._wait_for_page_ready(page, max_wait_time=max_wait_time, stage="resources")
+
             elapsed_time = time.time() * 1000 - start_time
             logger.debug(f"✅ 字体和资源加载完成，耗时: {elapsed_time:.0f}ms")
+            return not report.get("timed_out")
 
         except Exception as error:
             logger.debug(f"⚠️ 字体和资源等待过程中出错: {error}")
+            return False
 
     async def _comprehensive_page_ready_check(self, page: Page) -> bool:
         """综合检查页面是否完全准备就绪"""
@@ -1243,6 +1369,8 @@ class PlaywrightPDFConverter:
                             const rules = sheet.cssRules || sheet.rules;
                             // 如果能访问规则，说明已加载
                         } catch (e) {
+                            // 跨域样式表（如CDN图标库）已加载但规则不可读，不视为未就绪
+                            if (e.name === 'SecurityError') return;
                             status.stylesheetsLoaded = false;
                             status.errors.push(`Stylesheet ${index} not accessible`);
                         }
@@ -1693,148 +1821,112 @@ class PlaywrightPDFConverter:
         if options is None:
             options = {}
 
-        page = None
-        try:
-            # Get or create shared browser
-            browser = await self._get_or_create_browser()
-            page = await self.context.new_page()
-
-            # Set viewport for 16:9 aspect ratio (1280x720)
-            viewport_width = options.get('viewportWidth', 1280)
-            viewport_height = options.get('viewportHeight', 720)
-            await page.set_viewport_size({'width': viewport_width, 'height': viewport_height})
+        # Set viewport for 16:9 aspect ratio (1280x720)
+        viewport_width = options.get('viewportWidth', 1280)
+        viewport_height = options.get('viewportHeight', 720)
 
-            # Navigate to the HTML file
-            absolute_html_path = Path(html_file_path).resolve()
-            logger.debug(f"📄 Navigating to: file://{absolute_html_path}")
+        asset_report = AssetInterceptionReport(f"pdf:{Path(html_file_path).name}")
+        try:
+            # Use an isolated context on a pooled browser
+            async with self.browser_pool.page(
+                viewport={'width': viewport_width, 'height': viewport_height},
+                device_scale_factor=2,
+                ignore_https_errors=True
+            ) as page:
+                await self._install_asset_routing(page, asset_report)
+                await self._install_readiness_tracker(page)
 
-            await page.goto(f"file://{absolute_html_path}",
-                          wait_until='networkidle',  # 等待网络空闲，确保所有资源加载完成
-                          timeout=60000)  # 增加超时时间以确保完整加载
-
-            # 智能等待：根据页面复杂度动态调整等待时间
-            page_complexity = await page.evaluate('''() => {
-                const complexity = {
-                    canvasCount: document.querySelectorAll('canvas').length,
-                    svgCount: document.querySelectorAll('svg').length,
-                    imageCount: document.querySelectorAll('img').length,
-                    scriptCount: document.querySelectorAll('script').length,
-                    stylesheetCount: document.styleSheets.length,
-                    totalElements: document.querySelectorAll('*').length
-                };
+                # Navigate to the HTML file
+                absolute_html_path = Path(html_file_path).resolve()
+                logger.debug(f"📄 Navigating to: file://{absolute_html_path}")
 
-                // 计算复杂度分数
-                let score = 0;
-                score += complexity.canvasCount * 3;  // 图表权重高
-                score += complexity.svgCount * 2;
-                score += complexity.imageCount * 1;
-                score += complexity.scriptCount * 1;
-                score += complexity.stylesheetCount * 1;
-                score += Math.floor(complexity.totalElements / 100);
-
-                return {
-                    ...complexity,
-                    complexityScore: score
-                };
-            }''')
+                # 网络空闲由就绪追踪器判断，load事件后即可开始检查
+                await page.goto(f"file://{absolute_html_path}",
+                              wait_until='load',
+                              timeout=60000)  # 增加超时时间以确保完整加载
 
-            # 根据复杂度调整等待时间
-            base_wait = 1.0
-            if page_complexity['complexityScore'] > 20:
-                wait_time = base_wait + 1.5  # 复杂页面等待更久
-            elif page_complexity['complexityScore'] > 10:
-                wait_time = base_wait + 1.0
-            elif page_complexity['complexityScore'] > 5:
-                wait_time = base_wait + 0.5
-            else:
-                wait_time = base_wait
+                # 等待字体和外部资源加载完成
+                await self._wait_for_fonts_and_resources(page)
 
-            logger.debug(f"📊 页面复杂度分析: 图表:{page_complexity['canvasCount']+page_complexity['svgCount']}, 图片:{page_complexity['imageCount']}, 总分:{page_complexity['complexityScore']}, 等待时间:{wait_time}s")
-            await asyncio.sleep(wait_time)
+                # Inject optimizations
+                await self._inject_pdf_styles(page)
+                await self._inject_javascript_optimizations(page)
 
-            # 等待字体和外部资源加载完成
-            await self._wait_for_fonts_and_resources(page)
+                # Force chart initialization after page load
+                await self._force_chart_initialization(page)
 
-            # Inject optimizations
-            await self._inject_pdf_styles(page)
-            await self._inject_javascript_optimizations(page)
+                # Enhanced waiting for Chart.js and dynamic content rendering
+                await self._wait_for_charts_and_dynamic_content(page)
 
-            # Force chart initialization after page load
-            await self._force_chart_initialization(page)
+                # Perform final chart verification before PDF generation
+                await self._perform_final_chart_verification(page)
 
-            # Enhanced waiting for Chart.js and dynamic content rendering
-            await self._wait_for_charts_and_dynamic_content(page)
-
-            # Perform final chart verification before PDF generation
-            await self._perform_final_chart_verification(page)
-
-            # 最终确认所有内容已准备就绪
-            logger.debug("🔍 执行最终内容检查...")
-            await page.evaluate('''() => {
-                // 最后一次强制重排和重绘
-                document.body.offsetHeight;
-
-                // 确保所有图表容器都可见
-                document.querySelectorAll('canvas, svg, [id*="chart"], [class*="chart"]').forEach(el => {
-                    if (el.style.display === 'none') {
-                        el.style.display = 'block';
-                    }
-                    if (el.style.visibility === 'hidden') {
-                        el.style.visibility = 'visible';
-                    }
-                });
+                # 最终确认所有内容已准备就绪
+                logger.debug("🔍 执行最终内容检查...")
+                await page.evaluate('''() => {
+                    // 最后一次强制重排和重绘
+                    document.body.offsetHeight;
 
-                return new Promise(resolve => {
-                    requestAnimationFrame(() => {
-                        requestAnimationFrame(resolve);
+                    // 确保所有图表容器都可见
+                    document.querySelectorAll('canvas, svg, [id*="chart"], [class*="chart"]').forEach(el => {
+                        if (el.style.display === 'none') {
+                            el.style.display = 'block';
+                        }
+                        if (el.style.visibility === 'hidden') {
+                            el.style.visibility = 'visible';
+                        }
                     });
-                });
-            }''')
 
-            # 最终稳定等待
-            await asyncio.sleep(0.5)
-
-            # 执行最终的综合页面就绪检查
-            await self._comprehensive_page_ready_check(page)
+                    return new Promise(resolve => {
+                        requestAnimationFrame(() => {
+                            requestAnimationFrame(resolve);
+                        });
+                    });
+                }''')
 
-            # PDF generation options - optimized for 1280x720 landscape (16:9)
-            pdf_options = {
-                'path': pdf_output_path,
-                'width': '338.67mm',  # 1280px at 96dpi = 338.67mm (landscape width)
-                'height': '190.5mm',  # 720px at 96dpi = 190.5mm (landscape height)
-                'print_background': True,  # Include background colors and images
-                'landscape': False,  # Set to false since we're manually setting dimensions
-                'margin': {
-                    'top': '0mm',
-                    'right': '0mm',
-                    'bottom': '0mm',
-                    'left': '0mm'
-                },
-                'prefer_css_page_size': False,  # Use our custom dimensions
-                'display_header_footer': False,  # No header/footer
-                'scale': 1  # No scaling
-            }
+                # 执行最终的综合页面就绪检查
+                await self._comprehensive_page_ready_check(page)
+
+                # PDF generation options - optimized for 1280x720 landscape (16:9)
+                pdf_options = {
+                    'path': pdf_output_path,
+                    'width': '338.67mm',  # 1280px at 96dpi = 338.67mm (landscape width)
+                    'height': '190.5mm',  # 720px at 96dpi = 190.5mm (landscape height)
+                    'print_background': True,  # Include background colors and images
+                    'landscape': False,  # Set to false since we're manually setting dimensions
+                    'margin': {
+                        'top': '0mm',
+                        'right': '0mm',
+                        'bottom': '0mm',
+                        'left': '0mm'
+                    },
+                    'prefer_css_page_size': False,  # Use our custom dimensions
+                    'display_header_footer': False,  # No header/footer
+                    'scale': 1  # No scaling
+                }
 
-            logger.debug(f"📑 Generating PDF with options: {pdf_options['width']} x {pdf_options['height']}")
+                logger.debug(f"📑 Generating PDF with options: {pdf_options['width']} x {pdf_options['height']}")
 
-            await page.pdf(**pdf_options)
+                await page.pdf(**pdf_options)
 
-            logger.info(f"✅ PDF generated successfully: {pdf_output_path}")
-            return True
+                logger.info(f"✅ PDF generated successfully: {pdf_output_path}")
+                return True
 
         except Exception as error:
             logger.error(f"❌ Error during PDF generation: {error}")
             return False
         finally:
-            if page:
-                await page.close()
-                logger.debug("📄 Page closed.")
+            self._finish_asset_report(asset_report)
 
     async def html_to_pdf_with_browser(self, browser: Browser, html_file_path: str,
-                                     pdf_output_path: str, options: Optional[Dict[str, Any]] = None) -> bool:
+                                     pdf_output_path: str, options: Optional[Dict[str, Any]] = None,
+                                     asset_report: Optional[AssetInterceptionReport] = None,
+                                     render_status: Optional[Dict[str, Any]] = None) -> bool:
         """
         Convert HTML file to PDF using an existing browser instance
-        More efficient for batch processing
+        More efficient for batch processing; pass ``asset_report`` to collect one
+        interception report across the whole batch, and ``render_status`` to learn whether
+        the page reached readiness before it was printed ("readiness_timed_out")
         """
         logger.info(f"🚀 Converting with shared browser: {html_file_path}")
 
@@ -1846,6 +1938,7 @@ class PlaywrightPDFConverter:
             options = {}
 
         page = None
+        owns_report = False
         try:
             # Create a new context for this conversion to ensure isolation
             context = await browser.new_context(
@@ -1855,77 +1948,30 @@ class PlaywrightPDFConverter:
                 ignore_https_errors=True
             )
             page = await context.new_page()
+            if asset_report is None:
+                asset_report = AssetInterceptionReport(f"pdf:{Path(html_file_path).name}")
+                owns_report = True
+            await self._install_asset_routing(page, asset_report)
+            await self._install_readiness_tracker(page)
 
-            # Navigate to the HTML file with comprehensive loading strategy
+            # Navigate to the HTML file; network idle is tracked by the readiness tracker
             absolute_html_path = Path(html_file_path).resolve()
             await page.goto(f"file://{absolute_html_path}",
-                          wait_until='networkidle',  # 等待网络空闲，确保所有资源加载完成
+                          wait_until='load',
                           timeout=60000)  # 适当的超时时间
 
-            # 批处理中也需要额外等待确保内容完全加载
-            await asyncio.sleep(0.8)
-
             # 等待字体和外部资源加载完成（批处理版本，时间稍短）
-            await self._wait_for_fonts_and_resources(page, max_wait_time=50000)
+            resources_ready = await self._wait_for_fonts_and_resources(page, max_wait_time=50000)
 
             # Force chart initialization after page load
             await self._force_chart_initialization(page)
 
             # Enhanced waiting for Chart.js and dynamic content rendering
-            await self._wait_for_charts_and_dynamic_content(page, max_wait_time=120000)
-
-            # Enhanced CSS injection for batch processing
-            await page.add_style_tag(content='''
-                    /* Comprehensive animation and transition disabling for PDF */
-                    *, *::before, *::after {
-                        animation-duration: 0s !important;
-                        animation-delay: 0s !important;
-                        animation-iteration-count: 1 !important;
-                        animation-play-state: paused !important;
-                        transition-property: none !important;
-                        transition-duration: 0s !important;
-                        transition-delay: 0s !important;
-                        transform-origin: center center !important;
-                    }
+            charts_ready = await self._wait_for_charts_and_dynamic_content(page, max_wait_time=120000)
+            if render_status is not None:
+                render_status["readiness_timed_out"] = not (resources_ready and charts_ready)
 
-                    /* Disable CSS animations globally */
-                    @keyframes * {
-                        0%, 100% {
-                            animation-play-state: paused !important;
-                        }
-                    }
-
-                    /* Ensure charts and canvas elements are visible */
-                    canvas, .chart-container, [id*="chart"], [class*="chart"] {
-                        opacity: 1 !important;
-                        visibility: visible !important;
-                        display: block !important;
-                        position: relative !important;
-                        transform: none !important;
-                        animation: none !important;
-                        transition: none !important;
-                    }
-
-                    @media print {
-                        * {
-                            -webkit-print-color-adjust: exact !important;
-                            print-color-adjust: exact !important;
-                        }
-                    }
-                ''')
-
-            # Inject JavaScript optimizations for batch processing
-            await page.evaluate('''() => {
-                // Force disable Chart.js animations
-                if (window.Chart && window.Chart.defaults) {
-                    if (window.Chart.defaults.global) {
-                        window.Chart.defaults.global.animation = false;
-                    }
-                    if (window.Chart.defaults.animation) {
-                        window.Chart.defaults.animation.duration = 0;
-                    }
-                }
-            }''')
+            await self._apply_batch_render_styles(page)
 
             # Perform final chart verification before PDF generation
             await self._perform_final_chart_verification(page)
@@ -1963,67 +2009,335 @@ class PlaywrightPDFConverter:
                 await page.close()
             if 'context' in locals():
                 await context.close()
+            if owns_report:
+                self._finish_asset_report(asset_report)
+
+    async def _apply_batch_render_styles(self, page: Page):
+        """Disable animations and force charts visible before printing a batch-rendered page or frame"""
+        # Enhanced CSS injection for batch processing
+        await page.add_style_tag(content='''
+                /* Comprehensive animation and transition disabling for PDF */
+                *, *::before, *::after {
+                    animation-duration: 0s !important;
+                    animation-delay: 0s !important;
+                    animation-iteration-count: 1 !important;
+                    animation-play-state: paused !important;
+                    transition-property: none !important;
+                    transition-duration: 0s !important;
+                    transition-delay: 0s !important;
+                    transform-origin: center center !important;
+                }
 
-    async def convert_multiple_html_to_pdf(self, html_files: List[str], output_dir: str,
-                                         merged_pdf_path: Optional[str] = None) -> List[str]:
+                /* Disable CSS animations globally */
+                @keyframes * {
+                    0%, 100% {
+                        animation-play-state: paused !important;
+                    }
+                }
+
+                /* Ensure charts and canvas elements are visible */
+                canvas, .chart-container, [id*="chart"], [class*="chart"] {
+                    opacity: 1 !important;
+                    visibility: visible !important;
+                    display: block !important;
+                    position: relative !important;
+                    transform: none !important;
+                    animation: none !important;
+                    transition: none !important;
+                }
+
+                @media print {
+                    * {
+                        -webkit-print-color-adjust: exact !important;
+                        print-color-adjust: exact !important;
+                    }
+                }
+            ''')
+
+        # Inject JavaScript optimizations for batch processing
+        await page.evaluate('''() => {
+            // Force disable Chart.js animations
+            if (window.Chart && window.Chart.defaults) {
+                if (window.Chart.defaults.global) {
+                    window.Chart.defaults.global.animation = false;
+                }
+                if (window.Chart.defaults.animation) {
+                    window.Chart.defaults.animation.duration = 0;
+                }
+            }
+        }''')
+
+    @staticmethod
+    def _get_page_pool_size(total_files: int) -> int:
+        """Number of slides rendered concurrently, sized by configuration or available memory"""
+        configured = app_config.pdf_render_concurrency
+        if configured > 0:
+            return max(1, min(configured, total_files))
+
+        try:
+            available_memory = os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+            by_memory = int(available_memory // PAGE_MEMORY_BUDGET)
+        except (ValueError, OSError, AttributeError):
+            # Platforms without sysconf (Windows): fall back to CPU count
+            by_memory = os.cpu_count() or 2
+        return max(1, min(by_memory, MAX_PAGE_POOL_SIZE, total_files))
+
+    def _choose_render_mode(self, total_files: int) -> str:
+        """Configured render mode, or in "auto" mode the one with the lower measured time per slide"""
+        configured = app_config.pdf_render_mode
+        if configured in (RENDER_MODE_PER_SLIDE, RENDER_MODE_SINGLE_PASS):
+            return configured
+        if total_files < 2:
+            return RENDER_MODE_PER_SLIDE
+        # Benchmark both modes on real exports of a similar size before comparing them
+        timings = self.render_mode_timings[self._batch_bucket(total_files)]
+        for mode in (RENDER_MODE_SINGLE_PASS, RENDER_MODE_PER_SLIDE):
+            if len(timings[mode]) < RENDER_MODE_MIN_SAMPLES:
+                return mode
+        return min(timings, key=lambda mode: sum(timings[mode]) / len(timings[mode]))
+
+    @staticmethod
+    def _batch_bucket(total_files: int) -> str:
+        """Label of the batch-size bucket ``total_files`` falls into (e.g. "3-8", "21+")"""
+        lower = 1
+        for upper in RENDER_MODE_BATCH_BUCKETS:
+            if total_files <= upper:
+                return f"{lower}-{upper}"
+            lower = upper + 1
+        return f"{lower}+"
+
+    def get_render_mode_stats(self) -> Dict[str, Any]:
+        """Configured render mode and the measured seconds per slide of each mode, by batch size"""
+        return {
+            "configured": app_config.pdf_render_mode,
+            "seconds_per_slide": {
+                bucket: {
+                    mode: round(sum(timings) / len(timings), 3) if timings else None
+                    for mode, timings in modes.items()
+                }
+                for bucket, modes in self.render_mode_timings.items()
+            },
+            "samples": {
+                bucket: {mode: len(timings) for mode, timings in modes.items()}
+                for bucket, modes in self.render_mode_timings.items()
+            },
+        }
+
+    async def _prepare_slide_frame(self, frame) -> bool:
+        """Bring one slide frame of the combined document to a printable state; False if it must be rendered alone"""
+        if frame is None:
+            return False
+        try:
+            resources_ready = await self._wait_for_fonts_and_resources(frame, max_wait_time=50000)
+            await self._force_chart_initialization(frame)
+            charts_ready = await self._wait_for_charts_and_dynamic_content(frame, max_wait_time=120000)
+            await self._apply_batch_render_styles(frame)
+            await self._perform_final_chart_verification(frame)
+            page_ready = await self._comprehensive_page_ready_check(frame)
+            size = await frame.evaluate('''() => ({
+                width: document.documentElement.scrollWidth,
+                height: document.documentElement.scrollHeight
+            })''')
+        except Exception as error:
+            logger.info(f"↩️ {Path(frame.url).name} 在合并文档中渲染失败: {error}")
+            return False
+
+        # A frame that never became ready (unfinished charts, pending resources) gets its own page and retries
+        if not (resources_ready and charts_ready and page_ready):
+            logger.info(f"↩️ {Path(frame.url).name} 在合并文档中未就绪，改为单页渲染")
+            return False
+
+        # Overflowing content would be clipped by the frame but paginated when rendered alone
+        if size['width'] > 1280 + SLIDE_OVERFLOW_TOLERANCE or size['height'] > 720 + SLIDE_OVERFLOW_TOLERANCE:
+            logger.info(f"↩️ {Path(frame.url).name} 内容超出页面 ({size['width']}x{size['height']})，改为单页渲染")
+            return False
+        return True
+
+    @staticmethod
+    def _render_status(asset_report: AssetInterceptionReport, readiness_timed_out: bool) -> Dict[str, Any]:
+        """Whether a render is reproducible: every asset served (cached or fetched) and readiness reached"""
+        assets_unavailable = asset_report.counts["blocked"] + asset_report.counts["failed"]
+        return {
+            "assets_unavailable": assets_unavailable,
+            "readiness_timed_out": readiness_timed_out,
+            "clean": assets_unavailable == 0 and not readiness_timed_out,
+        }
+
+    async def _render_single_pass(self, html_files: List[str], output_dir: str,
+                                  asset_report: AssetInterceptionReport,
+                                  render_status: Dict[str, Dict[str, Any]]) -> List[Optional[str]]:
         """
-        Convert multiple HTML files to PDFs and optionally merge them
-        Optimized version with shared browser instance and parallel processing
+        Load all slides into one combined document and print it with a single page.pdf() call,
+        then split the result into per-slide PDFs. Slides that fail in the combined document
+        are left as None for per-slide rendering.
         """
-        logger.info(f"🚀 Starting batch PDF conversion for {len(html_files)} files")
+        from ..utils.thread_pool import run_blocking_io
+
+        results: List[Optional[str]] = [None] * len(html_files)
+        slide_urls = [Path(html_file).resolve().as_uri() for html_file in html_files]
+        combined_html = Path(output_dir) / "__single_pass__.html"
+        combined_pdf = Path(output_dir) / "__single_pass__.pdf"
+        frames_html = "\n".join(
+            f'<iframe class="slide-frame" data-index="{index}" src="{url}"></iframe>'
+            for index, url in enumerate(slide_urls)
+        )
+        await run_blocking_io(combined_html.write_text,
+                              SINGLE_PASS_DOCUMENT.replace("__SLIDE_FRAMES__", frames_html), encoding="utf-8")
 
-        pdf_files = []
-        browser = None
+        try:
+            async with self.browser_pool.page(
+                viewport={'width': 1280, 'height': 720},
+                device_scale_factor=2,
+                ignore_https_errors=True
+            ) as page:
+                # Requests are not attributed to frames, so an unavailable asset taints every slide of the document
+                document_report = AssetInterceptionReport("single-pass", parent=asset_report)
+                await self._install_asset_routing(page, document_report)
+                await self._install_readiness_tracker(page)
+                # load waits for every slide frame
+                await page.goto(combined_html.as_uri(), wait_until='load', timeout=120000)
+
+                frames = {frame.url: frame for frame in page.frames if frame is not page.main_frame}
+                prepared = await asyncio.gather(*(self._prepare_slide_frame(frames.get(url)) for url in slide_urls))
+                printed = [index for index, ready in enumerate(prepared) if ready]
+                failed = [index for index, ready in enumerate(prepared) if not ready]
+                if failed:
+                    await page.evaluate('''indices => indices.forEach(index => {
+                        const frame = document.querySelector(`iframe[data-index="${index}"]`);
+                        if (frame) frame.remove();
+                    })''', failed)
+                if not printed:
+                    return results
+
+                await page.pdf(
+                    path=str(combined_pdf),
+                    width='338.67mm',  # 1280px at 96dpi
+                    height='190.5mm',  # 720px at 96dpi
+                    print_background=True,
+                    landscape=False,
+                    margin={'top': '0mm', 'right': '0mm', 'bottom': '0mm', 'left': '0mm'},
+                    prefer_css_page_size=False,
+                    display_header_footer=False,
+                    scale=1
+                )
+
+            slide_pdfs = [os.path.join(output_dir, f"{Path(html_files[index]).stem}.pdf") for index in printed]
+            if await run_blocking_io(self._split_pdf_sync, str(combined_pdf), slide_pdfs):
+                for index, slide_pdf in zip(printed, slide_pdfs):
+                    results[index] = slide_pdf
+                    # Printed frames passed their readiness checks
+                    render_status[html_files[index]] = self._render_status(document_report, False)
+                logger.info(f"✅ Single-pass rendering produced {len(printed)}/{len(html_files)} slides")
 
+        except Exception as error:
+            logger.error(f"❌ Single-pass rendering failed, falling back to per-slide mode: {error}")
+        finally:
+            await run_blocking_io(lambda: (combined_html.unlink(missing_ok=True), combined_pdf.unlink(missing_ok=True)))
+        return results
+
+    def _split_pdf_sync(self, pdf_path: str, output_paths: List[str]) -> bool:
+        """Write each page of ``pdf_path`` to its own file; False if the page count does not match"""
         try:
-            # Launch browser once for all conversions with enhanced chart rendering support
-            browser = await self._launch_browser()
-
-            # Process files in smaller batches to avoid memory issues
-            # Adjust batch size based on total number of files
-            batch_size = 3 if len(html_files) > 20 else 4 if len(html_files) > 10 else 5
-
-            for i in range(0, len(html_files), batch_size):
-                batch = html_files[i:i + batch_size]
-                batch_num = i // batch_size + 1
-                total_batches = (len(html_files) + batch_size - 1) // batch_size
-                logger.info(f"📦 Processing batch {batch_num}/{total_batches} ({len(batch)} files)")
-
-                # Process batch with retry mechanism
-                batch_results = []
-                for batch_index, html_file in enumerate(batch):
-                    global_index = i + batch_index
-                    base_name = Path(html_file).stem
-                    pdf_file = os.path.join(output_dir, f"{base_name}.pdf")
-
-                    logger.info(f"📄 Converting {global_index + 1}/{len(html_files)}: {html_file}")
-
-                    # Try conversion with retry mechanism
-                    success = False
-                    retry_count = 0
-                    max_retries = 5
-
-                    while not success and retry_count <= max_retries:
-                        if retry_count > 0:
-                            logger.info(f"🔄 Retry {retry_count}/{max_retries} for: {html_file}")
-                            # Wait a bit before retry
-                            await asyncio.sleep(2)
-
-                        success = await self.html_to_pdf_with_browser(browser, html_file, pdf_file)
-                        retry_count += 1
+            try:
+                from PyPDF2 import PdfReader, PdfWriter
+            except ImportError:
+                from pypdf import PdfReader, PdfWriter
+
+            reader = PdfReader(pdf_path)
+            if len(reader.pages) != len(output_paths):
+                logger.warning(f"⚠️ Combined PDF has {len(reader.pages)} pages for {len(output_paths)} slides")
+                return False
 
+            for pdf_page, output_path in zip(reader.pages, output_paths):
+                writer = PdfWriter()
+                writer.add_page(pdf_page)
+                with open(output_path, 'wb') as output_file:
+                    writer.write(output_file)
+            return True
+
+        except Exception as error:
+            logger.error(f"❌ Error splitting combined PDF: {error}")
+            return False
+
+    async def _render_per_slide(self, html_files: List[str], indices: List[int], output_dir: str,
+                                results: List[Optional[str]], asset_report: AssetInterceptionReport,
+                                render_status: Dict[str, Dict[str, Any]]):
+        """
+        Render the given slides one page.pdf() each: one pooled browser renders up to N pages
+        concurrently from a work queue, and each page is retried on its own without blocking the others
+        """
+        pool_size = self._get_page_pool_size(len(indices))
+        logger.info(f"📦 Rendering with a pool of {pool_size} concurrent pages")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for index in indices:
+            queue.put_nowait((index, html_files[index]))
+
+        async def render_worker():
+            while True:
+                try:
+                    index, html_file = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                pdf_file = os.path.join(output_dir, f"{Path(html_file).stem}.pdf")
+                logger.info(f"📄 Converting {index + 1}/{len(html_files)}: {html_file}")
+
+                for attempt in range(PAGE_MAX_RETRIES + 1):
+                    if attempt > 0:
+                        logger.info(f"🔄 Retry {attempt}/{PAGE_MAX_RETRIES} for: {html_file}")
+                        await asyncio.sleep(PAGE_RETRY_BACKOFF * attempt)
+                    slide_report = AssetInterceptionReport(f"pdf:{Path(html_file).name}", parent=asset_report)
+                    status: Dict[str, Any] = {}
+                    async with self.browser_pool.browser() as browser:
+                        success = await self.html_to_pdf_with_browser(browser, html_file, pdf_file,
+                                                                      asset_report=slide_report,
+                                                                      render_status=status)
                     if success:
-                        batch_results.append(pdf_file)
-                    else:
-                        logger.error(f"❌ Failed to convert after {max_retries} retries: {html_file}")
+                        results[index] = pdf_file
+                        render_status[html_file] = self._render_status(
+                            slide_report, status.get("readiness_timed_out", True)
+                        )
+                        break
+                else:
+                    logger.error(f"❌ Failed to convert after {PAGE_MAX_RETRIES} retries: {html_file}")
+
+        await asyncio.gather(*(render_worker() for _ in range(pool_size)))
 
-                pdf_files.extend(batch_results)
+    async def convert_multiple_html_to_pdf(self, html_files: List[str], output_dir: str,
+                                         merged_pdf_path: Optional[str] = None,
+                                         render_status: Optional[Dict[str, Dict[str, Any]]] = None) -> List[str]:
+        """
+        Convert multiple HTML files to PDFs and optionally merge them
+        Slides are printed from one combined document (single-pass) or one page each (per-slide),
+        chosen by ``pdf_render_mode``; results are kept in slide order. ``render_status``, when
+        given, is filled per produced HTML file with its blocked/failed asset count, whether readiness timed
+        out, and "clean" (neither happened), so callers only cache renders that are reproducible.
+        """
+        logger.info(f"🚀 Starting batch PDF conversion for {len(html_files)} files")
 
-                # Small delay between batches to prevent overwhelming the system
-                if i + batch_size < len(html_files):
-                    logger.info("💾 Memory cleanup between batches...")
-                    await asyncio.sleep(2)
+        asset_report = AssetInterceptionReport(f"batch:{len(html_files)} slides")
+        try:
+            mode = self._choose_render_mode(len(html_files))
+            logger.info(f"🧭 Batch render mode: {mode}")
+            start_time = time.time()
+
+            if render_status is None:
+                render_status = {}
+            results: List[Optional[str]] = [None] * len(html_files)
+            if mode == RENDER_MODE_SINGLE_PASS:
+                results = await self._render_single_pass(html_files, output_dir, asset_report, render_status)
+            pending = [index for index, pdf_file in enumerate(results) if pdf_file is None]
+            if pending:
+                if mode == RENDER_MODE_SINGLE_PASS:
+                    logger.info(f"↩️ {len(pending)} slides fall back to per-slide rendering")
+                await self._render_per_slide(html_files, pending, output_dir, results, asset_report, render_status)
+
+            if html_files:
+                self.render_mode_timings[self._batch_bucket(len(html_files))][mode].append(
+                    (time.time() - start_time) / len(html_files)
+                )
 
+            pdf_files = [pdf_file for pdf_file in results if pdf_file]
             logger.info(f"✅ Batch conversion completed. Generated {len(pdf_files)} PDF files.")
 
             # If merging is requested and we have PDFs
@@ -2052,9 +2366,7 @@ class PlaywrightPDFConverter:
             logger.error(f"❌ Error during batch PDF conversion: {error}")
             return []
         finally:
-            if browser:
-                await browser.close()
-                logger.debug("🔒 Shared browser closed.")
+            self._finish_asset_report(asset_report)
 
     def _merge_pdfs_sync(self, pdf_files: List[str], output_path: str) -> bool:
         """Synchronous PDF merging function to be run in thread pool"""
@@ -2102,14 +2414,9 @@ class PlaywrightPDFConverter:
         return await run_blocking_io(self._merge_pdfs_sync, pdf_files, output_path)
 
     async def close(self):
-        """Close the browser if it's still open"""
+        """Close the pooled browsers and stop Playwright"""
+        await self.browser_pool.close()
         async with self._browser_lock:
-            if self.context:
-                await self.context.close()
-                self.context = None
-            if self.browser:
-                await self.browser.close()
-                self.browser = None
             if self.playwright:
                 await self.playwright.stop()
                 self.playwright = None
@@ -2124,6 +2431,7 @@ class PlaywrightPDFConverter:
         wait_for_stable: bool = True,
         stability_checks: int = 3,
         stability_interval: float = 0.75,
+        render_status: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """
         Take a high-quality screenshot of an HTML file using Playwright
@@ -2133,6 +2441,10 @@ class PlaywrightPDFConverter:
             screenshot_path: Output path for screenshot
             width: Screenshot width in pixels
             height: Screenshot height in pixels
+            wait_for_stable: Require the DOM to stay unchanged for ``stability_interval``
+                seconds before capturing (``stability_checks`` is kept for compatibility)
+            render_status: Filled on success with the capture's blocked/failed asset count,
+                whether readiness timed out, and "clean" (neither happened)
 
         Returns:
             True if successful, False otherwise
@@ -2143,73 +2455,139 @@ class PlaywrightPDFConverter:
             logger.error(f"❌ HTML file not found: {html_file_path}")
             return False
 
-        page = None
+        asset_report = AssetInterceptionReport(f"screenshot:{Path(html_file_path).name}")
         try:
-            # Get or create browser
-            browser = await self._get_or_create_browser()
-            page = await self.context.new_page()
+            # Use an isolated context on a pooled browser
+            async with self.browser_pool.page(
+                viewport={'width': width, 'height': height},
+                device_scale_factor=2,
+                ignore_https_errors=True
+            ) as page:
+                ready = await self._load_for_capture(page, html_file_path, asset_report,
+                                                     wait_for_stable, stability_interval)
+
+                # Take screenshot
+                await page.screenshot(
+                    path=screenshot_path,
+                    type='png',
+                    full_page=False,
+                    clip={'x': 0, 'y': 0, 'width': width, 'height': height}
+                )
 
-            # Set viewport
-            await page.set_viewport_size({'width': width, 'height': height})
+                if render_status is not None:
+                    render_status.update(self._render_status(asset_report, not ready))
+                logger.info(f"✅ Screenshot saved: {screenshot_path}")
+                return True
 
-            # Navigate to HTML file
-            absolute_html_path = Path(html_file_path).resolve()
-            await page.goto(f"file://{absolute_html_path}",
-                          wait_until='networkidle',
-                          timeout=60000)
+        except Exception as e:
+            logger.error(f"❌ Screenshot failed: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+        finally:
+            self._finish_asset_report(asset_report)
 
-            # Wait for content to be ready (similar to PDF generation)
-            await asyncio.sleep(0.75)
+    async def _load_for_capture(self, page: Page, html_file_path: str, asset_report: AssetInterceptionReport,
+                                wait_for_stable: bool = True, stability_interval: float = 0.75) -> bool:
+        """
+        Load a slide for screenshots or layout measurement and wait until it has settled;
+        False if resources or charts did not become ready in time
+        """
+        await self._install_asset_routing(page, asset_report)
+        await self._install_readiness_tracker(page)
 
-            # Wait for fonts and resources
-            await self._wait_for_fonts_and_resources(page, max_wait_time=30000)
+        # Navigate to HTML file; network idle is tracked by the readiness tracker
+        absolute_html_path = Path(html_file_path).resolve()
+        await page.goto(f"file://{absolute_html_path}",
+                      wait_until='load',
+                      timeout=60000)
 
-            # Force chart initialization
-            await self._force_chart_initialization(page)
+        # Wait for fonts and resources
+        resources_ready = await self._wait_for_fonts_and_resources(page, max_wait_time=30000)
 
-            # Wait for charts and dynamic content
-            await self._wait_for_charts_and_dynamic_content(page, max_wait_time=60000)
+        # Force chart initialization
+        await self._force_chart_initialization(page)
 
-            if wait_for_stable:
-                last_snapshot = None
-                stable_count = 0
+        # Wait for charts and dynamic content
+        charts_ready = await self._wait_for_charts_and_dynamic_content(page, max_wait_time=60000)
 
-                while stable_count < stability_checks:
-                    layout_snapshot = await page.evaluate(
-                        "document.body ? document.body.innerHTML : ''"
-                    )
+        if wait_for_stable:
+            # DOM在整个稳定窗口内无任何变化即可截图，不再按固定间隔比较快照
+            await self._wait_for_page_ready(page, max_wait_time=10000,
+                                            quiet_period=int(stability_interval * 1000), stage="stable")
+        return resources_ready and charts_ready
 
-                    if last_snapshot is not None and layout_snapshot == last_snapshot:
-                        stable_count += 1
-                    else:
-                        stable_count = 1
-                        last_snapshot = layout_snapshot
-
-                    if stable_count < stability_checks:
-                        await asyncio.sleep(stability_interval)
-
-            # Take screenshot
-            await page.screenshot(
-                path=screenshot_path,
-                type='png',
-                full_page=False,
-                clip={'x': 0, 'y': 0, 'width': width, 'height': height}
-            )
+    async def inspect_layout(self, html_file_path: str, screenshot_path: Optional[str] = None,
+                             width: int = 1280, height: int = 720) -> Optional[Dict[str, Any]]:
+        """
+        Measure the rendered slide's layout against the canvas (see LAYOUT_INSPECTION_SCRIPT).
 
-            logger.info(f"✅ Screenshot saved: {screenshot_path}")
-            return True
+        When ``screenshot_path`` is given and problems are found, the same page is captured there,
+        so a follow-up visual inspection does not render the slide again. Returns None when the
+        slide could not be rendered or measured.
+        """
+        if not os.path.exists(html_file_path):
+            logger.error(f"❌ HTML file not found: {html_file_path}")
+            return None
+
+        asset_report = AssetInterceptionReport(f"layout:{Path(html_file_path).name}")
+        try:
+            async with self.browser_pool.page(
+                viewport={'width': width, 'height': height},
+                device_scale_factor=2,
+                ignore_https_errors=True
+            ) as page:
+                await self._load_for_capture(page, html_file_path, asset_report)
+                report = await page.evaluate(LAYOUT_INSPECTION_SCRIPT,
+                                             {'width': width, 'height': height, 'tolerance': SLIDE_OVERFLOW_TOLERANCE})
+
+                if screenshot_path and report.get('has_problems'):
+                    await page.screenshot(
+                        path=screenshot_path,
+                        type='png',
+                        full_page=False,
+                        clip={'x': 0, 'y': 0, 'width': width, 'height': height}
+                    )
+                    report['screenshot_path'] = screenshot_path
+
+                logger.info(f"📐 Layout check {Path(html_file_path).name}: {report.get('issue_count', 0)} issue(s)")
+                return report
 
         except Exception as e:
-            logger.error(f"❌ Screenshot failed: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
+            logger.error(f"❌ Layout inspection failed: {e}")
+            return None
         finally:
-            if page:
-                try:
-                    await page.close()
-                except Exception:  # noqa: BLE001
-                    logger.debug("Page already closed or closing failed, ignoring.")
+            self._finish_asset_report(asset_report)
+
+    async def screenshot_multiple_html(self, jobs: List[Tuple[str, str]], width: int = 1280, height: int = 720,
+                                       render_status: Optional[Dict[str, Dict[str, Any]]] = None) -> List[bool]:
+        """
+        Screenshot (html_file, screenshot_path) pairs concurrently on the shared page pool, in order;
+        ``render_status``, when given, is filled per captured HTML file as in ``screenshot_html``
+        """
+        semaphore = asyncio.Semaphore(self._get_page_pool_size(len(jobs)))
+
+        async def take(html_file: str, screenshot_path: str) -> bool:
+            status: Dict[str, Any] = {}
+            async with semaphore:
+                success = await self.screenshot_html(html_file, screenshot_path, width=width, height=height,
+                                                     render_status=status)
+            if success and render_status is not None:
+                render_status[html_file] = status
+            return success
+
+        return list(await asyncio.gather(*(take(html_file, screenshot_path) for html_file, screenshot_path in jobs)))
+
+    async def inspect_multiple_layouts(self, jobs: List[Tuple[str, Optional[str]]], width: int = 1280,
+                                       height: int = 720) -> List[Optional[Dict[str, Any]]]:
+        """Run inspect_layout on (html_file, screenshot_path) pairs concurrently on the shared page pool, in order"""
+        semaphore = asyncio.Semaphore(self._get_page_pool_size(len(jobs)))
+
+        async def inspect(html_file: str, screenshot_path: Optional[str]) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.inspect_layout(html_file, screenshot_path, width=width, height=height)
+
+        return list(await asyncio.gather(*(inspect(html_file, screenshot_path) for html_file, screenshot_path in jobs)))
 
 
 # Global converter instance
@@ -0,0 +1,395 @@
+"""
+Offline asset store for headless slide rendering
+
+Slides reference CDN libraries, web fonts and images. Browser requests made while exporting are
+routed through this store: known assets are served from disk, app images are read straight from
+the image cache, and anything else is fetched once and stored for next time. Fetching can be
+limited to ``render_allowed_hosts`` or disabled entirely ("offline" mode), in which case other
+requests fail immediately instead of waiting on the network. Each asset is stored with a small
+metadata file; least recently used assets are dropped beyond ``render_asset_cache_max_mb``.
+
+Seed the store ahead of time with::
+
+    python -m landppt.services.render_asset_cache --from-dir template_examples
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from ..core.config import app_config
+
+logger = logging.getLogger(__name__)
+
+# Libraries referenced by the slide prompts and bundled templates
+DEFAULT_SEED_URLS = [
+    "https://cdn.jsdelivr.net/npm/chart.js",
+    "https://cdn.jsdelivr.net/npm/echarts@5.5.0/dist/echarts.min.js",
+    "https://d3js.org/d3.v7.min.js",
+    "https://cdnjs.cloudflare.com/ajax/libs/d3/7.9.0/d3.min.js",
+    "https://cdn.tailwindcss.com",
+    "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css",
+    "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/js/all.min.js",
+    "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css",
+    "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css",
+    "https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css",
+    "https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js",
+    "https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-chtml.js",
+    "https://cdnjs.cloudflare.com/ajax/libs/prism/1.29.0/prism.min.js",
+    "https://cdnjs.cloudflare.com/ajax/libs/prism/1.29.0/themes/prism.min.css",
+]
+
+CACHEABLE_RESOURCE_TYPES = {"script", "stylesheet", "font", "image"}
+
+# Font CSS endpoints serve woff2 only to browser user agents
+BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+_ASSET_URL_PATTERN = re.compile(r"""https?://[^\s"'()<>\\]+?\.(?:js|css|woff2?|ttf|otf|png|jpe?g|gif|webp|svg)(?:\?[^\s"'()<>\\]*)?(?=[\s"'()<>\\]|$)""")
+_CDN_URL_PATTERN = re.compile(r"""https?://(?:cdn\.tailwindcss\.com|fonts\.googleapis\.com/css2?\?[^\s"'<>\\]+|cdn\.jsdelivr\.net/npm/[^\s"'<>\\/]+)(?=[\s"'<>\\]|$)""")
+_CSS_URL_PATTERN = re.compile(r"""url\(\s*['"]?([^'")]+)['"]?\s*\)""")
+_IMAGE_VIEW_PATTERN = re.compile(r"/api/image/view/([^/?#]+)")
+
+# Report at most this many URLs per outcome
+REPORT_URL_LIMIT = 20
+
+
+class AssetInterceptionReport:
+    """Outcome of every routed request of one export, screenshot or layout check"""
+
+    OUTCOMES = ("cached", "local_image", "fetched", "blocked", "failed")
+
+    def __init__(self, label: str, parent: Optional["AssetInterceptionReport"] = None):
+        self.label = label
+        # Outcomes are also counted in the parent (e.g. one slide's report within a batch)
+        self.parent = parent
+        self.started_at = time.time()
+        self.counts: Dict[str, int] = {outcome: 0 for outcome in self.OUTCOMES}
+        self.urls: Dict[str, List[str]] = {outcome: [] for outcome in ("fetched", "blocked", "failed")}
+
+    def record(self, outcome: str, url: str):
+        if self.parent is not None:
+            self.parent.record(outcome, url)
+        self.counts[outcome] += 1
+        urls = self.urls.get(outcome)
+        if urls is not None and len(urls) < REPORT_URL_LIMIT and url not in urls:
+            urls.append(url)
+
+    @property
+    def missed(self) -> int:
+        return self.counts["fetched"] + self.counts["blocked"] + self.counts["failed"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "started_at": self.started_at,
+            "intercepted": sum(self.counts.values()),
+            "missed": self.missed,
+            **self.counts,
+            "missed_urls": self.urls,
+        }
+
+
+class RenderAssetCache:
+    """Disk store of CDN libraries, fonts and images keyed by URL"""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        if cache_dir is None:
+            project_root = Path(__file__).resolve().parent.parent.parent.parent
+            cache_dir = project_root / "temp" / "render_assets_cache"
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.stats = {"stores": 0, "evictions": 0}
+        self._index: Dict[str, Dict[str, Any]] = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Rebuild the URL index from the per-asset metadata files (blocking, once at start-up)"""
+        self._migrate_legacy_index()
+        index: Dict[str, Dict[str, Any]] = {}
+        for meta_path in self.cache_dir.glob("*.json"):
+            try:
+                entry = json.loads(meta_path.read_text(encoding="utf-8"))
+                # Use is tracked in memory; after a restart the store time orders eviction
+                entry["used_at"] = (self.cache_dir / entry["file"]).stat().st_mtime
+            except (OSError, ValueError, KeyError) as e:
+                logger.debug(f"Ignoring render asset entry {meta_path.name}: {e}")
+                continue
+            index[entry["url"]] = entry
+        return index
+
+    def _migrate_legacy_index(self):
+        """Split the single index.json of earlier versions into per-asset metadata files"""
+        legacy_path = self.cache_dir / "index.json"
+        if not legacy_path.exists():
+            return
+        try:
+            legacy = json.loads(legacy_path.read_text(encoding="utf-8"))
+            for url, entry in legacy.items():
+                self._write_meta({**entry, "url": url})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Render asset index unreadable, starting empty: {e}")
+        legacy_path.unlink(missing_ok=True)
+
+    def _write_meta(self, entry: Dict[str, Any]):
+        meta_path = self.cache_dir / f"{entry['file']}.json"
+        tmp_path = meta_path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps({key: value for key, value in entry.items() if key != "used_at"},
+                                       ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(meta_path)
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    @property
+    def max_mb(self) -> int:
+        return app_config.render_asset_cache_max_mb
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """Cached entry for ``url`` with its file path, None when missing"""
+        entry = self._index.get(url)
+        if not entry:
+            return None
+        path = self.cache_dir / entry["file"]
+        if not path.exists():
+            return None
+        entry["used_at"] = time.time()
+        return {**entry, "path": str(path)}
+
+    def store(self, url: str, body: bytes, content_type: Optional[str]):
+        """Write an asset and its metadata to disk, then evict beyond the size limit (blocking)"""
+        if self.max_mb <= 0:
+            return
+        file_name = self._key(url)
+        tmp_path = self.cache_dir / f"{file_name}.{threading.get_ident()}.tmp"
+        tmp_path.write_bytes(body)
+        tmp_path.replace(self.cache_dir / file_name)
+        entry = {
+            "url": url,
+            "file": file_name,
+            "content_type": content_type or "application/octet-stream",
+            "size": len(body),
+            "stored_at": time.time(),
+        }
+        self._write_meta(entry)
+        with self._lock:
+            self._index[url] = {**entry, "used_at": entry["stored_at"]}
+        self.stats["stores"] += 1
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used assets until the store fits ``render_asset_cache_max_mb`` (blocking)"""
+        max_bytes = self.max_mb * 1024 * 1024
+        with self._lock:
+            total = sum(entry.get("size", 0) for entry in self._index.values())
+            if total <= max_bytes:
+                return
+            for entry in sorted(self._index.values(), key=lambda entry: entry.get("used_at", 0)):
+                if total <= max_bytes:
+                    break
+                self._index.pop(entry["url"], None)
+                for path in (self.cache_dir / entry["file"], self.cache_dir / f"{entry['file']}.json"):
+                    path.unlink(missing_ok=True)
+                total -= entry.get("size", 0)
+                self.stats["evictions"] += 1
+
+    def allowed_hosts(self) -> List[str]:
+        """Hosts that may be fetched on a miss in "cache_first" mode; any host unless configured"""
+        configured = app_config.render_allowed_hosts
+        if configured:
+            return [host.strip().lower() for host in configured.split(",") if host.strip()]
+        # Slides hotlink images and textures from arbitrary hosts; restricting them is opt-in
+        return ["*"]
+
+    def is_host_allowed(self, host: Optional[str]) -> bool:
+        if not host:
+            return False
+        hosts = self.allowed_hosts()
+        host = host.lower()
+        return "*" in hosts or any(host == allowed or host.endswith(f".{allowed}") for allowed in hosts)
+
+    async def _local_image_path(self, url: str) -> Optional[str]:
+        """Resolve app image URLs (/api/image/view/{id}) to the cached file on disk"""
+        match = _IMAGE_VIEW_PATTERN.search(urlparse(url).path)
+        if not match:
+            return None
+        try:
+            from .image.image_service import get_image_service
+            image_info = await get_image_service().get_image(match.group(1))
+        except Exception as e:
+            logger.debug(f"Image lookup for {url} failed: {e}")
+            return None
+        if image_info and image_info.local_path and Path(image_info.local_path).exists():
+            return image_info.local_path
+        return None
+
+    async def handle_route(self, route, report: AssetInterceptionReport):
+        """Playwright route handler: serve from disk, fetch allowed hosts, fail everything else fast"""
+        from ..utils.thread_pool import run_blocking_io
+
+        request = route.request
+        url = request.url
+        if not url.startswith(("http://", "https://")):
+            await route.continue_()
+            return
+
+        image_path = await self._local_image_path(url)
+        if image_path:
+            await route.fulfill(path=image_path)
+            report.record("local_image", url)
+            return
+
+        entry = self.lookup(url) if request.method == "GET" else None
+        if entry:
+            await route.fulfill(
+                status=200,
+                path=entry["path"],
+                content_type=entry["content_type"],
+                headers={"Access-Control-Allow-Origin": "*"}
+            )
+            report.record("cached", url)
+            return
+
+        if app_config.render_network_mode == "offline" or not self.is_host_allowed(urlparse(url).hostname):
+            await route.abort("blockedbyclient")
+            report.record("blocked", url)
+            return
+
+        try:
+            response = await route.fetch(timeout=app_config.render_fetch_timeout * 1000)
+            body = await response.body()
+        except Exception as e:
+            logger.debug(f"Render asset fetch failed for {url}: {e}")
+            await route.abort("failed")
+            report.record("failed", url)
+            return
+
+        if request.method == "GET" and response.status == 200 and request.resource_type in CACHEABLE_RESOURCE_TYPES:
+            try:
+                await run_blocking_io(self.store, url, body, response.headers.get("content-type"))
+            except Exception as e:
+                logger.warning(f"Failed to store render asset {url}: {e}")
+        await route.fulfill(response=response, body=body)
+        report.record("fetched", url)
+
+    async def seed(self, urls: Iterable[str], force: bool = False) -> Dict[str, int]:
+        """Download assets (and the fonts/images their stylesheets reference) into the store"""
+        import httpx
+        from ..utils.thread_pool import run_blocking_io
+
+        summary = {"stored": 0, "skipped": 0, "failed": 0}
+        queue = list(dict.fromkeys(urls))
+        seen = set(queue)
+        async with httpx.AsyncClient(headers={"User-Agent": BROWSER_USER_AGENT}, follow_redirects=True,
+                                     timeout=app_config.render_fetch_timeout * 3) as client:
+            while queue:
+                url = queue.pop(0)
+                if not force and self.lookup(url):
+                    summary["skipped"] += 1
+                    continue
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                except Exception as e:
+                    logger.warning(f"Seeding {url} failed: {e}")
+                    summary["failed"] += 1
+                    continue
+
+                content_type = response.headers.get("content-type", "")
+                await run_blocking_io(self.store, url, response.content, content_type)
+                summary["stored"] += 1
+                logger.info(f"Seeded {url} ({len(response.content)} bytes)")
+
+                if "text/css" in content_type:
+                    for reference in _CSS_URL_PATTERN.findall(response.text):
+                        if reference.startswith("data:"):
+                            continue
+                        asset_url = urljoin(url, reference)
+                        if asset_url not in seen:
+                            seen.add(asset_url)
+                            queue.append(asset_url)
+        return summary
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "cache_dir": str(self.cache_dir),
+            "mode": app_config.render_network_mode,
+            "entries": len(self._index),
+            "total_size": sum(entry.get("size", 0) for entry in self._index.values()),
+            "max_mb": self.max_mb,
+            **self.stats,
+            "allowed_hosts": self.allowed_hosts(),
+        }
+
+
+def collect_asset_urls(directory: Path) -> List[str]:
+    """Find script, stylesheet, font and image URLs referenced by HTML/JSON files under ``directory``"""
+    urls: List[str] = []
+    for path in directory.rglob("*"):
+        if not path.is_file() or path.suffix.lower() not in (".html", ".htm", ".json", ".css"):
+            continue
+        try:
+            text = path.read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            continue
+        urls.extend(match.group(0) for match in _ASSET_URL_PATTERN.finditer(text))
+        urls.extend(match.group(0) for match in _CDN_URL_PATTERN.finditer(text))
+    return list(dict.fromkeys(url.replace("&amp;", "&") for url in urls))
+
+
+_render_asset_cache: Optional[RenderAssetCache] = None
+
+
+def get_render_asset_cache() -> RenderAssetCache:
+    """Get the global render asset cache"""
+    global _render_asset_cache
+    if _render_asset_cache is None:
+        _render_asset_cache = RenderAssetCache()
+    return _render_asset_cache
+
+
+def main() -> int:
+    """CLI entry point: pre-seed the render asset store."""
+    parser = argparse.ArgumentParser(
+        description="Pre-seed the offline asset store used for headless slide rendering."
+    )
+    parser.add_argument("--url", action="append", default=[], help="Asset URL to store (repeatable).")
+    parser.add_argument("--from-dir", action="append", default=[],
+                        help="Scan HTML/JSON/CSS files under this directory for asset URLs (repeatable).")
+    parser.add_argument("--no-defaults", action="store_true", help="Do not include the built-in CDN libraries.")
+    parser.add_argument("--force", action="store_true", help="Re-download assets that are already stored.")
+    parser.add_argument("--log-level", default="INFO", help="Logging level (default: INFO).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO),
+                        format="%(levelname)s:%(name)s:%(message)s")
+
+    urls = [] if args.no_defaults else list(DEFAULT_SEED_URLS)
+    for directory in args.from_dir:
+        urls.extend(collect_asset_urls(Path(directory).expanduser()))
+    urls.extend(args.url)
+    if not urls:
+        print("No asset URLs to seed", file=sys.stderr)
+        return 1
+
+    cache = get_render_asset_cache()
+    summary = asyncio.run(cache.seed(urls, force=args.force))
+    print(f"Seeded {cache.cache_dir}: {summary['stored']} stored, {summary['skipped']} already present, "
+          f"{summary['failed']} failed")
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
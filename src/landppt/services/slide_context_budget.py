@@ -0,0 +1,201 @@
+"""
+Bounded deck context for per-slide generation prompts
+
+Deck context is opt-in: with ``slide_context_summary_tokens`` set, each slide prompt gets the deck's
+structure as a compact summary built once per outline and capped at that many tokens, and with
+``slide_context_neighbors`` set, that many slides on either side in full. The context a slide sees
+is therefore independent of the deck length. Both default to 0 (no deck context). Prompts
+are measured with the tiktoken tokenizer once it has been loaded off the event loop at startup
+(falling back to the governor's estimate),
+and deck context is dropped section by section until the prompt fits the role's input-token ceiling
+(``llm_role_input_token_limits``).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..ai.concurrency import estimate_tokens, parse_limit_map
+from ..core.config import ai_config
+from ..utils.thread_pool import run_blocking_io
+
+logger = logging.getLogger(__name__)
+
+# Deck summaries kept in memory (one per outline)
+SUMMARY_CACHE_MAX_ENTRIES = 64
+# Characters of a slide's key points kept in its summary line
+SUMMARY_POINTS_CHARS = 60
+
+_encoding = None
+_encoding_load_task: Optional["asyncio.Task"] = None
+
+
+def load_token_encoding() -> bool:
+    """Load the cl100k_base encoding (blocking: tiktoken downloads it on first use)"""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            # Offline installs without a cached encoding keep using the estimate
+            logger.warning(f"tiktoken unavailable, estimating prompt tokens: {e}")
+            return False
+    return True
+
+
+def schedule_token_encoding_load():
+    """Start loading the encoding in the thread pool; token counts are estimated until it is ready"""
+    global _encoding_load_task
+    if _encoding is None and _encoding_load_task is None:
+        _encoding_load_task = asyncio.get_running_loop().create_task(run_blocking_io(load_token_encoding))
+
+
+def count_tokens(text: str) -> int:
+    """Token count of ``text`` (cl100k_base), estimated until the encoding has been loaded"""
+    if not text:
+        return 0
+    # Never load the encoding here: this runs on the event loop and the first load may hit the network
+    if _encoding is None:
+        return estimate_tokens(text)
+    return len(_encoding.encode(text, disallowed_special=()))
+
+
+def _slide_points(slide: Dict[str, Any]) -> List[str]:
+    points = slide.get("content_points") or slide.get("bullet_points") or []
+    return [str(point) for point in points if point]
+
+
+class SlideContextBudgeter:
+    """Builds bounded deck context for slide prompts and fits prompts to per-role token ceilings"""
+
+    def __init__(self):
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()
+        self.stats = {"summaries_built": 0, "summary_hits": 0, "sections_dropped": 0, "over_ceiling": 0}
+
+    @staticmethod
+    def _outline_key(slides: List[Dict[str, Any]]) -> str:
+        payload = json.dumps(
+            [{"title": slide.get("title", ""), "type": slide.get("slide_type", ""), "points": _slide_points(slide)}
+             for slide in slides],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _build_summary(self, slides: List[Dict[str, Any]]) -> str:
+        budget = ai_config.slide_context_summary_tokens
+        detailed = []
+        titles = []
+        for page_number, slide in enumerate(slides, 1):
+            title = slide.get("title", "") or f"第{page_number}页"
+            titles.append(f"{page_number}. {title}")
+            points = "；".join(_slide_points(slide))
+            if len(points) > SUMMARY_POINTS_CHARS:
+                points = points[:SUMMARY_POINTS_CHARS] + "…"
+            detailed.append(f"{page_number}. {title}" + (f"：{points}" if points else ""))
+
+        # Compact in steps: titles with key points, titles only, then evenly spaced titles
+        for lines in (detailed, titles):
+            summary = "\n".join(lines)
+            if count_tokens(summary) <= budget:
+                return summary
+
+        keep = len(titles)
+        while True:
+            # Every kept title may be followed by an omission marker, so shrink until both fit
+            keep = max(2, min(keep - 1, keep * 9 // 10))
+            step = len(titles) / keep
+            kept = sorted({int(i * step) for i in range(keep)} | {len(titles) - 1})
+            lines = []
+            previous = -1
+            for index in kept:
+                if index - previous > 1:
+                    lines.append(f"…（省略{index - previous - 1}页）")
+                lines.append(titles[index])
+                previous = index
+            summary = "\n".join(lines)
+            if keep == 2 or count_tokens(summary) <= budget:
+                return summary
+
+    def deck_summary(self, slides: List[Dict[str, Any]]) -> str:
+        """Compact, token-capped outline of the whole deck, built once per outline"""
+        key = self._outline_key(slides)
+        summary = self._summaries.get(key)
+        if summary is not None:
+            self._summaries.move_to_end(key)
+            self.stats["summary_hits"] += 1
+            return summary
+
+        summary = self._build_summary(slides)
+        self._summaries[key] = summary
+        while len(self._summaries) > SUMMARY_CACHE_MAX_ENTRIES:
+            self._summaries.popitem(last=False)
+        self.stats["summaries_built"] += 1
+        logger.info(f"Built deck summary for {len(slides)} slides ({count_tokens(summary)} tokens)")
+        return summary
+
+    def slide_context(self, slides: Optional[List[Dict[str, Any]]], page_number: int) -> List[str]:
+        """Deck context sections for a slide, most important first (neighbouring slides, then the summary)"""
+        radius = max(0, ai_config.slide_context_neighbors)
+        summary_tokens = ai_config.slide_context_summary_tokens
+        if not slides or len(slides) < 2 or (radius == 0 and summary_tokens <= 0):
+            return []
+
+        sections = []
+        neighbours = []
+        for neighbour in range(page_number - radius, page_number + radius + 1):
+            if neighbour == page_number or not 1 <= neighbour <= len(slides):
+                continue
+            slide = slides[neighbour - 1]
+            label = "上一页" if neighbour < page_number else "下一页"
+            points = "\n".join(f"  - {point}" for point in _slide_points(slide))
+            neighbours.append(f"- 第{neighbour}页（{label}）：{slide.get('title', '')}" + (f"\n{points}" if points else ""))
+        if neighbours:
+            sections.append("**相邻页面内容（保持衔接，避免重复）**：\n" + "\n".join(neighbours))
+
+        summary = self.deck_summary(slides) if summary_tokens > 0 else ""
+        if summary:
+            sections.append(f"**整套演示结构（当前为第{page_number}页）**：\n{summary}")
+        return sections
+
+    def fit(self, role: str, render: Callable[[str], Tuple[str, str]], sections: List[str],
+            fixed_text: str = "") -> Tuple[str, str]:
+        """
+        Render prompt parts with as much deck context as the role's input-token ceiling allows.
+
+        ``render(deck_context)`` returns the prompt parts; ``fixed_text`` (e.g. the system prompt) is
+        counted against the ceiling too. Sections are dropped from the end until the prompt fits.
+        """
+        limit = parse_limit_map(ai_config.llm_role_input_token_limits).get(role.lower(), 0)
+        fixed_tokens = count_tokens(fixed_text)
+        sections = list(sections)
+        while True:
+            parts = render("\n\n".join(sections))
+            if limit <= 0:
+                return parts
+            tokens = fixed_tokens + sum(count_tokens(part) for part in parts)
+            if tokens <= limit:
+                return parts
+            if not sections:
+                self.stats["over_ceiling"] += 1
+                logger.warning(f"{role} prompt is {tokens} tokens without deck context, above its {limit} token ceiling")
+                return parts
+            sections.pop()
+            self.stats["sections_dropped"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"cached_summaries": len(self._summaries), **self.stats}
+
+
+_slide_context_budgeter: Optional[SlideContextBudgeter] = None
+
+
+def get_slide_context_budgeter() -> SlideContextBudgeter:
+    """Get the global slide context budgeter"""
+    global _slide_context_budgeter
+    if _slide_context_budgeter is None:
+        _slide_context_budgeter = SlideContextBudgeter()
+    return _slide_context_budgeter
@@ -0,0 +1,66 @@
+"""
+Encoding of slide screenshots for image-based PPTX export
+
+Screenshots are captured as full-resolution PNG (1280x720 at device scale 2) and re-encoded per
+export: scaled to the target DPI for the slide width and written as PNG or high-quality JPEG.
+PowerPoint does not reliably embed WebP, so a "webp" request is delivered as JPEG.
+"""
+
+import logging
+import os
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+IMAGE_FORMATS = ("png", "jpeg", "webp")
+
+
+def normalize_image_format(image_format: str) -> str:
+    """Embeddable format for a requested one; unknown formats fall back to PNG"""
+    image_format = (image_format or "png").lower()
+    if image_format in ("jpg", "jpeg", "webp"):
+        return "jpeg"
+    if image_format != "png":
+        logger.warning(f"Unsupported slide image format {image_format!r}, using PNG")
+    return "png"
+
+
+def encode_slide_image(source_path: str, output_base: str, image_format: str, quality: int,
+                       dpi: int, slide_width_inches: float) -> Tuple[str, int]:
+    """
+    Re-encode a slide screenshot (blocking); returns the written path and its size in bytes.
+
+    ``dpi`` sets the pixel width as ``slide_width_inches * dpi`` (never upscaled); 0 keeps
+    the captured resolution.
+    """
+    from PIL import Image
+
+    image_format = normalize_image_format(image_format)
+    with Image.open(source_path) as image:
+        image.load()
+        if dpi > 0:
+            target_width = int(round(slide_width_inches * dpi))
+            if target_width < image.width:
+                target_height = int(round(image.height * target_width / image.width))
+                image = image.resize((target_width, target_height), Image.LANCZOS)
+
+        save_options = {"optimize": True}
+        if dpi > 0:
+            save_options["dpi"] = (dpi, dpi)
+
+        if image_format == "jpeg":
+            if image.mode in ("RGBA", "LA", "P"):
+                rgba = image.convert("RGBA")
+                background = Image.new("RGB", rgba.size, (255, 255, 255))
+                background.paste(rgba, mask=rgba.split()[-1])
+                image = background
+            elif image.mode != "RGB":
+                image = image.convert("RGB")
+            output_path = f"{output_base}.jpg"
+            # Full chroma resolution keeps small text crisp at high quality settings
+            image.save(output_path, "JPEG", quality=quality, subsampling=0 if quality >= 90 else 2, **save_options)
+        else:
+            output_path = f"{output_base}.png"
+            image.save(output_path, "PNG", **save_options)
+
+    return output_path, os.path.getsize(output_path)
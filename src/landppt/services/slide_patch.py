@@ -0,0 +1,244 @@
+"""
+Targeted edits of slide HTML returned by the AI editor
+
+Instead of re-emitting a whole slide, the editor model can answer with a ```json block of edit
+operations (CSS selector plus a style, attribute, class, text or markup change) or a ```diff
+block with a unified diff against the current HTML. Both are applied here; any operation that
+does not apply cleanly (unknown op, selector without matches, diff context mismatch) raises
+``SlidePatchError`` so the caller can fall back to full regeneration.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EDIT_OPERATIONS = (
+    "set_style", "set_attribute", "remove_attribute", "add_class", "remove_class",
+    "replace_text", "replace_html", "insert_html", "remove",
+)
+INSERT_POSITIONS = ("beforebegin", "afterbegin", "beforeend", "afterend")
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class SlidePatchError(Exception):
+    """An edit operation or diff could not be applied to the slide"""
+
+
+def _parse_style(style: str) -> Dict[str, str]:
+    declarations: Dict[str, str] = {}
+    for declaration in style.split(";"):
+        if ":" in declaration:
+            name, value = declaration.split(":", 1)
+            if name.strip():
+                declarations[name.strip().lower()] = value.strip()
+    return declarations
+
+
+def _format_style(declarations: Dict[str, str]) -> str:
+    return "; ".join(f"{name}: {value}" for name, value in declarations.items())
+
+
+def _parse_fragment(markup: str):
+    from bs4 import BeautifulSoup
+    return list(BeautifulSoup(markup, "html.parser").contents)
+
+
+def _apply_operation(soup, operation: Dict[str, Any]):
+    op = operation.get("op")
+    selector = operation.get("selector")
+    if op not in EDIT_OPERATIONS:
+        raise SlidePatchError(f"unknown edit operation {op!r}")
+    if not selector:
+        raise SlidePatchError(f"{op} without a selector")
+
+    try:
+        elements = soup.select(selector)
+    except Exception as e:
+        raise SlidePatchError(f"invalid selector {selector!r}: {e}")
+    if not elements:
+        raise SlidePatchError(f"selector {selector!r} matched no elements")
+    if not operation.get("all", True):
+        elements = elements[:1]
+
+    replaced_text = False
+    for element in elements:
+        if op == "set_style":
+            styles = operation.get("styles")
+            if not isinstance(styles, dict):
+                raise SlidePatchError("set_style requires a styles object")
+            declarations = _parse_style(element.get("style", ""))
+            for name, value in styles.items():
+                name = name.strip().lower()
+                if value in (None, ""):
+                    declarations.pop(name, None)
+                else:
+                    declarations[name] = str(value).strip().rstrip(";")
+            if declarations:
+                element["style"] = _format_style(declarations)
+            elif element.has_attr("style"):
+                del element["style"]
+        elif op == "set_attribute":
+            if not operation.get("name"):
+                raise SlidePatchError("set_attribute requires a name")
+            element[operation["name"]] = str(operation.get("value", ""))
+        elif op == "remove_attribute":
+            if element.has_attr(operation.get("name", "")):
+                del element[operation["name"]]
+        elif op in ("add_class", "remove_class"):
+            classes = list(element.get("class", []))
+            for name in str(operation.get("value", "")).split():
+                if op == "add_class" and name not in classes:
+                    classes.append(name)
+                elif op == "remove_class" and name in classes:
+                    classes.remove(name)
+            element["class"] = classes
+        elif op == "replace_text":
+            find = operation.get("find")
+            text = str(operation.get("text", ""))
+            if find:
+                for node in element.find_all(string=True):
+                    if find in node:
+                        node.replace_with(node.replace(find, text))
+                        replaced_text = True
+            else:
+                element.string = text
+        elif op == "replace_html":
+            element.clear()
+            for node in _parse_fragment(str(operation.get("html", ""))):
+                element.append(node)
+        elif op == "insert_html":
+            position = operation.get("position", "beforeend")
+            if position not in INSERT_POSITIONS:
+                raise SlidePatchError(f"unknown insert position {position!r}")
+            nodes = _parse_fragment(str(operation.get("html", "")))
+            if position == "beforebegin":
+                for node in nodes:
+                    element.insert_before(node)
+            elif position == "afterend":
+                for node in reversed(nodes):
+                    element.insert_after(node)
+            elif position == "afterbegin":
+                for offset, node in enumerate(nodes):
+                    element.insert(offset, node)
+            else:
+                for node in nodes:
+                    element.append(node)
+        elif op == "remove":
+            element.decompose()
+
+    if op == "replace_text" and operation.get("find") and not replaced_text:
+        raise SlidePatchError(f"text {operation['find']!r} not found in {selector!r}")
+
+
+def apply_edit_operations(html: str, operations: List[Dict[str, Any]]) -> str:
+    """Apply selector-based edit operations in order, raises SlidePatchError if any fails"""
+    from bs4 import BeautifulSoup
+
+    if not operations:
+        raise SlidePatchError("no edit operations")
+    # html.parser keeps the document as written (no added wrappers), so untouched markup round-trips
+    soup = BeautifulSoup(html, "html.parser")
+    for index, operation in enumerate(operations, 1):
+        if not isinstance(operation, dict):
+            raise SlidePatchError(f"operation {index} is not an object")
+        try:
+            _apply_operation(soup, operation)
+        except SlidePatchError as e:
+            raise SlidePatchError(f"operation {index}: {e}")
+    return str(soup)
+
+
+def apply_unified_diff(html: str, diff: str) -> str:
+    """Apply a unified diff to the slide HTML, raises SlidePatchError on a context mismatch"""
+    lines = html.split("\n")
+    hunks: List[Tuple[int, List[str], List[str]]] = []
+    current = None
+    for line in diff.split("\n"):
+        header = _HUNK_HEADER.match(line)
+        if header:
+            current = (int(header.group(1)), [], [])
+            hunks.append(current)
+        elif current is None:
+            # File headers and anything else before the first hunk
+            continue
+        elif line.startswith("-"):
+            current[1].append(line[1:])
+        elif line.startswith("+"):
+            current[2].append(line[1:])
+        elif line.startswith(" ") or line == "":
+            current[1].append(line[1:])
+            current[2].append(line[1:])
+        elif line.startswith("\\"):
+            continue
+        else:
+            raise SlidePatchError(f"unexpected diff line {line[:40]!r}")
+    if not hunks:
+        raise SlidePatchError("diff has no hunks")
+
+    def matches(position: int, expected: List[str]) -> bool:
+        if position < 0 or position + len(expected) > len(lines):
+            return False
+        return all(lines[position + i].rstrip() == expected[i].rstrip() for i in range(len(expected)))
+
+    offset = 0
+    for start, old_lines, new_lines in hunks:
+        # Trailing blank context produced by the split of the diff text is not part of the hunk
+        while old_lines and new_lines and old_lines[-1] == "" and new_lines[-1] == "":
+            old_lines.pop()
+            new_lines.pop()
+        expected = max(0, start - 1 + offset)
+        # Models often get line numbers slightly wrong; search outwards from the stated position
+        position = next(
+            (candidate for distance in range(len(lines) + 1)
+             for candidate in (expected - distance, expected + distance) if matches(candidate, old_lines)),
+            None
+        )
+        if position is None:
+            raise SlidePatchError(f"hunk at line {start} does not match the slide HTML")
+        lines[position:position + len(old_lines)] = new_lines
+        offset = position - (start - 1) + len(new_lines) - len(old_lines)
+    return "\n".join(lines)
+
+
+def extract_slide_patch(response: str) -> Optional[Tuple[str, Any]]:
+    """Find an edit patch in an editor response: ("operations", list) or ("diff", text), else None"""
+    json_match = re.search(r"```json\s*(.*?)\s*```", response, re.DOTALL | re.IGNORECASE)
+    if json_match:
+        try:
+            payload = json.loads(json_match.group(1))
+        except ValueError as e:
+            raise SlidePatchError(f"edit operations are not valid JSON: {e}")
+        operations = payload.get("operations") if isinstance(payload, dict) else payload
+        if isinstance(operations, list):
+            return "operations", operations
+        raise SlidePatchError("edit operations JSON has no operations list")
+
+    diff_match = re.search(r"```(?:diff|patch)\s*(.*?)```", response, re.DOTALL | re.IGNORECASE)
+    if diff_match:
+        return "diff", diff_match.group(1)
+    return None
+
+
+def apply_slide_patch(html: str, response: str) -> Optional[str]:
+    """
+    Apply the patch contained in an editor response to ``html``.
+
+    Returns None when the response carries no patch; raises SlidePatchError when it does but
+    the patch cannot be applied.
+    """
+    patch = extract_slide_patch(response)
+    if patch is None:
+        return None
+    kind, payload = patch
+    if kind == "operations":
+        patched = apply_edit_operations(html, payload)
+    else:
+        patched = apply_unified_diff(html, payload)
+    if patched.strip() == html.strip():
+        raise SlidePatchError("patch did not change the slide")
+    logger.info(f"Applied slide {kind} patch ({len(patched) - len(html):+d} chars)")
+    return patched
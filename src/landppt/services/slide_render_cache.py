@@ -0,0 +1,132 @@
+"""
+Content-addressed caches of rendered per-slide PDFs and screenshots
+
+A slide is keyed by a hash of its normalized export HTML and the render settings, so an edited
+slide (or a change of page count, which is part of the HTML) is simply a miss and re-exports only
+render what changed. Entries live on disk and the least recently used ones are evicted once a
+store exceeds its size limit (``slide_pdf_cache_max_mb`` / ``slide_screenshot_cache_max_mb``).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..core.config import app_config
+
+logger = logging.getLogger(__name__)
+
+# Bump when the rendering pipeline changes in a way that alters the rendered output
+RENDER_VERSION = 1
+
+
+def _normalize_html(html: str) -> str:
+    # Trailing whitespace and line-ending differences do not change the rendered page
+    return "\n".join(line.rstrip() for line in html.replace("\r\n", "\n").strip().split("\n"))
+
+
+class SlideRenderCache:
+    """Disk store of single-slide renders (PDF pages, screenshots) keyed by slide content and render settings"""
+
+    def __init__(self, cache_dir: Path, extension: str, max_mb_setting: str):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.extension = extension
+        self.max_mb_setting = max_mb_setting
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    @property
+    def max_mb(self) -> int:
+        return getattr(app_config, self.max_mb_setting)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_mb > 0
+
+    @staticmethod
+    def make_key(slide_html: str, render_settings: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            {"version": RENDER_VERSION, "settings": render_settings, "html": _normalize_html(slide_html)},
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.{self.extension}"
+
+    def fetch(self, key: str, destination: str) -> bool:
+        """Copy a cached slide render to ``destination`` (blocking), False on a miss"""
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, destination)
+            # mtime doubles as the last-used time for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            self.stats["misses"] += 1
+            return False
+        self.stats["hits"] += 1
+        return True
+
+    def store(self, key: str, rendered_path: str):
+        """Add a freshly rendered slide to the cache (blocking)"""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        shutil.copyfile(rendered_path, tmp_path)
+        tmp_path.replace(path)
+        self.stats["stores"] += 1
+
+    def evict(self):
+        """Remove least recently used entries until the store fits the size limit (blocking)"""
+        max_bytes = self.max_mb * 1024 * 1024
+        with self._lock:
+            entries = []
+            total = 0
+            for path in self.cache_dir.glob(f"*.{self.extension}"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.stats["evictions"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"cache_dir": str(self.cache_dir), "max_mb": self.max_mb, **self.stats}
+
+
+_CACHE_ROOT = Path(__file__).resolve().parent.parent.parent.parent / "temp"
+
+_slide_pdf_cache: Optional[SlideRenderCache] = None
+_slide_screenshot_cache: Optional[SlideRenderCache] = None
+
+
+def get_slide_pdf_cache() -> SlideRenderCache:
+    """Get the global per-slide PDF cache"""
+    global _slide_pdf_cache
+    if _slide_pdf_cache is None:
+        _slide_pdf_cache = SlideRenderCache(_CACHE_ROOT / "slide_pdf_cache", "pdf", "slide_pdf_cache_max_mb")
+    return _slide_pdf_cache
+
+
+def get_slide_screenshot_cache() -> SlideRenderCache:
+    """Get the global per-slide screenshot cache (full-resolution PNG)"""
+    global _slide_screenshot_cache
+    if _slide_screenshot_cache is None:
+        _slide_screenshot_cache = SlideRenderCache(_CACHE_ROOT / "slide_screenshot_cache", "png",
+                                                   "slide_screenshot_cache_max_mb")
+    return _slide_screenshot_cache
@@ -0,0 +1,119 @@
+"""
+Incremental HTML validator for streamed slide generation
+
+Tracks tag balance while the model is still generating, so that a finished document can
+be cut off right after ``</html>`` and a structurally broken one can be abandoned early.
+"""
+
+from html.parser import HTMLParser
+from typing import List, Optional
+
+# Elements that never have an end tag
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+
+# Elements whose end tag may be omitted; closing them implicitly is not an error
+OPTIONAL_END_ELEMENTS = {
+    "html", "head", "body", "p", "li", "dt", "dd", "option", "optgroup", "tr", "td", "th",
+    "thead", "tbody", "tfoot", "colgroup", "caption", "rt", "rp",
+}
+
+
+class StreamingHTMLValidator(HTMLParser):
+    """Feed model output chunk by chunk and watch the HTML document structure.
+
+    Text before the first ``<!DOCTYPE`` / ``<html`` (markdown fences, preambles) is ignored.
+    ``complete`` is set once the root ``</html>`` is parsed and ``document`` then holds the
+    document up to and including that tag. ``failed`` is set when the model restarts the
+    document or produces more than ``max_structure_errors`` misnested/stray end tags.
+    """
+
+    def __init__(self, max_structure_errors: int = 3):
+        super().__init__(convert_charrefs=False)
+        self.max_structure_errors = max_structure_errors
+        self.text = ""
+        self.document: Optional[str] = None
+        self.complete = False
+        self.failed = False
+        self.errors: List[str] = []
+        self._html_start: Optional[int] = None
+        self._html_text = ""
+        self._stack: List[str] = []
+        self._html_opened = False
+        self._end_pos = None
+
+    @property
+    def finished(self) -> bool:
+        return self.complete or self.failed
+
+    def feed_chunk(self, chunk: str) -> bool:
+        """Consume a streamed chunk, returns True once reading can stop"""
+        if self.finished or not chunk:
+            return self.finished
+
+        self.text += chunk
+        if self._html_start is None:
+            lowered = self.text.lower()
+            positions = [pos for pos in (lowered.find("<!doctype"), lowered.find("<html")) if pos != -1]
+            if not positions:
+                return False
+            self._html_start = min(positions)
+            chunk = self.text[self._html_start:]
+
+        self._html_text += chunk
+        self.feed(chunk)
+
+        if self.complete and self._end_pos is not None:
+            self.document = self._html_text[:self._absolute_end(self._end_pos)]
+        return self.finished
+
+    def _absolute_end(self, position) -> int:
+        lineno, offset = position
+        lines = self._html_text.split("\n")
+        start = sum(len(line) + 1 for line in lines[:lineno - 1]) + offset
+        close = self._html_text.find(">", start)
+        return close + 1 if close != -1 else len(self._html_text)
+
+    def _error(self, message: str):
+        self.errors.append(message)
+        if len(self.errors) > self.max_structure_errors:
+            self.failed = True
+
+    def handle_decl(self, decl):
+        if self.finished:
+            return
+        if decl.lower().startswith("doctype") and self._html_opened:
+            self.errors.append("文档中再次出现<!DOCTYPE>，模型重新开始输出")
+            self.failed = True
+
+    def handle_starttag(self, tag, attrs):
+        if self.finished:
+            return
+        if tag == "html":
+            if self._html_opened:
+                self.errors.append("文档中再次出现<html>，模型重新开始输出")
+                self.failed = True
+                return
+            self._html_opened = True
+        if tag not in VOID_ELEMENTS:
+            self._stack.append(tag)
+
+    def handle_endtag(self, tag):
+        if self.finished or tag in VOID_ELEMENTS:
+            return
+        if tag not in self._stack:
+            self._error(f"多余的结束标签 </{tag}>")
+            return
+
+        while self._stack:
+            open_tag = self._stack.pop()
+            if open_tag == tag:
+                break
+            if open_tag not in OPTIONAL_END_ELEMENTS:
+                self._error(f"<{open_tag}> 未闭合即出现 </{tag}>")
+
+        if tag == "html" and not self.failed:
+            self.complete = True
+            self._end_pos = self.getpos()
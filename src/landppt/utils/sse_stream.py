@@ -0,0 +1,93 @@
+"""
+SSE流式响应的客户端断开检测
+
+生成器在独立任务中运行，响应端定期检查客户端是否断开。断开后按端点配置处理：
+``cancel``（检查点后停止）取消生成任务，取消沿任务树传播到并行页面、图片和布局修复任务，
+已逐页保存的结果保留，下次请求从断点继续；``background``（后台继续）让生成任务继续执行到结束，
+输出被丢弃，数据库写入照常完成。
+"""
+
+import asyncio
+import logging
+import re
+from typing import AsyncIterator, Dict, Set
+
+from ..core.config import ai_config
+
+logger = logging.getLogger(__name__)
+
+DISCONNECT_CANCEL = "cancel"
+DISCONNECT_BACKGROUND = "background"
+
+# 检查客户端连接状态的间隔（秒）
+DISCONNECT_POLL_INTERVAL = 1.0
+
+_DONE = object()
+
+# 后台继续执行的生成任务，保持强引用直到结束
+_background_generations: Set[asyncio.Task] = set()
+
+
+def get_disconnect_policies() -> Dict[str, str]:
+    """解析 "outline=cancel,slides=background" 形式的端点断开策略配置"""
+    policies: Dict[str, str] = {}
+    value = getattr(ai_config, "sse_disconnect_policies", None)
+    if not value:
+        return policies
+    for item in re.split(r"[,;]", value):
+        if "=" not in item:
+            continue
+        endpoint, policy = (part.strip().lower() for part in item.split("=", 1))
+        if policy in (DISCONNECT_CANCEL, DISCONNECT_BACKGROUND):
+            policies[endpoint] = policy
+        else:
+            logger.warning(f"Ignoring invalid SSE disconnect policy entry: {item!r}")
+    return policies
+
+
+def get_disconnect_policy(endpoint: str) -> str:
+    """获取端点的断开处理策略，未配置时检查点后停止"""
+    return get_disconnect_policies().get(endpoint, DISCONNECT_CANCEL)
+
+
+async def stream_until_disconnect(request, source: AsyncIterator[str], endpoint: str) -> AsyncIterator[str]:
+    """转发 ``source`` 的输出，客户端断开时按 ``endpoint`` 的策略取消或转入后台"""
+    queue: asyncio.Queue = asyncio.Queue()
+    detached = False
+
+    async def pump():
+        try:
+            async for chunk in source:
+                if not detached:
+                    queue.put_nowait(chunk)
+        finally:
+            queue.put_nowait(_DONE)
+
+    producer = asyncio.create_task(pump())
+    disconnected = False
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=DISCONNECT_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    disconnected = True
+                    break
+                continue
+            if item is _DONE:
+                break
+            yield item
+        if not disconnected:
+            # 生成器异常交由调用方处理
+            await producer
+    finally:
+        if not producer.done():
+            if get_disconnect_policy(endpoint) == DISCONNECT_BACKGROUND:
+                detached = True
+                _background_generations.add(producer)
+                producer.add_done_callback(_background_generations.discard)
+                logger.info(f"Client disconnected from {endpoint} stream, generation continues in background")
+            else:
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+                logger.info(f"Client disconnected from {endpoint} stream, generation cancelled")
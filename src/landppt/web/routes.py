@@ -25,15 +25,19 @@ from typing import Optional, Dict, Any, List
 from ..api.models import PPTGenerationRequest, PPTProject, TodoBoard, FileOutlineGenerationRequest
 from ..services.enhanced_ppt_service import EnhancedPPTService
 from ..services.pdf_to_pptx_converter import get_pdf_to_pptx_converter
-from ..services.pyppeteer_pdf_converter import get_pdf_converter
-from ..core.config import ai_config
+from ..services.pyppeteer_pdf_converter import get_pdf_converter, PDF_RENDER_SETTINGS, SCREENSHOT_RENDER_SETTINGS
+from ..services.slide_render_cache import get_slide_pdf_cache, get_slide_screenshot_cache
+from ..services.export_prerender import get_export_prerenderer
+from ..core.config import ai_config, app_config
 from ..ai import get_ai_provider, get_role_provider, AIMessage, MessageRole
 from ..auth.middleware import get_current_user_required, get_current_user_optional
 from ..database.models import User
 from ..database.database import get_db
 from sqlalchemy.orm import Session
 from ..utils.thread_pool import run_blocking_io, to_thread
+from ..utils.sse_stream import stream_until_disconnect
 import re
+from collections import Counter
 from bs4 import BeautifulSoup
 
 # Configure logger for this module
@@ -81,6 +85,7 @@ class AISlideEditRequest(BaseModel):
     images: Optional[List[Dict[str, str]]] = None  # 新增：图片信息列表
     visionEnabled: Optional[bool] = False  # 新增：视觉模式启用状态
     slideScreenshot: Optional[str] = None  # 新增：幻灯片截图数据（base64格式）
+    editMode: Optional[str] = None  # patch=返回编辑操作/差异补丁，full=返回完整HTML；默认取slide_edit_mode配置
 
 # AI要点增强请求数据模型
 class AIBulletPointEnhanceRequest(BaseModel):
@@ -128,6 +133,9 @@ class SpeechScriptExportRequest(BaseModel):
 class ImagePPTXExportRequest(BaseModel):
     slides: Optional[List[Dict[str, Any]]] = None  # 包含index, html_content, title
     images: Optional[List[Dict[str, Any]]] = None  # 包含index, data(base64), width, height (向后兼容)
+    image_format: Optional[str] = None  # png、jpeg或webp(以JPEG嵌入)，默认取配置
+    image_quality: Optional[int] = None  # JPEG质量 1-100
+    image_dpi: Optional[int] = None  # 目标DPI，0表示保留截图原始分辨率
 
 # Helper function to extract slides from HTML content
 async def _extract_slides_from_html(slides_html: str, existing_slides_data: list) -> list:
@@ -1176,6 +1184,7 @@ async def project_requirements_page(
 @router.get("/projects/{project_id}/outline-stream")
 async def stream_outline_generation(
     project_id: str,
+    request: Request,
     user: User = Depends(get_current_user_required)
 ):
     """Stream outline generation for a project"""
@@ -1193,7 +1202,7 @@ async def stream_outline_generation(
                 error_response = {'error': str(e)}
                 yield f"data: {json.dumps(error_response)}\n\n"
 
-        return StreamingResponse(generate(), media_type="text/plain")
+        return StreamingResponse(stream_until_disconnect(request, generate(), "outline"), media_type="text/plain")
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2060,6 +2069,7 @@ async def update_project_slides(
 
             if save_success:
                 logger.info(f"Successfully saved updated slides data to database for project {project_id}")
+                get_export_prerenderer().schedule(project_id)
             else:
                 logger.error(f"Failed to save updated slides data to database for project {project_id}")
                 save_error_message = "Failed to save slides data to database"
@@ -2185,7 +2195,8 @@ async def regenerate_slide(project_id: str, slide_number: int):
         if selected_template:
             logger.info(f"Regenerating slide {slide_number} using template: {selected_template['template_name']}")
             new_html_content = await ppt_service._generate_slide_with_template(
-                slide_data, selected_template, slide_number, len(slides), project.confirmed_requirements
+                slide_data, selected_template, slide_number, len(slides), project.confirmed_requirements,
+                all_slides=slides
             )
         else:
             # Fallback to original generation method if no template available
@@ -2262,6 +2273,7 @@ async def regenerate_slide(project_id: str, slide_number: int):
                     "slides_html": project.slides_html,
                     "updated_at": project.updated_at
                 })
+                get_export_prerenderer().schedule(project_id)
             else:
                 logger.error(f"Failed to save regenerated slide {slide_number} to database for project {project_id}")
 
@@ -2379,6 +2391,81 @@ async def auto_repair_layout(
         logger.error(f"Auto layout repair failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+# 补丁编辑模式的输出要求：小改动只返回编辑操作，避免模型重新输出整页HTML
+SLIDE_EDIT_PATCH_INSTRUCTIONS = """
+请根据用户的要求和幻灯片大纲信息，先用一两句话说明你的理解和修改方案，然后只输出修改部分：
+
+- 局部修改（颜色、字号、文字、属性、增删个别元素等）：输出一个 ```json 代码块，格式为
+  {"operations": [{"op": "...", "selector": "CSS选择器", ...}]}
+  支持的操作：
+  * set_style：{"styles": {"color": "#e53935"}}，值为空字符串表示删除该样式
+  * set_attribute / remove_attribute：{"name": "src", "value": "..."}
+  * add_class / remove_class：{"value": "类名1 类名2"}
+  * replace_text：{"text": "新文字"} 替换元素全部文字；或 {"find": "原文字", "text": "新文字"} 只替换其中一段
+  * replace_html：{"html": "..."} 替换元素内部HTML
+  * insert_html：{"position": "beforebegin|afterbegin|beforeend|afterend", "html": "..."}
+  * remove：删除元素
+  选择器必须能在当前HTML中精确匹配到目标元素，默认作用于所有匹配元素，只改第一个时加 "all": false
+- 也可以输出一个 ```diff 代码块，内容为针对当前HTML的unified diff
+- 只有需要大幅重写布局或整体风格时，才输出修改后的完整HTML（```html 代码块）
+"""
+
+
+def _slide_edit_patch_mode(request: AISlideEditRequest) -> bool:
+    return (request.editMode or ai_config.slide_edit_mode) == "patch"
+
+
+def _extract_edit_html(ai_response: str) -> Optional[str]:
+    """从AI回复中提取完整HTML代码，支持多种代码块格式"""
+    html_patterns = [
+        r'```html\s*(.*?)\s*```',  # 标准格式
+        r'```HTML\s*(.*?)\s*```',  # 大写
+        r'```\s*html\s*(.*?)\s*```',  # 带空格
+        r'<html[^>]*>.*?</html>',  # 完整HTML文档
+        r'<div[^>]*style[^>]*>.*?</div>',  # PPT幻灯片div
+    ]
+
+    for pattern in html_patterns:
+        html_match = re.search(pattern, ai_response, re.DOTALL | re.IGNORECASE)
+        if html_match:
+            new_html_content = html_match.group(1).strip() if html_match.groups() else html_match.group(0).strip()
+            logger.info(f"HTML内容提取成功，使用模式: {pattern}，内容长度: {len(new_html_content)}")
+            return new_html_content
+    return None
+
+
+_HTML_ERROR_POSITION = re.compile(r"\s*\(<string>, line \d+\)|,?\s*line \d+(?:,\s*column \d+)?", re.IGNORECASE)
+
+
+def _apply_edit_patch(original_html: str, ai_response: str) -> Optional[str]:
+    """
+    应用AI回复中的编辑补丁并校验结果
+
+    回复中没有补丁时返回None；补丁无法应用或应用后引入新的HTML结构错误时抛出SlidePatchError，
+    由调用方回退到完整HTML重新生成。
+    """
+    from ..services.slide_patch import SlidePatchError, apply_slide_patch
+
+    patched_html = apply_slide_patch(original_html, ai_response)
+    if patched_html is None:
+        return None
+
+    # 补丁会移动已有错误的行列号，按去掉位置信息后的错误计数比较，只拒绝补丁新引入的错误
+    original_errors = Counter(
+        _HTML_ERROR_POSITION.sub("", error) for error in ppt_service._validate_html_completeness(original_html)['errors']
+    )
+    new_errors = []
+    for error in ppt_service._validate_html_completeness(patched_html)['errors']:
+        key = _HTML_ERROR_POSITION.sub("", error)
+        if original_errors[key] > 0:
+            original_errors[key] -= 1
+        else:
+            new_errors.append(error)
+    if new_errors:
+        raise SlidePatchError(f"patched HTML failed validation: {'; '.join(new_errors)}")
+    return patched_html
+
+
 @router.post("/api/ai/slide-edit")
 async def ai_slide_edit(
     request: AISlideEditRequest,
@@ -2413,18 +2500,20 @@ async def ai_slide_edit(
 
 当前幻灯片的HTML内容：
 {request.slideContent}
-
-请根据用户的要求和幻灯片大纲信息，提供以下内容：
-1. 对用户要求的理解和分析
-2. 具体的修改建议
-3. 如果需要，提供修改后的完整HTML代码
-
+{{instructions}}
 注意事项：
 - 确保修改后的内容符合PPT演示的专业标准和大纲要求
 - 生成的HTML应该是完整的，包含必要的CSS样式
 - 保持1280x720的PPT标准尺寸
 - 参考大纲信息中的要点和描述来优化内容
 """
+        full_instructions = """
+请根据用户的要求和幻灯片大纲信息，提供以下内容：
+1. 对用户要求的理解和分析
+2. 具体的修改建议
+3. 如果需要，提供修改后的完整HTML代码
+"""
+        patch_mode = _slide_edit_patch_mode(request)
 
         # 构建AI消息，包含对话历史
         messages = [
@@ -2442,23 +2531,36 @@ async def ai_slide_edit(
         else:
             logger.debug("AI编辑未接收到对话历史")
 
-        # 添加当前用户请求
-        messages.append(AIMessage(role=MessageRole.USER, content=context))
+        async def complete(instructions: str) -> str:
+            request_messages = messages + [
+                AIMessage(role=MessageRole.USER, content=context.replace("{instructions}", instructions))
+            ]
+            response = await provider.chat_completion(
+                messages=request_messages,
+                max_tokens=ai_config.max_tokens,
+                temperature=0.7,
+                model=settings.get('model')
+            )
+            return response.content
 
         # 调用AI生成回复
-        response = await provider.chat_completion(
-            messages=messages,
-            max_tokens=ai_config.max_tokens,
-            temperature=0.7,
-            model=settings.get('model')
-        )
+        ai_response = await complete(SLIDE_EDIT_PATCH_INSTRUCTIONS if patch_mode else full_instructions)
 
-        ai_response = response.content
+        new_html_content = None
+        edit_method = "full"
+        if patch_mode:
+            from ..services.slide_patch import SlidePatchError
+            try:
+                new_html_content = _apply_edit_patch(request.slideContent, ai_response)
+                if new_html_content is not None:
+                    edit_method = "patch"
+            except SlidePatchError as patch_error:
+                # 补丁无法应用时回退到完整HTML重新生成
+                logger.warning(f"AI编辑补丁应用失败，回退到完整HTML生成: {patch_error}")
+                ai_response = await complete(full_instructions)
 
         # 检查是否包含HTML代码
-        new_html_content = None
-        if "```html" in ai_response:
-            import re
+        if new_html_content is None and "```html" in ai_response:
             html_match = re.search(r'```html\s*(.*?)\s*```', ai_response, re.DOTALL)
             if html_match:
                 new_html_content = html_match.group(1).strip()
@@ -2466,7 +2568,8 @@ async def ai_slide_edit(
         return {
             "success": True,
             "response": ai_response,
-            "newHtmlContent": new_html_content
+            "newHtmlContent": new_html_content,
+            "editMethod": edit_method
         }
 
     except Exception as e:
@@ -2480,6 +2583,7 @@ async def ai_slide_edit(
 @router.post("/api/ai/slide-edit/stream")
 async def ai_slide_edit_stream(
     request: AISlideEditRequest,
+    http_request: Request,
     user: User = Depends(get_current_user_required)
 ):
     """AI编辑幻灯片流式接口"""
@@ -2536,12 +2640,7 @@ async def ai_slide_edit_stream(
 
 当前幻灯片的HTML内容：
 {request.slideContent}
-
-请根据用户的要求和幻灯片大纲信息，提供以下内容：
-1. 对用户要求的理解和分析
-2. 具体的修改建议
-3. 默认提供修改后的完整HTML代码
-
+{{instructions}}
 注意事项：
 - 保持原有的设计风格和布局结构
 - 确保修改后的内容符合PPT演示的专业标准和大纲要求
@@ -2550,6 +2649,13 @@ async def ai_slide_edit_stream(
 - 保持1280x720的PPT标准尺寸
 - 参考大纲信息中的要点和描述来优化内容
 """
+        full_instructions = """
+请根据用户的要求和幻灯片大纲信息，提供以下内容：
+1. 对用户要求的理解和分析
+2. 具体的修改建议
+3. 默认提供修改后的完整HTML代码
+"""
+        patch_mode = _slide_edit_patch_mode(request)
 
         # 构建AI消息，包含对话历史
         messages = [
@@ -2567,80 +2673,88 @@ async def ai_slide_edit_stream(
         else:
             logger.info("AI流式编辑未接收到对话历史")
 
-        # 添加当前用户请求（支持多模态内容）
-        if request.visionEnabled and request.slideScreenshot:
-            # 创建多模态消息，包含文本和图片
-            from ..ai.base import TextContent, ImageContent
-            user_content = [
-                TextContent(text=context),
-                ImageContent(image_url={"url": request.slideScreenshot})
-            ]
-            messages.append(AIMessage(role=MessageRole.USER, content=user_content))
-        else:
+        def build_messages(instructions: str) -> List[AIMessage]:
+            user_context = context.replace("{instructions}", instructions)
+            # 添加当前用户请求（支持多模态内容）
+            if request.visionEnabled and request.slideScreenshot:
+                # 创建多模态消息，包含文本和图片
+                from ..ai.base import TextContent, ImageContent
+                user_content = [
+                    TextContent(text=user_context),
+                    ImageContent(image_url={"url": request.slideScreenshot})
+                ]
+                return messages + [AIMessage(role=MessageRole.USER, content=user_content)]
             # 普通文本消息
-            messages.append(AIMessage(role=MessageRole.USER, content=context))
+            return messages + [AIMessage(role=MessageRole.USER, content=user_context)]
+
+        async def stream_completion(request_messages: List[AIMessage]):
+            # 流式生成AI回复
+            if hasattr(provider, 'stream_chat_completion'):
+                async for chunk in provider.stream_chat_completion(
+                    messages=request_messages,
+                    max_tokens=ai_config.max_tokens,
+                    temperature=0.7,
+                    model=settings.get('model')
+                ):
+                    if chunk:
+                        yield chunk
+            else:
+                response = await provider.chat_completion(
+                    messages=request_messages,
+                    max_tokens=ai_config.max_tokens,
+                    temperature=0.7,
+                    model=settings.get('model')
+                )
+                if response.content:
+                    yield response.content
 
         async def generate_ai_stream():
             try:
                 # 发送开始信号
                 yield f"data: {json.dumps({'type': 'start', 'content': ''})}\n\n"
 
-                # 流式生成AI回复
                 full_response = ""
-                if hasattr(provider, 'stream_chat_completion'):
-                    async for chunk in provider.stream_chat_completion(
-                        messages=messages,
-                        max_tokens=ai_config.max_tokens,
-                        temperature=0.7,
-                        model=settings.get('model')
-                    ):
-                        if chunk:
+                async for chunk in stream_completion(
+                    build_messages(SLIDE_EDIT_PATCH_INSTRUCTIONS if patch_mode else full_instructions)
+                ):
+                    full_response += chunk
+                    yield f"data: {json.dumps({'type': 'content', 'content': chunk})}\n\n"
+
+                new_html_content = None
+                edit_method = "full"
+                if patch_mode:
+                    from ..services.slide_patch import SlidePatchError
+                    try:
+                        new_html_content = _apply_edit_patch(request.slideContent, full_response)
+                        if new_html_content is not None:
+                            edit_method = "patch"
+                    except SlidePatchError as patch_error:
+                        # 补丁无法应用时回退到完整HTML重新生成，继续以流式输出
+                        logger.warning(f"AI编辑补丁应用失败，回退到完整HTML生成: {patch_error}")
+                        notice = "\n\n（修改补丁无法直接应用，正在生成完整的HTML…）\n\n"
+                        full_response += notice
+                        yield f"data: {json.dumps({'type': 'content', 'content': notice})}\n\n"
+                        async for chunk in stream_completion(build_messages(full_instructions)):
                             full_response += chunk
                             yield f"data: {json.dumps({'type': 'content', 'content': chunk})}\n\n"
-                else:
-                    response = await provider.chat_completion(
-                        messages=messages,
-                        max_tokens=ai_config.max_tokens,
-                        temperature=0.7,
-                        model=settings.get('model')
-                    )
-                    if response.content:
-                        full_response = response.content
-                        yield f"data: {json.dumps({'type': 'content', 'content': response.content})}\n\n"
 
                 # 检查是否包含HTML代码 - 改进版本，支持多种格式
-                new_html_content = None
-                import re
-                
-                # 尝试多种HTML代码块格式
-                html_patterns = [
-                    r'```html\s*(.*?)\s*```',  # 标准格式
-                    r'```HTML\s*(.*?)\s*```',  # 大写
-                    r'```\s*html\s*(.*?)\s*```',  # 带空格
-                    r'<html[^>]*>.*?</html>',  # 完整HTML文档
-                    r'<div[^>]*style[^>]*>.*?</div>',  # PPT幻灯片div
-                ]
-                
-                for pattern in html_patterns:
-                    html_match = re.search(pattern, full_response, re.DOTALL | re.IGNORECASE)
-                    if html_match:
-                        new_html_content = html_match.group(1).strip() if html_match.groups() else html_match.group(0).strip()
-                        logger.info(f"HTML内容提取成功，使用模式: {pattern}，内容长度: {len(new_html_content)}")
-                        break
-                
+                if new_html_content is None:
+                    new_html_content = _extract_edit_html(full_response)
+
                 if not new_html_content:
                     logger.warning(f"未能从AI响应中提取HTML内容。响应长度: {len(full_response)}")
                     logger.debug(f"AI完整响应: {full_response[:500]}...")
 
                 # 发送完成信号
-                yield f"data: {json.dumps({'type': 'complete', 'content': '', 'newHtmlContent': new_html_content, 'fullResponse': full_response})}\n\n"
+                yield f"data: {json.dumps({'type': 'complete', 'content': '', 'newHtmlContent': new_html_content, 'fullResponse': full_response, 'editMethod': edit_method})}\n\n"
 
             except Exception as e:
                 logger.error(f"AI流式编辑请求失败: {e}")
                 yield f"data: {json.dumps({'type': 'error', 'content': '', 'error': str(e)})}\n\n"
 
         return StreamingResponse(
-            generate_ai_stream(),
+            stream_until_disconnect(http_request, generate_ai_stream(), "slide_edit"),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
@@ -3402,131 +3516,67 @@ async def ai_enhance_all_bullet_points(
     request: AIBulletPointEnhanceRequest,
     user: User = Depends(get_current_user_required)
 ):
-    """AI增强所有要点接口"""
-    try:
-        # 获取AI提供者
-        provider, settings = get_role_provider("outline")
-
-        # 构建上下文信息
-        context_info = ""
-        all_points = []
-        if request.contextInfo:
-            all_points = request.contextInfo.get('allBulletPoints', [])
-            total_points = request.contextInfo.get('totalPoints', 0)
-
-            context_info = f"""
-当前要点上下文信息：
-- 要点总数：{total_points}个
-- 所有要点内容：
-"""
-            for i, point in enumerate(all_points, 1):
-                context_info += f"  {i}. {point}\n"
-
-        # 构建大纲信息
-        outline_info = ""
-        if request.slideOutline:
-            outline_info = f"""
-当前幻灯片大纲信息：
-- 幻灯片类型：{request.slideOutline.get('slide_type', '未知')}
-- 描述：{request.slideOutline.get('description', '无')}
-"""
-
-        # 构建AI增强提示词
-        context = f"""
-请对以下PPT要点进行增强和优化。
-
-项目背景：
-- 项目：{request.projectInfo.get('title', '未知')}
-- 主题：{request.projectInfo.get('topic', '未知')}
-- 场景：{request.projectInfo.get('scenario', '未知')}
-- 幻灯片：{request.slideTitle}（第{request.slideIndex}页）
-
-{outline_info}
-
-{context_info}
-
-增强要求：
-1. 保持每个要点的核心意思不变
-2. 添加具体细节、数据或例子
-3. 使用更专业、准确的表达
-4. 保持简洁，避免冗长
-5. 确保要点间逻辑连贯、风格统一
-6. 符合{request.projectInfo.get('scenario', '商务')}场景的专业要求
-
-重要：请直接返回增强后的要点列表，每行一个要点，不要包含任何解释、开场白或格式说明。不要添加编号、符号或其他标记。
-
-示例格式：
-第一个增强后的要点内容
-第二个增强后的要点内容
-第三个增强后的要点内容
-"""
-
-        # 调用AI生成增强内容
-        response = await provider.text_completion(
-            prompt=context,
-            max_tokens=ai_config.max_tokens,  # 使用完整的token限制，因为要处理多个要点
-            temperature=0.7,
-            model=settings.get('model')
-        )
+    """
+    AI增强所有要点接口
 
-        enhanced_content = response.content.strip()
-
-        # 解析增强后的要点 - 改进的过滤逻辑
-        enhanced_points = []
-        if enhanced_content:
-            # 按行分割，过滤空行
-            lines = [line.strip() for line in enhanced_content.split('\n') if line.strip()]
-
-            # 过滤掉常见的无关内容
-            filtered_lines = []
-            skip_patterns = [
-                '好的', '作为', '我将', '我会', '以下是', '根据', '请注意', '需要说明',
-                '增强后的要点', '优化后的', '改进后的', '以上', '总结', '希望',
-                '如有', '如果', '建议', '推荐', '注意', '提醒', '说明',
-                '要点1', '要点2', '要点3', '要点4', '要点5',
-                '第一', '第二', '第三', '第四', '第五', '第六', '第七', '第八', '第九', '第十',
-                '1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.', '10.',
-                '•', '·', '-', '*', '→', '▪', '▫'
+    contextInfo.allBulletPoints 为当前页的要点；传入 contextInfo.slides（[{slideIndex, title, points}]）
+    时一次增强多页或整份大纲的要点，要点按token预算分批并发请求，结果按要点编号映射回各页
+    """
+    try:
+        from ..services.bullet_point_enhancer import SlideBullets, get_bullet_point_enhancer, make_item_id
+
+        context_info = request.contextInfo or {}
+        if context_info.get('slides'):
+            slides = [
+                SlideBullets(
+                    slide_index=int(slide.get('slideIndex', index)),
+                    title=slide.get('title', ''),
+                    points=[str(point) for point in (slide.get('points') or slide.get('content_points') or [])],
+                    slide_type=slide.get('slide_type', ''),
+                    description=slide.get('description', '')
+                )
+                for index, slide in enumerate(context_info['slides'], 1)
             ]
+            if len({slide.slide_index for slide in slides}) != len(slides):
+                raise ValueError("slides 中的 slideIndex 不能重复")
+        else:
+            outline = request.slideOutline or {}
+            slides = [SlideBullets(
+                slide_index=request.slideIndex,
+                title=request.slideTitle,
+                points=[str(point) for point in context_info.get('allBulletPoints', [])],
+                slide_type=outline.get('slide_type', ''),
+                description=outline.get('description', '')
+            )]
+
+        if not any(point.strip() for slide in slides for point in slide.points):
+            raise ValueError("没有可增强的要点内容")
+
+        results, failed = await get_bullet_point_enhancer().enhance(slides, request.projectInfo, request.userRequest)
+        if len(failed) == len(results):
+            raise ValueError("AI生成的增强内容为空或无效")
+
+        # 未能增强的要点保留原文，结果与原始要点一一对应
+        slide_results = [
+            {
+                "slideIndex": slide.slide_index,
+                "originalPoints": slide.points,
+                "enhancedPoints": [results.get(make_item_id(slide.slide_index, index), point)
+                                   for index, point in enumerate(slide.points)]
+            }
+            for slide in slides
+        ]
 
-            for line in lines:
-                # 跳过过短的行（可能是格式标记）
-                if len(line) < 5:
-                    continue
-
-                # 跳过包含常见开场白模式的行
-                should_skip = False
-                for pattern in skip_patterns:
-                    if line.startswith(pattern) or (pattern in ['好的', '作为', '我将', '我会'] and pattern in line[:10]):
-                        should_skip = True
-                        break
-
-                # 跳过纯数字或符号开头的行（可能是编号）
-                if line[0].isdigit() or line[0] in ['•', '·', '-', '*', '→', '▪', '▫']:
-                    # 但保留去掉编号后的内容
-                    cleaned_line = line
-                    # 移除开头的编号和符号
-                    import re
-                    cleaned_line = re.sub(r'^[\d\s\.\-\*\•\·\→\▪\▫]+', '', cleaned_line).strip()
-                    if len(cleaned_line) >= 5:
-                        filtered_lines.append(cleaned_line)
-                    continue
-
-                if not should_skip:
-                    filtered_lines.append(line)
-
-            enhanced_points = filtered_lines
-
-        # 简单的内容验证
-        if not enhanced_points or len(enhanced_points) == 0:
-            raise ValueError("AI生成的增强内容为空或被过滤")
-
-        return {
+        response = {
             "success": True,
-            "enhancedPoints": enhanced_points,
-            "originalPoints": all_points,
-            "totalEnhanced": len(enhanced_points)
+            "enhancedPoints": slide_results[0]["enhancedPoints"],
+            "originalPoints": slide_results[0]["originalPoints"],
+            "totalEnhanced": len(results) - len(failed),
+            "failedPoints": [item.id for item in failed]
         }
+        if context_info.get('slides'):
+            response["slides"] = slide_results
+        return response
 
     except Exception as e:
         logger.error(f"AI增强所有要点请求失败: {e}")
@@ -4273,6 +4323,7 @@ async def save_single_slide_content(
 
             if save_success:
                 logger.debug(f"✅ 第 {slide_index + 1} 页已成功保存到数据库")
+                get_export_prerenderer().schedule(project_id)
 
                 return {
                     "success": True,
@@ -4311,7 +4362,7 @@ async def save_single_slide_content(
         }
 
 @router.get("/api/projects/{project_id}/slides/stream")
-async def stream_slides_generation(project_id: str):
+async def stream_slides_generation(project_id: str, request: Request):
     """Stream slides generation process"""
     try:
         async def generate_slides_stream():
@@ -4319,7 +4370,7 @@ async def stream_slides_generation(project_id: str):
                 yield chunk
 
         return StreamingResponse(
-            generate_slides_stream(),
+            stream_until_disconnect(request, generate_slides_stream(), "slides"),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
@@ -4361,6 +4412,8 @@ async def cleanup_excess_slides(
         deleted_count = await db_manager.cleanup_excess_slides(project_id, current_slide_count)
 
         logger.info(f"✅ 项目 {project_id} 清理完成，删除了 {deleted_count} 张多余的幻灯片")
+        if deleted_count:
+            get_export_prerenderer().schedule(project_id)
 
         return {
             "success": True,
@@ -4424,6 +4477,7 @@ async def batch_save_slides(
                 "slides_data": project.slides_data,
                 "updated_at": project.updated_at
             })
+            get_export_prerenderer().schedule(project_id)
 
         logger.debug(f"✅ 项目 {project_id} 批量保存完成，共 {len(slides_data)} 张幻灯片")
 
@@ -4465,8 +4519,12 @@ async def export_project_pdf(project_id: str, individual: bool = False):
             lambda: tempfile.NamedTemporaryFile(suffix='.pdf', delete=False).name
         )
 
-        logging.info("Generating PDF with Pyppeteer")
-        success = await _generate_pdf_with_pyppeteer(project, temp_pdf_path, individual)
+        prerenderer = get_export_prerenderer()
+        success = await prerenderer.fetch_artifact(project, "pdf", temp_pdf_path)
+        if not success:
+            logging.info("Generating PDF with Pyppeteer")
+            async with prerenderer.interactive():
+                success = await _generate_pdf_with_pyppeteer(project, temp_pdf_path, individual)
 
         if not success:
             # Clean up temp file and raise error
@@ -4539,7 +4597,11 @@ async def export_project_pptx(project_id: str):
             temp_pdf_path = temp_pdf_file.name
 
         logging.info("Step 1: Generating PDF for PPTX conversion")
-        pdf_success = await _generate_pdf_with_pyppeteer(project, temp_pdf_path, individual=False)
+        prerenderer = get_export_prerenderer()
+        pdf_success = await prerenderer.fetch_artifact(project, "pdf", temp_pdf_path)
+        if not pdf_success:
+            async with prerenderer.interactive():
+                pdf_success = await _generate_pdf_with_pyppeteer(project, temp_pdf_path, individual=False)
 
         if not pdf_success:
             # Clean up temp file and raise error
@@ -4562,43 +4624,26 @@ async def export_project_pptx(project_id: str):
 
         # 定义转换任务函数
         async def pdf_to_pptx_task():
-            """PDF to PPTX conversion task (runs in subprocess)."""
+            """PDF to PPTX conversion task (page ranges run in parallel worker processes)."""
             try:
-                success, result = await converter.convert_pdf_to_pptx_async(
+                # 演讲稿在合并步骤中写入幻灯片备注
+                speech_scripts = {}
+                try:
+                    from ..services.speech_script_repository import SpeechScriptRepository
+
+                    repo = SpeechScriptRepository()
+                    scripts_list = await repo.get_current_speech_scripts_by_project(project_id)
+                    speech_scripts = {script.slide_index: script.script_content for script in scripts_list}
+                    repo.close()
+                except Exception as e:
+                    logging.warning(f"Failed to load speech scripts for PPTX notes: {e}")
+
+                success, result = await converter.convert_pdf_to_pptx_parallel_async(
                     temp_pdf_path,
-                    temp_pptx_path
+                    temp_pptx_path,
+                    notes=speech_scripts
                 )
                 if success:
-                    # 转换成功后，添加演讲稿到备注
-                    try:
-                        from pptx import Presentation
-                        from ..services.speech_script_repository import SpeechScriptRepository
-
-                        # 获取演讲稿数据
-                        repo = SpeechScriptRepository()
-                        scripts_list = await repo.get_current_speech_scripts_by_project(project_id)
-                        speech_scripts = {script.slide_index: script.script_content for script in scripts_list}
-                        repo.close()
-
-                        if len(speech_scripts) > 0:
-                            # 打开生成的PPTX文件
-                            prs = Presentation(temp_pptx_path)
-
-                            # 为每张幻灯片添加演讲稿备注
-                            for i, slide in enumerate(prs.slides):
-                                if i in speech_scripts:
-                                    notes_slide = slide.notes_slide
-                                    text_frame = notes_slide.notes_text_frame
-                                    text_frame.text = speech_scripts[i]
-                                    logging.info(f"Added speech script to slide {i+1} notes")
-
-                            # 保存修改后的PPTX
-                            prs.save(temp_pptx_path)
-                            logging.info(f"Added {len(speech_scripts)} speech scripts to PPTX notes")
-                    except Exception as e:
-                        logging.warning(f"Failed to add speech scripts to PPTX: {e}")
-                        # 继续执行，即使添加演讲稿失败也返回PPTX
-
                     return {
                         "success": True,
                         "pptx_path": temp_pptx_path,
@@ -4698,66 +4743,90 @@ async def export_project_pptx_from_images(project_id: str, request: ImagePPTXExp
                     logging.warning(f"Failed to load speech scripts: {e}")
                     # 继续执行，即使没有演讲稿也可以生成PPTX
 
-                # 第2步：为每张幻灯片创建临时HTML文件
-                html_files = []
-                for i, slide in enumerate(slides):
-                    html_file = os.path.join(temp_dir, f"slide_{i}.html")
-                    with open(html_file, 'w', encoding='utf-8') as f:
-                        f.write(slide['html_content'])
-                    html_files.append(html_file)
+                # 第2步：命中截图缓存的幻灯片直接复用，其余写出临时HTML文件
+                def write_html_file(content, path):
+                    with open(path, 'w', encoding='utf-8') as f:
+                        f.write(content)
 
-                # 第3步：使用Playwright对每张幻灯片进行截图
-                for i, html_file in enumerate(html_files):
+                screenshot_cache = get_slide_screenshot_cache()
+                screenshot_paths = [None] * len(slides)
+                pending = []
+                for i, slide in enumerate(slides):
+                    html_content = slide.get('html_content') or ''
                     screenshot_path = os.path.join(temp_dir, f"slide_{i}.png")
+                    cache_key = screenshot_cache.make_key(html_content, SCREENSHOT_RENDER_SETTINGS)
+                    if screenshot_cache.enabled and await run_blocking_io(screenshot_cache.fetch, cache_key, screenshot_path):
+                        screenshot_paths[i] = screenshot_path
+                        continue
 
-                    # 使用PDF converter的截图功能
-                    success = await pdf_converter.screenshot_html(
-                        html_file,
-                        screenshot_path,
-                        width=1280,
-                        height=720
-                    )
-
+                    html_file = os.path.join(temp_dir, f"slide_{i}.html")
+                    await run_blocking_io(write_html_file, html_content, html_file)
+                    pending.append((i, html_file, screenshot_path, cache_key))
+
+                logging.info(f"{len(slides) - len(pending)} screenshots from cache, capturing {len(pending)}")
+
+                # 第3步：通过共享页面池并发截图
+                render_status = {}
+                results = await pdf_converter.screenshot_multiple_html(
+                    [(html_file, screenshot_path) for _, html_file, screenshot_path, _ in pending],
+                    width=1280,
+                    height=720,
+                    render_status=render_status
+                )
+                for (i, html_file, screenshot_path, cache_key), success in zip(pending, results):
                     if success:
-                        screenshot_paths.append(screenshot_path)
-                        logging.info(f"Screenshot {i+1}/{len(html_files)} completed")
+                        screenshot_paths[i] = screenshot_path
+                        # 资源被拦截/加载失败或就绪超时的截图不写入缓存，避免偶发故障固化到后续导出
+                        if screenshot_cache.enabled and render_status.get(html_file, {}).get("clean"):
+                            await run_blocking_io(screenshot_cache.store, cache_key, screenshot_path)
                     else:
                         logging.warning(f"Screenshot {i+1} failed, skipping")
+                if screenshot_cache.enabled and pending:
+                    await run_blocking_io(screenshot_cache.evict)
 
-                if len(screenshot_paths) == 0:
+                if not any(screenshot_paths):
                     raise Exception("No screenshots were generated")
 
-                # 第4步：将截图转换为PPTX
-                logging.info("Creating PPTX from screenshots...")
-                prs = Presentation()
+                # 第4步：按导出设置编码截图并生成PPTX
+                image_format = request.image_format or app_config.pptx_image_format
+                image_quality = max(1, min(100, request.image_quality or app_config.pptx_image_quality))
+                image_dpi = request.image_dpi if request.image_dpi is not None else app_config.pptx_image_dpi
+
+                def build_presentation():
+                    from ..services.slide_image_encoding import encode_slide_image
 
-                # 设置幻灯片尺寸为16:9
-                prs.slide_width = Inches(10)
-                prs.slide_height = Inches(5.625)
+                    prs = Presentation()
 
-                for i, screenshot_path in enumerate(screenshot_paths):
-                    # 添加空白幻灯片
+                    # 设置幻灯片尺寸为16:9
+                    prs.slide_width = Inches(10)
+                    prs.slide_height = Inches(5.625)
                     blank_slide_layout = prs.slide_layouts[6]
-                    slide = prs.slides.add_slide(blank_slide_layout)
 
-                    # 添加截图，填充整个幻灯片
-                    left = Inches(0)
-                    top = Inches(0)
-                    width = prs.slide_width
-                    height = prs.slide_height
+                    total_bytes = 0
+                    for i, screenshot_path in enumerate(screenshot_paths):
+                        if not screenshot_path:
+                            continue
+                        image_path, image_size = encode_slide_image(
+                            screenshot_path, os.path.join(temp_dir, f"slide_{i}_encoded"),
+                            image_format, image_quality, image_dpi, slide_width_inches=10
+                        )
+                        total_bytes += image_size
+
+                        # 添加截图，填充整个幻灯片
+                        slide = prs.slides.add_slide(blank_slide_layout)
+                        slide.shapes.add_picture(image_path, Inches(0), Inches(0),
+                                                 width=prs.slide_width, height=prs.slide_height)
 
-                    slide.shapes.add_picture(screenshot_path, left, top, width=width, height=height)
+                        # 如果该幻灯片有演讲稿，添加到备注中
+                        if i in speech_scripts:
+                            slide.notes_slide.notes_text_frame.text = speech_scripts[i]
 
-                    # 如果该幻灯片有演讲稿，添加到备注中
-                    if i in speech_scripts:
-                        notes_slide = slide.notes_slide
-                        text_frame = notes_slide.notes_text_frame
-                        text_frame.text = speech_scripts[i]
-                        logging.info(f"Added speech script to slide {i+1} notes")
+                    prs.save(temp_pptx_path)
+                    return total_bytes
 
-                # 保存PPTX文件
-                prs.save(temp_pptx_path)
-                logging.info(f"PPTX saved to {temp_pptx_path}")
+                logging.info(f"Creating PPTX from screenshots ({image_format}, quality {image_quality}, {image_dpi} dpi)...")
+                image_bytes = await run_blocking_io(build_presentation)
+                logging.info(f"PPTX saved to {temp_pptx_path} ({image_bytes / 1024 / 1024:.1f} MB of slide images)")
 
                 return {
                     "success": True,
@@ -5617,41 +5686,72 @@ def _clean_html_for_pdf(original_html: str, slide_number: int, total_slides: int
     return cleaned_html
 
 async def _generate_pdf_with_pyppeteer(project, output_path: str, individual: bool = False) -> bool:
-    """Generate PDF using Pyppeteer (Python)"""
+    """Generate PDF using Pyppeteer (Python)
+
+    Slides whose export HTML is unchanged since a previous export are taken from the
+    per-slide PDF cache; only the remaining slides are rendered before merging.
+    """
     try:
         pdf_converter = get_pdf_converter()
+        slide_cache = get_slide_pdf_cache()
 
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
+            pdf_dir = temp_path / "pdfs"
+            await run_blocking_io(pdf_dir.mkdir)
+
+            def write_html_file(content, path):
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(content)
 
             # Always generate individual HTML files for each slide for better page separation
             # This ensures each slide becomes a separate PDF page
-            html_files = []
+            slide_pdfs = []
+            pending = {}
             for i, slide in enumerate(project.slides_data):
                 # Use a specialized PDF-optimized HTML generator without navigation
                 slide_html = await _generate_pdf_slide_html(
                     slide, i+1, len(project.slides_data), project.topic
                 )
 
+                slide_pdf = str(pdf_dir / f"slide_{i+1}.pdf")
+                slide_pdfs.append(slide_pdf)
+                cache_key = slide_cache.make_key(slide_html, PDF_RENDER_SETTINGS)
+                if slide_cache.enabled and await run_blocking_io(slide_cache.fetch, cache_key, slide_pdf):
+                    continue
+
                 html_file = temp_path / f"slide_{i+1}.html"
                 # Write HTML file in thread pool to avoid blocking
-                def write_html_file(content, path):
-                    with open(path, 'w', encoding='utf-8') as f:
-                        f.write(content)
-
                 await run_blocking_io(write_html_file, slide_html, str(html_file))
-                html_files.append(str(html_file))
+                pending[str(html_file)] = (slide_pdf, cache_key)
 
-            # Use Pyppeteer to convert multiple files and merge them
-            pdf_dir = temp_path / "pdfs"
-            await run_blocking_io(pdf_dir.mkdir)
+            logging.info(f"Starting PDF generation for {len(pending)} of {len(slide_pdfs)} slides "
+                         f"({len(slide_pdfs) - len(pending)} from cache)")
 
-            logging.info(f"Starting PDF generation for {len(html_files)} files")
+            # Convert changed slides; output files are named after the HTML files
+            render_status = {}
+            if pending:
+                await pdf_converter.convert_multiple_html_to_pdf(list(pending), str(pdf_dir),
+                                                                 render_status=render_status)
 
-            # Convert HTML files to PDFs and merge them
-            pdf_files = await pdf_converter.convert_multiple_html_to_pdf(
-                html_files, str(pdf_dir), output_path
-            )
+            if slide_cache.enabled and pending:
+                def store_rendered():
+                    # Renders with blocked/failed assets or a readiness timeout are not pinned into the cache
+                    for html_file, (slide_pdf, cache_key) in pending.items():
+                        if render_status.get(html_file, {}).get("clean") and os.path.exists(slide_pdf):
+                            slide_cache.store(cache_key, slide_pdf)
+                    slide_cache.evict()
+
+                try:
+                    await run_blocking_io(store_rendered)
+                except Exception as e:
+                    logging.warning(f"Failed to update slide PDF cache: {e}")
+
+            pdf_files = [slide_pdf for slide_pdf in slide_pdfs if os.path.exists(slide_pdf)]
+            if len(pdf_files) == 1:
+                await run_blocking_io(shutil.copy2, pdf_files[0], output_path)
+            elif pdf_files:
+                await pdf_converter.merge_pdfs(pdf_files, output_path)
 
             if pdf_files and os.path.exists(output_path):
                 logging.info("Pyppeteer PDF generation successful")
@@ -5665,6 +5765,8 @@ async def _generate_pdf_with_pyppeteer(project, output_path: str, individual: bo
         return False
 
 
+get_export_prerenderer().register_renderer("pdf", _generate_pdf_with_pyppeteer)
+
 
 async def _generate_combined_html_for_pdf(project) -> str:
     """Generate combined HTML for PDF export with all slides preserving original styles"""